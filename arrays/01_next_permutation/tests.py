@@ -1,6 +1,21 @@
+import random
+
+from generators import organ_pipe, reversed_ints, sorted_ints
 from test_utils import run_all
 
 
+def _random_permutation(n):
+    return {"nums": random.Random(n).sample(range(n), n)}
+
+
+BENCH = {
+    "random": _random_permutation,
+    "ascending": lambda n: {"nums": list(sorted_ints(n))},
+    "descending (full reverse)": lambda n: {"nums": list(reversed_ints(n))},
+    "organ pipe": lambda n: {"nums": list(organ_pipe(n))},
+}
+
+
 def run_tests(solve):
     tests = [
         {
@@ -77,4 +92,4 @@ def run_tests(solve):
         },
     ]
 
-    run_all("next_permutation", tests, solve)
+    return run_all("next_permutation", tests, solve)
@@ -1,6 +1,13 @@
 from test_utils import run_all
 
 
+BENCH = {
+    "present": lambda n: {"nums": list(range(n)), "target": n // 3},
+    "missing": lambda n: {"nums": list(range(n)), "target": -1},
+}
+BENCH_SIZES = [2**k for k in range(6, 21, 2)]
+
+
 def run_tests(solve):
     tests = [
         {"name": "found in middle", "inputs": {"nums": [1, 3, 5, 7, 9], "target": 5}, "check": lambda r: r == 2, "fail_msg": lambda r: f"expected 2, got {r}"},
@@ -13,4 +20,4 @@ def run_tests(solve):
         {"name": "single element no match", "inputs": {"nums": [7], "target": 3}, "check": lambda r: r == -1, "fail_msg": lambda r: f"expected -1, got {r}"},
         {"name": "empty list", "inputs": {"nums": [], "target": 1}, "check": lambda r: r == -1, "fail_msg": lambda r: f"expected -1, got {r}"},
     ]
-    run_all("binary_search_exact", tests, solve)
+    return run_all("binary_search_exact", tests, solve)
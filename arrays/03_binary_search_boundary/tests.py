@@ -1,6 +1,16 @@
 from test_utils import run_all
 
 
+BENCH = {
+    "first >= n/3": lambda n: {
+        "nums": list(range(n)),
+        "predicate": lambda x: x >= n // 3,
+    },
+    "none satisfy": lambda n: {"nums": list(range(n)), "predicate": lambda x: x >= n},
+}
+BENCH_SIZES = [2**k for k in range(6, 21, 2)]
+
+
 def run_tests(solve):
     tests = [
         {"name": "first >= 5 in [1,3,5,7,9]", "inputs": {"nums": [1, 3, 5, 7, 9], "predicate": lambda x: x >= 5}, "check": lambda r: r == 2, "fail_msg": lambda r: f"expected 2, got {r}"},
@@ -12,4 +22,4 @@ def run_tests(solve):
         {"name": "single element does not satisfy", "inputs": {"nums": [5], "predicate": lambda x: x >= 6}, "check": lambda r: r == 1, "fail_msg": lambda r: f"expected 1, got {r}"},
         {"name": "empty list", "inputs": {"nums": [], "predicate": lambda x: x >= 0}, "check": lambda r: r == 0, "fail_msg": lambda r: f"expected 0, got {r}"},
     ]
-    run_all("binary_search_boundary", tests, solve)
+    return run_all("binary_search_boundary", tests, solve)
@@ -102,4 +102,4 @@ def run_tests(LRUCache):
         },
     ]
 
-    run_all("lru_cache", tests, run_scenario)
+    return run_all("lru_cache", tests, run_scenario)
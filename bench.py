@@ -0,0 +1,348 @@
+"""
+Benchmark a solve function over geometrically growing inputs.
+
+A tests.py opts in by defining BENCH, a dict of {scenario: make_inputs(n)}
+where make_inputs returns the kwargs for one call of solve. Two optional
+module attributes tune the run:
+
+    BENCH_SIZES — the size ladder (default: SIZES)
+    BENCH_UNIT  — what n counts, used in labels (default: "n", e.g. "V+E")
+
+Each size is timed with warmup and repetition, then the (n, time) curve is
+fit against candidate complexities in log space. Every call gets inputs
+freshly built by make_inputs, outside the timed region, so a solve that
+mutates its input (an in-place sort) is never timed on its own output.
+compare() runs the same workloads through several implementations,
+interleaving their samples so drift and noise hit each one equally.
+"""
+
+import contextlib
+import io
+import json
+import math
+import statistics
+import time
+import tracemalloc
+from functools import partial
+
+SIZES = [2**k for k in range(6, 15)]
+
+# Candidate complexities, as functions of n
+MODELS = {
+    "1": lambda n: 1.0,
+    "log n": lambda n: math.log2(n),
+    "n": lambda n: float(n),
+    "n log n": lambda n: n * math.log2(n),
+    "n^2": lambda n: float(n) ** 2,
+    "n^3": lambda n: float(n) ** 3,
+}
+
+# Calls faster than this are looped so one sample is measurable
+MIN_SAMPLE_TIME = 1e-3
+
+
+def time_call(func, inputs, repeat=5, warmup=1, limit=None):
+    """
+    Time func(**inputs).
+
+    inputs is a kwargs dict, reused for every call (so func must not
+    mutate it), or a zero-argument factory returning one, called for each
+    call outside the timed region.
+
+    Returns a list of `repeat` per-call times in seconds. Fast calls are
+    looped enough times that each sample takes at least MIN_SAMPLE_TIME;
+    a first call slower than `limit` is returned as the only sample.
+    """
+    loops, first = _calibrate(func, inputs)
+    if limit is not None and first > limit:
+        return [first]
+
+    for kwargs in _fresh(inputs, warmup):
+        func(**kwargs)
+
+    return [_sample(func, inputs, loops) for _ in range(repeat)]
+
+
+def _fresh(inputs, count):
+    """count kwargs dicts: built by the factory inputs, or inputs reused."""
+    if callable(inputs):
+        return [inputs() for _ in range(count)]
+    return [inputs] * count
+
+
+def _calibrate(func, inputs):
+    """
+    Time one call; return (loops per sample, first call time).
+
+    With an inputs factory, loops is also capped so that building one
+    sample's inputs takes about MIN_SAMPLE_TIME at most.
+    """
+    start = time.perf_counter()
+    [kwargs] = _fresh(inputs, 1)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    func(**kwargs)
+    first = time.perf_counter() - start
+    loops = max(1, min(10_000, math.ceil(MIN_SAMPLE_TIME / max(first, 1e-9))))
+    if callable(inputs):
+        loops = min(loops, max(1, math.ceil(MIN_SAMPLE_TIME / max(build, 1e-9))))
+    return loops, first
+
+
+def _sample(func, inputs, loops):
+    batch = _fresh(inputs, loops)
+    start = time.perf_counter()
+    for kwargs in batch:
+        func(**kwargs)
+    return (time.perf_counter() - start) / loops
+
+
+def peak_memory(func, inputs):
+    """Peak bytes allocated during one func(**inputs) call, via tracemalloc."""
+    [kwargs] = _fresh(inputs, 1)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func(**kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+def fit_complexity(points):
+    """
+    Fit (n, seconds) points against MODELS.
+
+    For each model f, fits t = c * f(n) in log space and scores it by the
+    variance of log(t / f(n)). Returns {"best", "slope", "scores"}, where
+    slope is the log-log regression exponent. best is None with fewer than
+    three points.
+    """
+    points = [(n, t) for n, t in points if n > 1 and t > 0]
+    if len(points) < 3:
+        return {"best": None, "slope": None, "scores": {}}
+
+    scores = {}
+    for name, f in MODELS.items():
+        residuals = [math.log(t) - math.log(f(n)) for n, t in points]
+        scores[name] = statistics.pvariance(residuals)
+
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum(
+        (x - mean_x) ** 2 for x in xs
+    )
+
+    return {"best": min(scores, key=scores.get), "slope": slope, "scores": scores}
+
+
+def run_benchmark(
+    name, func, scenarios, sizes=None, unit="n", repeat=5, warmup=1, limit=1.0
+):
+    """
+    Benchmark func on every scenario and print a table per scenario.
+
+    Args:
+        name: Benchmark description
+        func: Function to time
+        scenarios: Dict of {scenario: make_inputs(n) -> kwargs}
+        sizes: Increasing input sizes (default: SIZES)
+        unit: What n counts, used in labels
+        repeat: Timed samples per size
+        warmup: Untimed calls per size before sampling
+        limit: Stop growing a scenario once a call takes longer (seconds)
+
+    Returns a dict: {"name", "unit", "scenarios": {scenario: {"rows", "fit", "error"}}}
+    """
+    sizes = sizes or SIZES
+    print(f"Benchmarking {name}...\n")
+    results = {"name": name, "unit": unit, "scenarios": {}}
+
+    for scenario, make_inputs in scenarios.items():
+        rows, error = [], None
+        for n in sizes:
+            inputs = partial(make_inputs, n)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    times = time_call(func, inputs, repeat, warmup, limit)
+            except Exception as e:
+                error = f"n={n}: {type(e).__name__}: {e}"
+                break
+            rows.append(
+                {"n": n, "min": min(times), "median": statistics.median(times)}
+            )
+            if rows[-1]["median"] > limit:
+                break
+
+        fit = fit_complexity([(r["n"], r["min"]) for r in rows])
+        results["scenarios"][scenario] = {"rows": rows, "fit": fit, "error": error}
+        _print_scenario(scenario, rows, fit, error, unit)
+
+    return results
+
+
+def compare(name, funcs, scenarios, sizes=None, unit="n", repeat=5, limit=1.0):
+    """
+    Run the same workloads through several implementations.
+
+    Args:
+        name: Comparison description
+        funcs: Dict of {label: func}; the last one is the reference
+        scenarios, sizes, unit, repeat, limit: As for run_benchmark
+
+    Samples are interleaved (and their order alternated) per size. Each
+    label's curve is fit separately, and a label is flagged as worse when
+    its fitted complexity exceeds the reference's by a clear slope margin.
+
+    Returns a dict: {"name", "unit", "reference", "scenarios": {scenario:
+    {"rows", "fits", "worse", "error"}}}
+    """
+    sizes = sizes or SIZES
+    labels = list(funcs)
+    reference = labels[-1]
+    print(f"Comparing {name}: {' vs '.join(labels)}...\n")
+    results = {"name": name, "unit": unit, "reference": reference, "scenarios": {}}
+
+    for scenario, make_inputs in scenarios.items():
+        rows, error = [], None
+        for n in sizes:
+            inputs = partial(make_inputs, n)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    row = _compare_size(funcs, inputs, repeat, limit)
+            except Exception as e:
+                error = f"n={n}: {type(e).__name__}: {e}"
+                break
+            row["n"] = n
+            rows.append(row)
+            if max(row["time"].values()) > limit:
+                break
+
+        fits = {
+            label: fit_complexity([(r["n"], r["time"][label]) for r in rows])
+            for label in labels
+        }
+        worse = [
+            label
+            for label in labels[:-1]
+            if _asymptotically_worse(fits[label], fits[reference])
+        ]
+        results["scenarios"][scenario] = {
+            "rows": rows,
+            "fits": fits,
+            "worse": worse,
+            "error": error,
+        }
+        _print_comparison(scenario, rows, fits, worse, error, labels, unit)
+
+    return results
+
+
+def _compare_size(funcs, inputs, repeat, limit):
+    """
+    Interleaved min time and peak memory of each func on one workload.
+
+    If any first call is slower than `limit`, first calls are the only
+    samples and memory is not measured (None).
+    """
+    calibration = {label: _calibrate(f, inputs) for label, f in funcs.items()}
+    if max(first for _, first in calibration.values()) > limit:
+        return {
+            "time": {label: first for label, (_, first) in calibration.items()},
+            "memory": {label: None for label in funcs},
+        }
+
+    samples = {label: [] for label in funcs}
+    order = list(funcs)
+    for i in range(repeat):
+        for label in order if i % 2 == 0 else reversed(order):
+            loops = calibration[label][0]
+            samples[label].append(_sample(funcs[label], inputs, loops))
+    return {
+        "time": {label: min(t) for label, t in samples.items()},
+        "memory": {label: peak_memory(f, inputs) for label, f in funcs.items()},
+    }
+
+
+def _asymptotically_worse(fit, reference, margin=0.25):
+    if fit["best"] is None or reference["best"] is None:
+        return False
+    order = list(MODELS)
+    return (
+        order.index(fit["best"]) > order.index(reference["best"])
+        and fit["slope"] - reference["slope"] > margin
+    )
+
+
+def save(results, path):
+    """Write benchmark results as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n")
+
+
+def big_o(model, unit="n"):
+    """Render a model name as O(...) in terms of unit."""
+    if model is None:
+        return "O(?)"
+    if model != "n" and len(unit) > 1:
+        unit = f"({unit})"
+    return f"O({model.replace('n', unit)})"
+
+
+def format_time(seconds):
+    for scale, suffix in ((1, "s"), (1e-3, "ms"), (1e-6, "µs")):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g}{suffix}"
+    return f"{seconds / 1e-9:.3g}ns"
+
+
+def _print_comparison(scenario, rows, fits, worse, error, labels, unit):
+    reference = labels[-1]
+    others = labels[:-1]
+    print(f"{scenario}:")
+    header = "".join(f"  {label:>10}" for label in labels)
+    # Ratios are label / reference: > 1 means slower or hungrier
+    header += f"  {'speed':>10}  {'memory':>8}" * len(others)
+    print(f"  {unit:>10}{header}")
+    for r in rows:
+        line = f"  {r['n']:>10}"
+        line += "".join(f"  {format_time(r['time'][label]):>10}" for label in labels)
+        for label in others:
+            speed = r["time"][label] / r["time"][reference]
+            if r["memory"][reference] is None:
+                memory = "-"
+            else:
+                ratio = (r["memory"][label] or 1) / (r["memory"][reference] or 1)
+                memory = f"{ratio:.2f}x"
+            line += f"  {speed:>9.2f}x  {memory:>8}"
+        print(line)
+    if error:
+        print(f"  ✗ stopped at {error}")
+    for label in labels:
+        fit = fits[label]
+        if fit["best"]:
+            print(
+                f"  {label} ~ {big_o(fit['best'], unit)} "
+                f"(log-log slope {fit['slope']:.2f})"
+            )
+    for label in worse:
+        print(f"  ⚠ {label} is asymptotically worse than {reference}")
+    print()
+
+
+def _print_scenario(scenario, rows, fit, error, unit):
+    print(f"{scenario}:")
+    print(f"  {unit:>10}  {'min':>10}  {'median':>10}")
+    for r in rows:
+        print(
+            f"  {r['n']:>10}  {format_time(r['min']):>10}  "
+            f"{format_time(r['median']):>10}"
+        )
+    if error:
+        print(f"  ✗ stopped at {error}")
+    if fit["best"]:
+        print(f"  ~ {big_o(fit['best'], unit)} (log-log slope {fit['slope']:.2f})")
+    print()
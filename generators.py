@@ -0,0 +1,199 @@
+"""
+Seeded workload generators for tests and benchmarks.
+
+Array and graph generators are lazy: they yield values or edge tuples one
+at a time, so millions of elements can be streamed straight into list(),
+make_graph or a tree builder without an intermediate copy. The same
+(n, seed) always produces the same workload.
+
+Example:
+    nodes = make_graph(weighted(erdos_renyi(10_000, 4 / 10_000, seed=1)))
+    nums = list(organ_pipe(1_000_000))
+    root = random_bst(100_000, seed=7)
+"""
+
+import math
+import random
+from array import array
+
+from trees.test_utils import make_balanced, make_bst, make_chain
+
+# --- Arrays ---
+
+
+def random_ints(n, seed=0, lo=0, hi=None):
+    """n uniform ints in [lo, hi] (hi defaults to n)."""
+    rng = random.Random(seed)
+    hi = n if hi is None else hi
+    for _ in range(n):
+        yield rng.randint(lo, hi)
+
+
+def uniform_floats(n, seed=0):
+    """n uniform floats in [0, 1)."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield rng.random()
+
+
+def sorted_ints(n):
+    """0, 1, ..., n-1."""
+    return iter(range(n))
+
+
+def reversed_ints(n):
+    """n-1, n-2, ..., 0."""
+    return iter(range(n - 1, -1, -1))
+
+
+def few_unique(n, k=4, seed=0):
+    """n ints drawn from only k distinct values."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield rng.randrange(k)
+
+
+def organ_pipe(n):
+    """Ascending to the middle, then descending: 0, 1, ..., m, ..., 1, 0."""
+    half = (n + 1) // 2
+    yield from range(half)
+    yield from range(n - half - 1, -1, -1)
+
+
+def nearly_sorted(n, swap_prob=0.05, seed=0):
+    """0..n-1 with each adjacent pair swapped with probability swap_prob."""
+    rng = random.Random(seed)
+    i = 0
+    while i < n:
+        if i + 1 < n and rng.random() < swap_prob:
+            yield i + 1
+            yield i
+            i += 2
+        else:
+            yield i
+            i += 1
+
+
+# --- Graphs ---
+
+
+def erdos_renyi(n, p, seed=0, directed=False):
+    """
+    G(n, p) edges over vertices 0..n-1, without self-loops.
+
+    Uses geometric skipping (Batagelj & Brandes), so the cost is
+    O(n + edges) rather than O(n^2): for a sparse graph with average
+    degree d, pass p = d / n.
+    """
+    if p <= 0 or n < 2:
+        return
+    rng = random.Random(seed)
+    log_q = math.log(1 - p) if p < 1 else None
+
+    def skip():
+        if log_q is None:
+            return 1
+        return 1 + int(math.log(1 - rng.random()) / log_q)
+
+    if directed:
+        # Walk the n * (n - 1) ordered pairs (u, v), u != v, by flat index
+        total, k = n * (n - 1), skip() - 1
+        while k < total:
+            u, t = divmod(k, n - 1)
+            yield (u, t if t < u else t + 1)
+            k += skip()
+        return
+
+    # Walk the lower triangle (v, w), w < v, row by row
+    v, w = 1, skip() - 1
+    while v < n:
+        while w >= v:
+            w -= v
+            v += 1
+            if v >= n:
+                return
+        yield (v, w)
+        w += skip()
+
+
+def power_law(n, m=2, seed=0):
+    """
+    Barabási–Albert preferential attachment: each new vertex links to m
+    existing vertices chosen proportionally to degree. Degrees follow a
+    power law; a few hubs are very well connected.
+    """
+    rng = random.Random(seed)
+    # Every edge endpoint, so a uniform pick is a degree-weighted pick
+    endpoints = array("q")
+    targets = list(range(m))
+    for source in range(m, n):
+        for t in targets:
+            yield (source, t)
+        endpoints.extend(targets)
+        endpoints.extend([source] * m)
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(endpoints[rng.randrange(len(endpoints))])
+        targets = list(chosen)
+
+
+def grid(rows, cols):
+    """4-neighbour lattice over vertices r * cols + c."""
+    for r in range(rows):
+        for c in range(cols):
+            v = r * cols + c
+            if c + 1 < cols:
+                yield (v, v + 1)
+            if r + 1 < rows:
+                yield (v, v + cols)
+
+
+def path(n):
+    """0 - 1 - ... - (n-1)."""
+    for i in range(n - 1):
+        yield (i, i + 1)
+
+
+def random_dag(n, m, seed=0):
+    """
+    Up to m random edges over 0..n-1 (self-pairs are dropped), acyclic.
+
+    Edges go forward in a hidden random order, so the labels themselves
+    don't reveal a topological order.
+    """
+    rng = random.Random(seed)
+    order = array("q", range(n))
+    rng.shuffle(order)
+    for _ in range(m):
+        a, b = rng.randrange(n), rng.randrange(n)
+        if a == b:
+            continue
+        if a > b:
+            a, b = b, a
+        yield (order[a], order[b])
+
+
+def weighted(edges, lo=1, hi=100, seed=0):
+    """Append a uniform int weight in [lo, hi] to every (u, v) edge."""
+    rng = random.Random(seed)
+    for u, v in edges:
+        yield (u, v, rng.randint(lo, hi))
+
+
+# --- Trees ---
+
+
+def balanced_tree(n):
+    """Perfectly balanced BST over 0..n-1 (height ~log2 n)."""
+    return make_balanced(range(n))
+
+
+def degenerate_tree(n, side="right"):
+    """A BST that is a single path of n nodes (height n)."""
+    values = range(n) if side == "right" else range(n - 1, -1, -1)
+    return make_chain(values, side)
+
+
+def random_bst(n, seed=0):
+    """BST built by inserting 0..n-1 in random order (expected height ~3 ln n)."""
+    return make_bst(random.Random(seed).sample(range(n), n))
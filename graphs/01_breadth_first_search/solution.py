@@ -1,9 +1,14 @@
+from array import array
 from collections import deque
 
+from graphs.csr import CSRNode
+
 
 def solve(start):
     if start is None:
         return []
+    if isinstance(start, CSRNode):
+        return _solve_csr(start)
 
     result = []
     visited = set([start])
@@ -19,3 +24,48 @@ def solve(start):
                 queue.append(neighbor)
 
     return result
+
+
+def iter_bfs(start, max_depth=None):
+    """
+    Lazily yield (node, depth) pairs in the same order as solve(start).
+
+    Nodes deeper than max_depth are neither yielded nor expanded. Breaking
+    out of the loop stops the search: nothing past the current frontier
+    has been touched, and no result list is ever built.
+    """
+    if start is None:
+        return
+
+    visited = {start}
+    queue = deque([(start, 0)])
+
+    while queue:
+        node, depth = queue.popleft()
+        yield node, depth
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for neighbor in node.neighbors:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append((neighbor, depth + 1))
+
+
+def _solve_csr(start):
+    # Same traversal over int ids: the queue doubles as the visit order
+    graph = start.graph
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(graph.n)
+    visited[start.id] = 1
+    order = array("q", [start.id])
+
+    i = 0
+    while i < len(order):
+        v = order[i]
+        i += 1
+        for w in targets[offsets[v] : offsets[v + 1]]:
+            if not visited[w]:
+                visited[w] = 1
+                order.append(w)
+
+    return [CSRNode(graph, v) for v in order]
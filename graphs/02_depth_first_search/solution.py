@@ -1,6 +1,13 @@
+from array import array
+
+from graphs.csr import CSRNode
+
+
 def solve(start):
     if start is None:
         return []
+    if isinstance(start, CSRNode):
+        return _solve_csr(start)
 
     result = []
     visited = {start}
@@ -16,3 +23,63 @@ def solve(start):
                 stack.append(neighbor)
 
     return result
+
+
+def iter_dfs(start, max_depth=None, events=False):
+    """
+    Lazily yield (node, depth) pairs in depth-first preorder.
+
+    Unlike solve, which marks nodes when they are pushed, this follows the
+    recursive definition: each neighbour is explored fully before the next
+    one is looked at. The stack holds one neighbour iterator per level of
+    the current path, so memory is bounded by the search depth, not by
+    the output. Nodes deeper than max_depth are not entered.
+
+    With events=True, yields ("pre", node, depth) on entering a node and
+    ("post", node, depth) once all of its descendants are finished.
+    Break out of the loop to stop early.
+    """
+    if start is None:
+        return
+
+    visited = {start}
+    stack = [(start, 0, iter(start.neighbors))]
+    yield ("pre", start, 0) if events else (start, 0)
+
+    while stack:
+        node, depth, neighbors = stack[-1]
+        child = None
+        if max_depth is None or depth < max_depth:
+            for neighbor in neighbors:
+                if neighbor not in visited:
+                    child = neighbor
+                    break
+
+        if child is None:
+            stack.pop()
+            if events:
+                yield ("post", node, depth)
+            continue
+
+        visited.add(child)
+        stack.append((child, depth + 1, iter(child.neighbors)))
+        yield ("pre", child, depth + 1) if events else (child, depth + 1)
+
+
+def _solve_csr(start):
+    graph = start.graph
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(graph.n)
+    visited[start.id] = 1
+    stack = array("q", [start.id])
+    order = array("q")
+
+    while stack:
+        v = stack.pop()
+        order.append(v)
+        for w in reversed(targets[offsets[v] : offsets[v + 1]]):
+            if not visited[w]:
+                visited[w] = 1
+                stack.append(w)
+
+    return [CSRNode(graph, v) for v in order]
@@ -1,7 +1,27 @@
-from graphs.test_utils import make_graph, single_node
+from generators import erdos_renyi, grid, path, power_law
+from graphs.test_utils import csr_variants, make_graph, single_node
 from test_utils import run_all
 
 
+def _first_node(edges):
+    return {"start": next(iter(make_graph(edges).values()))}
+
+
+def _grid(n):
+    side = int((n // 3) ** 0.5)
+    return _first_node(grid(side, side))
+
+
+BENCH = {
+    # n counts V+E: n/3 vertices with average degree ~2 (undirected)
+    "sparse random": lambda n: _first_node(erdos_renyi(n // 3, 6 / n, seed=n)),
+    "power law": lambda n: _first_node(power_law(n // 3, m=1, seed=n)),
+    "grid": _grid,
+    "path": lambda n: _first_node(path(n // 2)),
+}
+BENCH_UNIT = "V+E"
+
+
 def run_tests(solve):
     # Build test graphs
     g3 = make_graph([("A", "B")])
@@ -104,4 +124,6 @@ def run_tests(solve):
         },
     ]
 
-    run_all("depth_first_search", tests, solve)
+    tests += csr_variants(tests, solve)
+
+    return run_all("depth_first_search", tests, solve)
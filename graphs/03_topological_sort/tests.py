@@ -1,3 +1,4 @@
+from generators import path, random_dag
 from test_utils import run_all
 
 
@@ -10,6 +11,17 @@ def is_valid_topo(result, nodes, edges):
     return all(pos[u] < pos[v] for u, v in edges)
 
 
+BENCH = {
+    # n counts V+E: n/3 vertices, 2n/3 forward edges
+    "random DAG": lambda n: {
+        "nodes": list(range(n // 3)),
+        "edges": list(random_dag(n // 3, 2 * (n // 3), seed=n)),
+    },
+    "chain": lambda n: {"nodes": list(range(n // 2)), "edges": list(path(n // 2))},
+}
+BENCH_UNIT = "V+E"
+
+
 def run_tests(solve):
     tests = [
         {
@@ -171,4 +183,4 @@ def run_tests(solve):
         },
     ]
 
-    run_all("topological_sort", tests, solve)
+    return run_all("topological_sort", tests, solve)
@@ -1,14 +1,21 @@
 # Union-Find (Disjoint Set Union)
 #
 # Implement a Union-Find data structure with:
-#   - Path compression in find()
-#   - Union by rank in union()
+#   - Path compression in find() (full compression or path halving),
+#     written as a loop so long paths can't hit the recursion limit
+#   - Union by size in union()
 #
 # __init__(n): Initialize n elements (0 to n-1), each in its own set.
+#              Keep parent[] and size[] indexable by element, and
+#              total_components as the current number of sets.
 # find(x):    Return the root representative of x's set.
 # union(x,y): Merge the sets containing x and y.
 #             Return True if merged, False if already in the same set.
 #
+# Batch versions, which save a method call per element:
+# union_many(pairs): Union every (x, y) pair. Return the number of merges.
+# find_many(xs):     Return the root of every x, in order.
+#
 class UnionFind:
     pass
 
@@ -1,24 +1,71 @@
+from array import array
+
+
 class UnionFind:
     def __init__(self, n):
-        self.parent = list(range(n))
-        self.size = [1] * n
-        self.component_count = n
+        # Flat int arrays: 4 bytes per slot instead of a list of boxed ints
+        code = "i" if n < 2**31 else "q"
+        self.parent = array(code, range(n))
+        self.size = array(code, [1]) * n
+        self.total_components = n
+
+    @property
+    def component_count(self):
+        return self.total_components
 
     def find(self, idx):
-        if self.parent[idx] != idx:
-            self.parent[idx] = self.find(self.parent[idx])
-        return self.parent[idx]
+        # Path halving: point every other node on the path at its grandparent
+        parent = self.parent
+        while parent[idx] != idx:
+            parent[idx] = idx = parent[parent[idx]]
+        return idx
 
     def union(self, u, v):
-        root_u, root_v = self.find(u), self.find(v)
-        if root_u == root_v:
+        # find() inlined on local bindings: two method calls and repeated
+        # attribute lookups cost more than the halving loops themselves
+        parent = self.parent
+        while parent[u] != u:
+            parent[u] = u = parent[parent[u]]
+        while parent[v] != v:
+            parent[v] = v = parent[parent[v]]
+        if u == v:
             return False
-        if self.size[root_u] < self.size[root_v]:
-            root_u, root_v = root_v, root_u
-        self.parent[root_v] = root_u
-        self.size[root_u] += self.size[root_v]
-        self.component_count -= 1
+        size = self.size
+        if size[u] < size[v]:
+            u, v = v, u
+        parent[v] = u
+        size[u] += size[v]
+        self.total_components -= 1
         return True
 
+    def union_many(self, pairs):
+        """Union every (u, v) in pairs. Returns the number of merges."""
+        parent, size = self.parent, self.size
+        merged = 0
+        for u, v in pairs:
+            while parent[u] != u:
+                parent[u] = u = parent[parent[u]]
+            while parent[v] != v:
+                parent[v] = v = parent[parent[v]]
+            if u == v:
+                continue
+            if size[u] < size[v]:
+                u, v = v, u
+            parent[v] = u
+            size[u] += size[v]
+            merged += 1
+        self.total_components -= merged
+        return merged
+
+    def find_many(self, ids):
+        """Roots of every id in ids, as an array."""
+        parent = self.parent
+        roots = array(parent.typecode)
+        for idx in ids:
+            while parent[idx] != idx:
+                parent[idx] = idx = parent[parent[idx]]
+            roots.append(idx)
+        return roots
+
 
 solve = UnionFind
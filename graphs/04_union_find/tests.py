@@ -18,6 +18,19 @@ def run_tests(UnionFind):
             elif op[0] == "size":
                 root = uf.find(op[1])
                 results.append(uf.size[root])
+            elif op[0] == "union_many":
+                results.append(uf.union_many(op[1]))
+            elif op[0] == "find_many":
+                results.append(list(uf.find_many(op[1])))
+            elif op[0] == "link":
+                # Hand-build a tree: point op[1] at op[2], bypassing union
+                uf.parent[op[1]] = op[2]
+            elif op[0] == "depth":
+                # Hops from op[1] to its root, read without calling find
+                x, hops = op[1], 0
+                while uf.parent[x] != x:
+                    x, hops = uf.parent[x], hops + 1
+                results.append(hops)
         return results
 
     tests = [
@@ -213,6 +226,70 @@ def run_tests(UnionFind):
                 f"expected same result for repeated find, got {r[1:]}"
             ),
         },
+        {
+            "name": "union_many counts merges",
+            "inputs": {
+                "n": 6,
+                "ops": [
+                    ("union_many", [(0, 1), (2, 3), (1, 0), (3, 4), (0, 4)]),
+                    ("components",),
+                    ("find", 4),
+                    ("find", 1),
+                ],
+            },
+            "check": lambda r: r[0] == 4 and r[1] == 2 and r[2] == r[3],
+            "fail_msg": lambda r: (
+                f"expected 4 merges, 2 components and 1, 4 joined; got {r}"
+            ),
+        },
+        {
+            "name": "find_many matches find",
+            "inputs": {
+                "n": 8,
+                "ops": (
+                    [("union", i, i + 1) for i in range(0, 7, 2)]
+                    + [("union", 0, 2), ("find_many", list(range(8)))]
+                    + [("find", i) for i in range(8)]
+                ),
+            },
+            "check": lambda r: r[5] == r[6:],
+            "fail_msg": lambda r: f"find_many gave {r[5]}, find gave {r[6:]}",
+        },
+        {
+            "name": "long chain of unions (1000 elements)",
+            "inputs": {
+                "n": 1000,
+                "ops": [
+                    ("union_many", [(i, i + 1) for i in range(999)]),
+                    ("components",),
+                    ("size", 500),
+                ],
+            },
+            "check": lambda r: r == [999, 1, 1000],
+            "fail_msg": lambda r: f"expected [999, 1, 1000], got {r}",
+        },
+        {
+            # Union by size never builds a deep tree, so build a 1024-hop
+            # path by hand and check that each find at least halves it
+            "name": "find compresses a deep path (1024 hops)",
+            "inputs": {
+                "n": 1025,
+                "ops": (
+                    [("link", i, i + 1) for i in range(1024)]
+                    + [("depth", 0), ("find", 0), ("depth", 0)]
+                    + [("find", 0), ("depth", 0), ("find", 1), ("find", 513)]
+                ),
+            },
+            "check": lambda r: r[0] == 1024
+            and r[1] == r[3] == r[5] == r[6] == 1024
+            and r[2] <= 512
+            and r[4] <= 256,
+            "fail_msg": lambda r: (
+                "expected root 1024 and depth(0) going 1024 -> <= 512 -> <= 256 "
+                f"over two finds, got roots {[r[1], r[3], r[5], r[6]]}, "
+                f"depths {[r[0], r[2], r[4]]}"
+            ),
+        },
     ]
 
-    run_all("union_find", tests, run_scenario)
+    return run_all("union_find", tests, run_scenario)
@@ -1,8 +1,21 @@
 import heapq
+from array import array
 from collections import defaultdict
 
+from graphs.csr import CSRGraph
 
-def solve(edges, source):
+
+def solve(edges, source, queue=None):
+    # edges: (u, v, weight) tuples, each a directed edge, or a weighted
+    # CSRGraph whose arcs are used as stored. CSRGraph.from_edges defaults
+    # to undirected (every edge both ways): pass directed=True to get the
+    # same distances as the edge list.
+    # queue: None for heapq with lazy deletion, or an indexed heap class
+    # such as graphs.heap.IndexedHeap, called as queue(n)
+    if queue is not None and not isinstance(edges, CSRGraph):
+        edges = CSRGraph.from_edges(edges, directed=True)
+    if isinstance(edges, CSRGraph):
+        return _solve_csr(edges, source, queue)
     graph = defaultdict(list)
     for u, v, w in edges:
         graph[u].append((v, w))
@@ -20,3 +33,51 @@ def solve(edges, source):
                 heapq.heappush(min_heap, (new_dist, neighbor))
 
     return shortest_dist
+
+
+def _solve_csr(graph, source, queue=None):
+    if graph.weights is None and graph.m:
+        raise ValueError("Dijkstra needs a weighted CSRGraph (weights is None)")
+    if source not in graph.index:
+        return {source: 0}
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    s = graph.index[source]
+    inf = float("inf")
+    dist = array("d", [inf]) * graph.n
+    dist[s] = 0
+
+    if queue is not None:
+        # One entry per vertex: improving a queued vertex moves it up
+        heap = queue(graph.n)
+        heap.push(s, 0)
+        while heap:
+            v, curr_dist = heap.pop()
+            for i in range(offsets[v], offsets[v + 1]):
+                new_dist = curr_dist + weights[i]
+                w = targets[i]
+                if new_dist < dist[w]:
+                    dist[w] = new_dist
+                    heap.push_or_decrease(w, new_dist)
+        return _labelled(graph, dist, s)
+
+    min_heap = [(0, s)]
+    while min_heap:
+        curr_dist, v = heapq.heappop(min_heap)
+        if curr_dist > dist[v]:
+            continue
+        for i in range(offsets[v], offsets[v + 1]):
+            new_dist = curr_dist + weights[i]
+            w = targets[i]
+            if new_dist < dist[w]:
+                dist[w] = new_dist
+                heapq.heappush(min_heap, (new_dist, w))
+    return _labelled(graph, dist, s)
+
+
+def _labelled(graph, dist, s):
+    cast = int if graph.weight_typecode == "q" else float
+    labels = graph.labels
+    inf = float("inf")
+    result = {labels[v]: cast(d) for v, d in enumerate(dist) if d != inf}
+    result[labels[s]] = 0  # an int 0, as the edge-list path returns
+    return result
@@ -1,6 +1,28 @@
+from generators import erdos_renyi, grid, path, weighted
+from graphs.test_utils import csr_variants, queue_variants
 from test_utils import run_all
 
 
+def _sparse_random(n):
+    # n counts V+E: n/5 vertices with four random out-edges each
+    v = n // 5
+    edges = erdos_renyi(v, 4 / v, seed=n, directed=True)
+    return {"edges": list(weighted(edges, seed=n)), "source": 0}
+
+
+def _grid(n):
+    side = int((n // 3) ** 0.5)
+    return {"edges": list(weighted(grid(side, side), seed=n)), "source": 0}
+
+
+BENCH = {
+    "sparse random": _sparse_random,
+    "grid": _grid,
+    "chain": lambda n: {"edges": list(weighted(path(n // 2), seed=n)), "source": 0},
+}
+BENCH_UNIT = "V+E"
+
+
 def run_tests(solve):
     # --- Edge lists ---
     edges_two = [("A", "B", 5)]
@@ -20,6 +42,9 @@ def run_tests(solve):
     # Zero-weight edge
     edges_zero = [("A", "B", 0), ("B", "C", 3)]
 
+    # Float weights: the source stays at int 0
+    edges_float = [("A", "B", 1.5), ("B", "C", 2.5)]
+
     # Directed (solve builds a directed graph by default)
     edges_directed = [("A", "B", 1), ("B", "C", 2)]
 
@@ -110,6 +135,16 @@ def run_tests(solve):
                 f"expected {{'A': 0, 'B': 3, 'C': 2, 'D': 6, 'E': 4, 'F': 7}}, got {r}"
             ),
         },
+        # 11. Float weights
+        {
+            "name": "float weights (source distance is int 0)",
+            "inputs": {"edges": edges_float, "source": "A"},
+            "check": lambda r: r == {"A": 0, "B": 1.5, "C": 4.0}
+            and type(r["A"]) is int,
+            "fail_msg": lambda r: f"expected {{'A': 0, 'B': 1.5, 'C': 4.0}}, got {r}",
+        },
     ]
 
-    run_all("dijkstra", tests, solve)
+    tests += queue_variants(tests, solve) + csr_variants(tests, solve, directed=True)
+
+    return run_all("dijkstra", tests, solve)
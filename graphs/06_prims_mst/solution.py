@@ -1,10 +1,18 @@
 import heapq
 from collections import defaultdict
 
+from graphs.csr import CSRGraph
 
-def solve(nodes, edges):
+
+def solve(nodes, edges, queue=None):
+    # queue: None for heapq with lazy deletion, or an indexed heap class
+    # such as graphs.heap.IndexedHeap, called as queue(n)
     if not nodes:
         return 0
+    if queue is not None and not isinstance(edges, CSRGraph):
+        edges = CSRGraph.from_edges(edges)
+    if isinstance(edges, CSRGraph):
+        return _solve_csr(nodes, edges, queue)
 
     graph = defaultdict(list)
     for u, v, w in edges:
@@ -30,3 +38,44 @@ def solve(nodes, edges):
         return -1
 
     return total_weight
+
+
+def _solve_csr(nodes, graph, queue=None):
+    # graph must be undirected: every edge stored as two arcs
+    if nodes[0] not in graph.index:
+        return 0 if len(nodes) == 1 else -1
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    visited = bytearray(graph.n)
+    n_visited = 0
+    total_weight = 0
+
+    if queue is not None:
+        # The heap holds each vertex once, keyed by its cheapest edge to the tree
+        heap = queue(graph.n)
+        heap.push(graph.index[nodes[0]], 0)
+        while heap:
+            v, weight = heap.pop()
+            visited[v] = 1
+            n_visited += 1
+            total_weight += weight
+            for i in range(offsets[v], offsets[v + 1]):
+                if not visited[targets[i]]:
+                    heap.push_or_decrease(targets[i], weights[i])
+        return total_weight if n_visited == len(nodes) else -1
+
+    min_heap = [(0, graph.index[nodes[0]])]
+    while min_heap:
+        weight, v = heapq.heappop(min_heap)
+        if visited[v]:
+            continue
+        visited[v] = 1
+        n_visited += 1
+        total_weight += weight
+        for i in range(offsets[v], offsets[v + 1]):
+            if not visited[targets[i]]:
+                heapq.heappush(min_heap, (weights[i], targets[i]))
+
+    if n_visited != len(nodes):
+        return -1
+
+    return total_weight
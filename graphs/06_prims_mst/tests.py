@@ -1,6 +1,26 @@
+from generators import erdos_renyi, path, power_law, weighted
+from graphs.test_utils import csr_variants, queue_variants
 from test_utils import run_all
 
 
+def _connected(n):
+    # n counts V+E: n/4 vertices, a random spanning path plus a sparse random graph
+    v = n // 4
+    edges = list(weighted(path(v), seed=n))
+    edges += weighted(erdos_renyi(v, 4 / v, seed=n), seed=n + 1)
+    return {"nodes": list(range(v)), "edges": edges}
+
+
+BENCH = {
+    "sparse random": _connected,
+    "power law": lambda n: {
+        "nodes": list(range(n // 3)),
+        "edges": list(weighted(power_law(n // 3, m=2, seed=n), seed=n)),
+    },
+}
+BENCH_UNIT = "V+E"
+
+
 def run_tests(solve):
     # --- Edge lists ---
 
@@ -127,4 +147,6 @@ def run_tests(solve):
         },
     ]
 
-    run_all("prims_mst", tests, solve)
+    tests += queue_variants(tests, solve) + csr_variants(tests, solve)
+
+    return run_all("prims_mst", tests, solve)
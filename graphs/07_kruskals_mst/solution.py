@@ -1,6 +1,13 @@
+from array import array
+
+from graphs.csr import CSRGraph
+
+
 def solve(nodes, edges):
     if not nodes:
         return 0
+    if isinstance(edges, CSRGraph):
+        return _solve_csr(nodes, edges)
 
     node_idx = {node: i for i, node in enumerate(nodes)}
     n = len(nodes)
@@ -39,3 +46,50 @@ def solve(nodes, edges):
         return -1
 
     return total_weight
+
+
+def _solve_csr(nodes, graph):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = len(nodes)
+    if graph.m == 0:
+        return 0 if n == 1 else -1
+
+    parent = array("q", range(graph.n))
+    size = array("q", [1]) * graph.n
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    # Arc i runs tail[i] -> targets[i]; an undirected edge is stored as two
+    # arcs, so keep only the tail < head copy.
+    tail = array("q", bytes(8 * graph.m))
+    for v in range(graph.n):
+        for i in range(offsets[v], offsets[v + 1]):
+            tail[i] = v
+    arcs = range(graph.m)
+    if not graph.directed:
+        arcs = [i for i in arcs if tail[i] < targets[i]]
+
+    total_weight = 0
+    edges_used = 0
+
+    for i in sorted(arcs, key=weights.__getitem__):
+        ra, rb = find(tail[i]), find(targets[i])
+        if ra == rb:
+            continue
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        size[ra] += size[rb]
+        total_weight += weights[i]
+        edges_used += 1
+        if edges_used == n - 1:
+            break
+
+    if edges_used != n - 1:
+        return -1
+
+    return total_weight
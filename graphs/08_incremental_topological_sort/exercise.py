@@ -0,0 +1,50 @@
+# Incremental Topological Sort — Pearce–Kelly
+#
+# Maintain a topological order of a DAG while edges are added and removed
+# one at a time, without recomputing the whole order on every change.
+#
+# IncrementalTopoSort(nodes) starts with the given nodes, no edges, and
+#                            their list order as the topological order.
+# add_edge(u, v)    adds the edge u -> v and repairs the order.
+#                   Returns False (and changes nothing) if the edge would
+#                   create a cycle, True otherwise.
+# remove_edge(u, v) removes the edge u -> v. Returns True if it existed.
+#                   (Removing an edge never invalidates the order.)
+# order()           returns the nodes in the current topological order.
+#
+# Example:
+#   topo = IncrementalTopoSort(["A", "B", "C"])
+#   topo.add_edge("C", "A")   # True
+#   topo.add_edge("A", "C")   # False: C -> A -> C would be a cycle
+#   topo.order()              # [C, B, A]: C and A swap slots, B stays put
+#                             # (the tests accept any valid order)
+#
+# Algorithm (Pearce & Kelly, 2006):
+#   Keep pos[node] (its index in the order) and the inverse node_at[i].
+#   When adding u -> v:
+#   - If pos[u] < pos[v], the order is still valid: just record the edge.
+#   - Otherwise only the region between pos[v] and pos[u] can be affected.
+#     Forward DFS from v, following only nodes with pos < pos[u]: these
+#     must move after u. Reaching u itself means a cycle.
+#     Backward DFS from u, following only nodes with pos > pos[v]: these
+#     must stay before v.
+#   - Collect the positions of both sets, sort them, and hand them out:
+#     first to the backward set, then to the forward set, each in its
+#     existing relative order. Nothing outside the region moves.
+
+
+class IncrementalTopoSort:
+    def __init__(self, nodes: list):
+        pass
+
+    def add_edge(self, u, v) -> bool:
+        pass
+
+    def remove_edge(self, u, v) -> bool:
+        pass
+
+    def order(self) -> list:
+        pass
+
+
+solve = IncrementalTopoSort
@@ -0,0 +1,77 @@
+class IncrementalTopoSort:
+    def __init__(self, nodes):
+        self.node_at = list(nodes)
+        self.pos = {node: i for i, node in enumerate(self.node_at)}
+        self.succ = {node: set() for node in self.node_at}
+        self.pred = {node: set() for node in self.node_at}
+
+    def add_node(self, node):
+        """Add an isolated node at the end of the order."""
+        if node not in self.pos:
+            self.pos[node] = len(self.node_at)
+            self.node_at.append(node)
+            self.succ[node] = set()
+            self.pred[node] = set()
+
+    def add_edge(self, u, v):
+        if u == v:
+            return False
+        lower, upper = self.pos[v], self.pos[u]
+        if lower < upper:
+            forward = self._forward(v, upper)
+            if forward is None:
+                return False
+            backward = self._backward(u, lower)
+            self._reorder(backward, forward)
+        self.succ[u].add(v)
+        self.pred[v].add(u)
+        return True
+
+    def remove_edge(self, u, v):
+        if v not in self.succ.get(u, ()):
+            return False
+        self.succ[u].discard(v)
+        self.pred[v].discard(u)
+        return True
+
+    def order(self):
+        return list(self.node_at)
+
+    def _forward(self, start, upper):
+        """Nodes reachable from start with pos < upper, or None on reaching upper."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for nxt in self.succ[node]:
+                p = self.pos[nxt]
+                if p == upper:
+                    return None
+                if p < upper and nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    def _backward(self, start, lower):
+        """Nodes that reach start with pos > lower."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for prev in self.pred[node]:
+                if self.pos[prev] > lower and prev not in seen:
+                    seen.add(prev)
+                    stack.append(prev)
+        return seen
+
+    def _reorder(self, backward, forward):
+        pos = self.pos
+        backward = sorted(backward, key=pos.__getitem__)
+        forward = sorted(forward, key=pos.__getitem__)
+        slots = sorted(pos[node] for node in backward + forward)
+        for slot, node in zip(slots, backward + forward):
+            pos[node] = slot
+            self.node_at[slot] = node
+
+
+solve = IncrementalTopoSort
@@ -0,0 +1,193 @@
+import random
+
+from test_utils import run_all
+
+
+def reaches(edges, start, goal):
+    """Reference reachability by plain DFS over an edge set."""
+    seen, stack = {start}, [start]
+    while stack:
+        node = stack.pop()
+        if node == goal:
+            return True
+        for u, v in edges:
+            if u == node and v not in seen:
+                seen.add(v)
+                stack.append(v)
+    return False
+
+
+def random_ops(n, count, seed):
+    """Random add/remove ops over n nodes, tagged with the expected add results."""
+    rng = random.Random(seed)
+    edges, ops, expected = set(), [], []
+    for _ in range(count):
+        if edges and rng.random() < 0.2:
+            u, v = rng.choice(sorted(edges))
+            edges.discard((u, v))
+            ops.append(("remove", u, v))
+            expected.append(True)
+        else:
+            u, v = rng.randrange(n), rng.randrange(n)
+            ok = u != v and not reaches(edges, v, u)
+            if ok:
+                edges.add((u, v))
+            ops.append(("add", u, v))
+            expected.append(ok)
+        ops.append(("valid",))
+        expected.append(True)
+    return ops, expected
+
+
+def first_mismatch(results, expected, ops):
+    for i, (got, want) in enumerate(zip(results, expected)):
+        if got != want:
+            return f"op {i} {ops[i]}: expected {want}, got {got}"
+    return f"length: expected {len(expected)} results, got {len(results)}"
+
+
+def run_tests(IncrementalTopoSort):
+    def run_scenario(nodes, ops):
+        """Construct IncrementalTopoSort(nodes), execute ops, return list of results."""
+        topo = IncrementalTopoSort(list(nodes))
+        edges = set()
+        results = []
+        for op in ops:
+            if op[0] == "add":
+                added = topo.add_edge(op[1], op[2])
+                if added:
+                    edges.add((op[1], op[2]))
+                results.append(added)
+            elif op[0] == "remove":
+                edges.discard((op[1], op[2]))
+                results.append(topo.remove_edge(op[1], op[2]))
+            elif op[0] == "order":
+                results.append(topo.order())
+            elif op[0] == "valid":
+                order = topo.order()
+                pos = {v: i for i, v in enumerate(order)}
+                results.append(
+                    sorted(order) == sorted(nodes)
+                    and all(pos[u] < pos[v] for u, v in edges)
+                )
+        return results
+
+    ops, expected = random_ops(12, 150, seed=8)
+
+    tests = [
+        {
+            "name": "initial order is the node order",
+            "inputs": {"nodes": ["A", "B", "C"], "ops": [("order",)]},
+            "check": lambda r: r == [["A", "B", "C"]],
+            "fail_msg": lambda r: f"expected [['A', 'B', 'C']], got {r}",
+        },
+        {
+            "name": "consistent edge keeps the order",
+            "inputs": {
+                "nodes": ["A", "B", "C"],
+                "ops": [("add", "A", "C"), ("order",)],
+            },
+            "check": lambda r: r == [True, ["A", "B", "C"]],
+            "fail_msg": lambda r: f"expected [True, ['A', 'B', 'C']], got {r}",
+        },
+        {
+            "name": "backward edge reorders",
+            "inputs": {
+                "nodes": ["A", "B", "C"],
+                "ops": [("add", "C", "A"), ("valid",)],
+            },
+            "check": lambda r: r == [True, True],
+            "fail_msg": lambda r: f"expected [True, True], got {r}",
+        },
+        {
+            "name": "only the affected region moves",
+            "inputs": {
+                "nodes": ["A", "B", "C", "D", "E", "F"],
+                "ops": [("add", "D", "B"), ("order",)],
+            },
+            "check": lambda r: (
+                r[0] is True
+                and r[1][0] == "A"
+                and r[1][4:] == ["E", "F"]
+                and r[1].index("D") < r[1].index("B")
+            ),
+            "fail_msg": lambda r: (
+                f"expected A first, E and F untouched, D before B; got {r}"
+            ),
+        },
+        {
+            "name": "self-loop is rejected",
+            "inputs": {"nodes": ["A"], "ops": [("add", "A", "A"), ("order",)]},
+            "check": lambda r: r == [False, ["A"]],
+            "fail_msg": lambda r: f"expected [False, ['A']], got {r}",
+        },
+        {
+            "name": "cycle is rejected and leaves the graph unchanged",
+            "inputs": {
+                "nodes": ["A", "B", "C"],
+                "ops": [
+                    ("add", "A", "B"),
+                    ("add", "B", "C"),
+                    ("order",),
+                    ("add", "C", "A"),
+                    ("order",),
+                    ("remove", "C", "A"),
+                ],
+            },
+            "check": lambda r: (
+                r[:2] == [True, True]
+                and r[3] is False
+                and r[2] == r[4]
+                and r[5] is False
+            ),
+            "fail_msg": lambda r: (
+                f"expected add(C, A) False with the order unchanged, got {r}"
+            ),
+        },
+        {
+            "name": "duplicate edge is accepted",
+            "inputs": {
+                "nodes": ["A", "B"],
+                "ops": [("add", "B", "A"), ("add", "B", "A"), ("valid",)],
+            },
+            "check": lambda r: r == [True, True, True],
+            "fail_msg": lambda r: f"expected [True, True, True], got {r}",
+        },
+        {
+            "name": "remove then add the reverse edge",
+            "inputs": {
+                "nodes": ["A", "B", "C"],
+                "ops": [
+                    ("add", "A", "B"),
+                    ("add", "B", "C"),
+                    ("add", "C", "A"),
+                    ("remove", "B", "C"),
+                    ("remove", "B", "C"),
+                    ("add", "C", "A"),
+                    ("add", "C", "B"),
+                    ("valid",),
+                ],
+            },
+            "check": lambda r: r == [True, True, False, True, False, True, True, True],
+            "fail_msg": lambda r: (
+                f"expected [True, True, False, True, False, True, True, True], got {r}"
+            ),
+        },
+        {
+            "name": "chain added in reverse",
+            "inputs": {
+                "nodes": list(range(8)),
+                "ops": [("add", i + 1, i) for i in range(7)] + [("order",)],
+            },
+            "check": lambda r: all(r[:7]) and r[7] == list(range(7, -1, -1)),
+            "fail_msg": lambda r: f"expected order 7..0, got {r[-1]}",
+        },
+        {
+            "name": "random adds and removes match a reachability check",
+            "inputs": {"nodes": list(range(12)), "ops": ops},
+            "check": lambda r: r == expected,
+            "fail_msg": lambda r: f"mismatch at {first_mismatch(r, expected, ops)}",
+        },
+    ]
+
+    return run_all("incremental_topological_sort", tests, run_scenario)
@@ -0,0 +1,72 @@
+# Keyed Union-Find
+#
+# A union-find over arbitrary hashable keys (hostnames, string ids, ...)
+# that are discovered on the fly, with no universe size known up front.
+#
+#   add(key)            -> None
+#       Add key as its own component. Adding a known key does nothing.
+#   union(a, b)         -> bool
+#       Merge the components of a and b, adding unseen keys first.
+#       Return True if merged, False if already in the same component.
+#   find(key)           -> key
+#       Return the representative key of key's component (unseen keys
+#       are added first, so they are their own representative).
+#   connected(a, b)     -> bool
+#   size(key)           -> int     size of key's component
+#   members(key)        -> list    every key in key's component
+#   components()        -> list    one list of member keys per component
+#   len(uf)             -> int     number of keys
+#   uf.total_components -> int     number of components
+#
+# Costs: find/union/connected/size near O(1); members(key) O(size of the
+# component); components() O(number of keys), without scanning for roots.
+#
+# Implementation hints:
+#   - Map each key to a dense int id (a dict plus a list back to keys) and
+#     run an ordinary array union-find over the ids.
+#   - When the arrays fill up, double their capacity, so n adds cost O(n).
+#   - Keep each component's members as a circular linked list in a next[]
+#     array: union splices two circles by swapping next[root_a] and
+#     next[root_b], and members() walks one circle.
+#   - Keep the set of current roots so components() never scans all ids.
+#
+# Example:
+#   uf = KeyedUnionFind()
+#   uf.union("web-1", "db-1")      # True
+#   uf.union("db-1", "cache-1")    # True
+#   uf.add("web-2")
+#   uf.size("web-1")               # 3
+#   sorted(uf.members("db-1"))     # ["cache-1", "db-1", "web-1"]
+#   len(uf.components())           # 2 (member order within each is free)
+
+
+class KeyedUnionFind:
+    def __init__(self):
+        pass
+
+    def add(self, key) -> None:
+        pass
+
+    def union(self, a, b) -> bool:
+        pass
+
+    def find(self, key):
+        pass
+
+    def connected(self, a, b) -> bool:
+        pass
+
+    def size(self, key) -> int:
+        pass
+
+    def members(self, key) -> list:
+        pass
+
+    def components(self) -> list:
+        pass
+
+    def __len__(self) -> int:
+        pass
+
+
+solve = KeyedUnionFind
@@ -0,0 +1,85 @@
+from array import array
+
+
+class KeyedUnionFind:
+    def __init__(self, capacity=16):
+        self.ids = {}
+        self.keys = []
+        # Slots past len(self.keys) are preset, so adding a key is O(1)
+        self.parent = array("q", range(capacity))
+        self.size_of = array("q", [1]) * capacity
+        self.next = array("q", range(capacity))
+        self.roots = {}  # root id -> None, an insertion-ordered set
+        self.total_components = 0
+
+    def _id(self, key):
+        """Dense id of key, adding it if unseen."""
+        idx = self.ids.get(key)
+        if idx is None:
+            idx = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+            if idx == len(self.parent):
+                self._grow()
+            self.roots[idx] = None
+            self.total_components += 1
+        return idx
+
+    def _grow(self):
+        capacity = len(self.parent)
+        fresh = range(capacity, 2 * capacity)
+        self.parent.extend(fresh)
+        self.size_of.extend(array("q", [1]) * capacity)
+        self.next.extend(fresh)
+
+    def _root(self, idx):
+        parent = self.parent
+        while parent[idx] != idx:
+            parent[idx] = idx = parent[parent[idx]]
+        return idx
+
+    def add(self, key):
+        self._id(key)
+
+    def union(self, a, b):
+        root_a, root_b = self._root(self._id(a)), self._root(self._id(b))
+        if root_a == root_b:
+            return False
+        if self.size_of[root_a] < self.size_of[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size_of[root_a] += self.size_of[root_b]
+        # Splice the two member circles into one
+        nxt = self.next
+        nxt[root_a], nxt[root_b] = nxt[root_b], nxt[root_a]
+        del self.roots[root_b]
+        self.total_components -= 1
+        return True
+
+    def find(self, key):
+        return self.keys[self._root(self._id(key))]
+
+    def connected(self, a, b):
+        return self._root(self._id(a)) == self._root(self._id(b))
+
+    def size(self, key):
+        return self.size_of[self._root(self._id(key))]
+
+    def members(self, key):
+        start = self._id(key)
+        keys, nxt = self.keys, self.next
+        result = [keys[start]]
+        idx = nxt[start]
+        while idx != start:
+            result.append(keys[idx])
+            idx = nxt[idx]
+        return result
+
+    def components(self):
+        keys = self.keys
+        return [self.members(keys[root]) for root in self.roots]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+solve = KeyedUnionFind
@@ -0,0 +1,158 @@
+import random
+
+from test_utils import run_all
+
+
+def reference_groups(keys, pairs):
+    """Components by repeated merging of plain sets, as sorted lists."""
+    groups = {key: {key} for key in keys}
+    for a, b in pairs:
+        if groups[a] is not groups[b]:
+            merged = groups[a] | groups[b]
+            for key in merged:
+                groups[key] = merged
+    unique = {id(group): group for group in groups.values()}.values()
+    return sorted(sorted(group) for group in unique)
+
+
+def run_tests(KeyedUnionFind):
+    def run_scenario(ops):
+        """Construct KeyedUnionFind(), execute ops, return list of results."""
+        uf = KeyedUnionFind()
+        results = []
+        for op in ops:
+            if op[0] == "add":
+                uf.add(op[1])
+            elif op[0] == "union":
+                results.append(uf.union(op[1], op[2]))
+            elif op[0] == "find":
+                results.append(uf.find(op[1]))
+            elif op[0] == "connected":
+                results.append(uf.connected(op[1], op[2]))
+            elif op[0] == "size":
+                results.append(uf.size(op[1]))
+            elif op[0] == "members":
+                results.append(sorted(uf.members(op[1])))
+            elif op[0] == "components":
+                results.append(sorted(sorted(c) for c in uf.components()))
+            elif op[0] == "count":
+                results.append((len(uf), uf.total_components))
+        return results
+
+    rng = random.Random(22)
+    keys = [f"host-{i}" for i in range(300)]
+    pairs = [(rng.choice(keys), rng.choice(keys)) for _ in range(250)]
+    many = [("add", key) for key in keys] + [("union", a, b) for a, b in pairs]
+
+    tests = [
+        {
+            "name": "empty structure",
+            "inputs": {"ops": [("count",), ("components",)]},
+            "check": lambda r: r == [(0, 0), []],
+            "fail_msg": lambda r: f"expected [(0, 0), []], got {r}",
+        },
+        {
+            "name": "add is idempotent",
+            "inputs": {"ops": [("add", "a"), ("add", "a"), ("add", "b"), ("count",)]},
+            "check": lambda r: r == [(2, 2)],
+            "fail_msg": lambda r: f"expected [(2, 2)], got {r}",
+        },
+        {
+            "name": "union adds unseen keys",
+            "inputs": {
+                "ops": [("union", "web", "db"), ("count",), ("connected", "db", "web")]
+            },
+            "check": lambda r: r == [True, (2, 1), True],
+            "fail_msg": lambda r: f"expected [True, (2, 1), True], got {r}",
+        },
+        {
+            "name": "redundant union returns False",
+            "inputs": {
+                "ops": [("union", "a", "b"), ("union", "b", "a"), ("count",)],
+            },
+            "check": lambda r: r == [True, False, (2, 1)],
+            "fail_msg": lambda r: f"expected [True, False, (2, 1)], got {r}",
+        },
+        {
+            "name": "find returns a key of the component",
+            "inputs": {
+                "ops": [
+                    ("union", "a", "b"),
+                    ("union", "c", "a"),
+                    ("find", "a"),
+                    ("find", "b"),
+                    ("find", "c"),
+                    ("find", "z"),
+                ],
+            },
+            "check": lambda r: r[2] == r[3] == r[4] in ("a", "b", "c") and r[5] == "z",
+            "fail_msg": lambda r: f"expected one root in a, b, c and z alone, got {r}",
+        },
+        {
+            "name": "mixed key types",
+            "inputs": {
+                "ops": [
+                    ("union", 1, "1"),
+                    ("union", (1, 2), 1.5),
+                    ("connected", 1, "1"),
+                    ("connected", 1, 1.5),
+                ],
+            },
+            "check": lambda r: r == [True, True, True, False],
+            "fail_msg": lambda r: f"expected [True, True, True, False], got {r}",
+        },
+        {
+            "name": "sizes and members",
+            "inputs": {
+                "ops": [
+                    ("union", "a", "b"),
+                    ("union", "c", "d"),
+                    ("union", "e", "d"),
+                    ("add", "f"),
+                    ("size", "a"),
+                    ("size", "e"),
+                    ("size", "f"),
+                    ("members", "c"),
+                    ("members", "f"),
+                ],
+            },
+            "check": lambda r: r[3:] == [2, 3, 1, ["c", "d", "e"], ["f"]],
+            "fail_msg": lambda r: (
+                f"expected sizes 2, 3, 1 and members [c, d, e], [f]; got {r[3:]}"
+            ),
+        },
+        {
+            "name": "components after merges",
+            "inputs": {
+                "ops": [
+                    ("union", "a", "b"),
+                    ("union", "c", "d"),
+                    ("add", "e"),
+                    ("union", "b", "c"),
+                    ("components",),
+                ],
+            },
+            "check": lambda r: r[-1] == [["a", "b", "c", "d"], ["e"]],
+            "fail_msg": lambda r: f"expected [[a, b, c, d], [e]], got {r[-1]}",
+        },
+        {
+            "name": "growth past the initial capacity (1000 keys)",
+            "inputs": {
+                "ops": [("union", f"k{i}", f"k{i + 1}") for i in range(0, 999, 2)]
+                + [("count",), ("connected", "k0", "k1"), ("connected", "k1", "k2")]
+            },
+            "check": lambda r: r[-3:] == [(1000, 500), True, False],
+            "fail_msg": lambda r: f"expected [(1000, 500), True, False], got {r[-3:]}",
+        },
+        {
+            "name": "random unions match a set-merging reference",
+            "inputs": {"ops": many + [("components",)]},
+            "check": lambda r: r[-1] == reference_groups(keys, pairs),
+            "fail_msg": lambda r: (
+                f"expected {len(reference_groups(keys, pairs))} components, "
+                f"got {len(r[-1])}"
+            ),
+        },
+    ]
+
+    return run_all("keyed_union_find", tests, run_scenario)
@@ -0,0 +1,60 @@
+# Offline Dynamic Connectivity
+#
+# Undirected edges over nodes 0..n-1 are added and removed over time, and
+# connectivity queries are interleaved with the changes. All operations
+# are known up front (offline). Answer every query without rebuilding a
+# union-find from scratch at each one.
+#
+# Input:
+#   n   — number of nodes
+#   ops — list of operations, in time order:
+#         ("add", u, v)        add the edge u-v (an edge may be added
+#                              more than once; each add needs its own remove)
+#         ("remove", u, v)     remove one copy of u-v (ignored if absent)
+#         ("connected", u, v)  query: is there a path between u and v?
+#         ("components",)      query: how many connected components?
+#
+# Output:
+#   The answers to the queries, in order (bool or int).
+#
+# Example:
+#   solve(3, [("add", 0, 1), ("connected", 0, 1), ("remove", 0, 1),
+#             ("connected", 0, 1), ("components",)])
+#   -> [True, False, 3]
+#
+# Approach (segment tree over time, O((E + Q) log Q log n)):
+#   1. Number the queries 0..Q-1. Each edge copy is alive over a range of
+#      queries [first, last): from its add to its remove (or the end).
+#   2. Build a segment tree over 0..Q-1 and store each edge in the
+#      O(log Q) tree nodes whose ranges exactly cover its alive range.
+#   3. DFS the tree. On entering a node, union its edges; at a leaf,
+#      answer that query; on leaving, undo the node's unions.
+#
+# Undoing needs a RollbackUnionFind:
+#   - union by size, and NO path compression, so find() only reads the
+#     parents and every union changes exactly one parent and one size
+#   - union() pushes the root it attached onto a history log
+#   - snapshot() returns len(history)
+#   - rollback(snapshot) pops and reverts unions until the log has that
+#     length again
+
+
+class RollbackUnionFind:
+    def __init__(self, n: int):
+        pass
+
+    def find(self, x: int) -> int:
+        pass
+
+    def union(self, x: int, y: int) -> bool:
+        pass
+
+    def snapshot(self) -> int:
+        pass
+
+    def rollback(self, snapshot: int) -> None:
+        pass
+
+
+def solve(n: int, ops: list) -> list:
+    pass
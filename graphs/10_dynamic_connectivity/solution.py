@@ -0,0 +1,101 @@
+from array import array
+
+
+class RollbackUnionFind:
+    def __init__(self, n):
+        code = "i" if n < 2**31 else "q"
+        self.parent = array(code, range(n))
+        self.size = array(code, [1]) * n
+        self.total_components = n
+        self.history = []  # the root attached by each successful union
+
+    def find(self, idx):
+        # No path compression: unions must stay undoable one parent at a time
+        parent = self.parent
+        while parent[idx] != idx:
+            idx = parent[idx]
+        return idx
+
+    def union(self, u, v):
+        root_u, root_v = self.find(u), self.find(v)
+        if root_u == root_v:
+            return False
+        if self.size[root_u] < self.size[root_v]:
+            root_u, root_v = root_v, root_u
+        self.parent[root_v] = root_u
+        self.size[root_u] += self.size[root_v]
+        self.total_components -= 1
+        self.history.append(root_v)
+        return True
+
+    def snapshot(self):
+        return len(self.history)
+
+    def rollback(self, snapshot):
+        parent, size, history = self.parent, self.size, self.history
+        while len(history) > snapshot:
+            root_v = history.pop()
+            root_u = parent[root_v]
+            size[root_u] -= size[root_v]
+            parent[root_v] = root_v
+            self.total_components += 1
+
+
+def solve(n, ops):
+    # Each edge copy is alive over the queries [first, last)
+    queries, spans, opened = [], [], {}
+    for op in ops:
+        if op[0] == "add":
+            opened.setdefault(_edge(op[1], op[2]), []).append(len(queries))
+        elif op[0] == "remove":
+            starts = opened.get(_edge(op[1], op[2]))
+            if starts:
+                spans.append((starts.pop(), len(queries), op[1], op[2]))
+        else:
+            queries.append(op)
+    for (u, v), starts in opened.items():
+        spans.extend((first, len(queries), u, v) for first in starts)
+    if not queries:
+        return []
+
+    # Segment tree over query times, leaves at width..width+Q-1
+    width = 1 << (len(queries) - 1).bit_length()
+    tree = [[] for _ in range(2 * width)]
+    for first, last, u, v in spans:
+        lo, hi = first + width, last + width
+        while lo < hi:
+            if lo & 1:
+                tree[lo].append((u, v))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                tree[hi].append((u, v))
+            lo >>= 1
+            hi >>= 1
+
+    uf = RollbackUnionFind(n)
+    answers = []
+    stack = [(1, None)]
+    while stack:
+        node, snapshot = stack.pop()
+        if snapshot is not None:
+            uf.rollback(snapshot)
+            continue
+        if node >= width + len(queries):
+            continue
+        stack.append((node, uf.snapshot()))
+        for u, v in tree[node]:
+            uf.union(u, v)
+        if node < width:
+            stack.append((2 * node + 1, None))
+            stack.append((2 * node, None))
+        elif queries[node - width][0] == "connected":
+            _, u, v = queries[node - width]
+            answers.append(uf.find(u) == uf.find(v))
+        else:
+            answers.append(uf.total_components)
+    return answers
+
+
+def _edge(u, v):
+    return (u, v) if u <= v else (v, u)
@@ -0,0 +1,315 @@
+import random
+import sys
+from collections import Counter
+
+from test_utils import run_all
+
+
+def brute_force(n, ops):
+    """Answer each query with a fresh flood fill over the live edges."""
+    live, answers = Counter(), []
+    for op in ops:
+        if op[0] in ("add", "remove"):
+            edge = (min(op[1], op[2]), max(op[1], op[2]))
+            if op[0] == "add":
+                live[edge] += 1
+            elif live[edge]:
+                live[edge] -= 1
+            continue
+        adj = {v: [] for v in range(n)}
+        for (u, v), copies in live.items():
+            if copies:
+                adj[u].append(v)
+                adj[v].append(u)
+        label = {}
+        for s in range(n):
+            if s in label:
+                continue
+            label[s], stack = s, [s]
+            while stack:
+                for w in adj[stack.pop()]:
+                    if w not in label:
+                        label[w] = s
+                        stack.append(w)
+        if op[0] == "connected":
+            answers.append(label[op[1]] == label[op[2]])
+        else:
+            answers.append(len(set(label.values())))
+    return answers
+
+
+def random_ops(n, count, seed):
+    rng = random.Random(seed)
+    live, ops = [], []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.35:
+            edge = (rng.randrange(n), rng.randrange(n))
+            live.append(edge)
+            ops.append(("add", *edge))
+        elif roll < 0.55 and live:
+            ops.append(("remove", *live.pop(rng.randrange(len(live)))))
+        elif roll < 0.9:
+            ops.append(("connected", rng.randrange(n), rng.randrange(n)))
+        else:
+            ops.append(("components",))
+    return ops
+
+
+BENCH = {
+    # n counts operations over n/8 nodes
+    "random": lambda n: {"n": max(n // 8, 1), "ops": random_ops(max(n // 8, 1), n, n)},
+}
+BENCH_UNIT = "ops"
+
+
+def run_tests(solve):
+    # The exercise module defines RollbackUnionFind next to solve
+    RollbackUnionFind = sys.modules[solve.__module__].RollbackUnionFind
+
+    def run_scenario(n, steps):
+        """Construct RollbackUnionFind(n), execute steps, return list of results."""
+        uf = RollbackUnionFind(n)
+        snapshots, results = [], []
+        for step in steps:
+            if step[0] == "union":
+                results.append(uf.union(step[1], step[2]))
+            elif step[0] == "connected":
+                results.append(uf.find(step[1]) == uf.find(step[2]))
+            elif step[0] == "components":
+                results.append(uf.total_components)
+            elif step[0] == "size":
+                results.append(uf.size[uf.find(step[1])])
+            elif step[0] == "snapshot":
+                snapshots.append(uf.snapshot())
+            elif step[0] == "rollback":
+                # Roll back to the i-th snapshot taken so far
+                uf.rollback(snapshots[step[1]])
+        return results
+
+    def run(n, ops=None, steps=None):
+        return solve(n, ops) if steps is None else run_scenario(n, steps)
+
+    random_cases = [(10, random_ops(10, 200, seed)) for seed in range(3)]
+
+    tests = [
+        {
+            "name": "no queries",
+            "inputs": {"n": 3, "ops": [("add", 0, 1), ("remove", 0, 1)]},
+            "check": lambda r: r == [],
+            "fail_msg": lambda r: f"expected [], got {r}",
+        },
+        {
+            "name": "queries with no edges",
+            "inputs": {"n": 3, "ops": [("connected", 0, 1), ("components",)]},
+            "check": lambda r: r == [False, 3],
+            "fail_msg": lambda r: f"expected [False, 3], got {r}",
+        },
+        {
+            "name": "node is connected to itself",
+            "inputs": {"n": 1, "ops": [("connected", 0, 0)]},
+            "check": lambda r: r == [True],
+            "fail_msg": lambda r: f"expected [True], got {r}",
+        },
+        {
+            "name": "add then remove",
+            "inputs": {
+                "n": 3,
+                "ops": [
+                    ("add", 0, 1),
+                    ("connected", 0, 1),
+                    ("remove", 0, 1),
+                    ("connected", 0, 1),
+                    ("components",),
+                ],
+            },
+            "check": lambda r: r == [True, False, 3],
+            "fail_msg": lambda r: f"expected [True, False, 3], got {r}",
+        },
+        {
+            "name": "remove matches either endpoint order",
+            "inputs": {
+                "n": 2,
+                "ops": [("add", 0, 1), ("remove", 1, 0), ("connected", 0, 1)],
+            },
+            "check": lambda r: r == [False],
+            "fail_msg": lambda r: f"expected [False], got {r}",
+        },
+        {
+            "name": "removing an absent edge is ignored",
+            "inputs": {
+                "n": 3,
+                "ops": [("remove", 0, 1), ("add", 1, 2), ("components",)],
+            },
+            "check": lambda r: r == [2],
+            "fail_msg": lambda r: f"expected [2], got {r}",
+        },
+        {
+            "name": "duplicate edge needs two removes",
+            "inputs": {
+                "n": 2,
+                "ops": [
+                    ("add", 0, 1),
+                    ("add", 0, 1),
+                    ("remove", 0, 1),
+                    ("connected", 0, 1),
+                    ("remove", 0, 1),
+                    ("connected", 0, 1),
+                ],
+            },
+            "check": lambda r: r == [True, False],
+            "fail_msg": lambda r: f"expected [True, False], got {r}",
+        },
+        {
+            "name": "path broken in the middle, then bridged",
+            "inputs": {
+                "n": 4,
+                "ops": [
+                    ("add", 0, 1),
+                    ("add", 1, 2),
+                    ("add", 2, 3),
+                    ("connected", 0, 3),
+                    ("remove", 1, 2),
+                    ("connected", 0, 3),
+                    ("components",),
+                    ("add", 0, 3),
+                    ("connected", 1, 2),
+                    ("components",),
+                ],
+            },
+            "check": lambda r: r == [True, False, 2, True, 1],
+            "fail_msg": lambda r: f"expected [True, False, 2, True, 1], got {r}",
+        },
+        {
+            "name": "rollback undoes the unions since the snapshot",
+            "inputs": {
+                "n": 4,
+                "steps": [
+                    ("union", 0, 1),
+                    ("snapshot",),
+                    ("union", 1, 2),
+                    ("union", 2, 3),
+                    ("components",),
+                    ("size", 0),
+                    ("rollback", 0),
+                    ("components",),
+                    ("connected", 0, 1),
+                    ("connected", 1, 2),
+                    ("size", 0),
+                    ("size", 2),
+                ],
+            },
+            "check": lambda r: r == [True, True, True, 1, 4, 3, True, False, 2, 1],
+            "fail_msg": lambda r: (
+                f"expected [True, True, True, 1, 4, 3, True, False, 2, 1], got {r}"
+            ),
+        },
+        {
+            "name": "nested snapshots roll back one level at a time",
+            "inputs": {
+                "n": 4,
+                "steps": [
+                    ("snapshot",),
+                    ("union", 0, 1),
+                    ("snapshot",),
+                    ("union", 2, 3),
+                    ("snapshot",),
+                    ("union", 0, 3),
+                    ("components",),
+                    ("rollback", 2),
+                    ("components",),
+                    ("connected", 0, 3),
+                    ("rollback", 1),
+                    ("components",),
+                    ("connected", 2, 3),
+                    ("connected", 0, 1),
+                    ("rollback", 0),
+                    ("components",),
+                    ("connected", 0, 1),
+                ],
+            },
+            "check": lambda r: r
+            == [True, True, True, 1, 2, False, 3, False, True, 4, False],
+            "fail_msg": lambda r: (
+                "expected [True, True, True, 1, 2, False, 3, False, True, 4, "
+                f"False], got {r}"
+            ),
+        },
+        {
+            "name": "rollback straight to an earlier snapshot, then union again",
+            "inputs": {
+                "n": 4,
+                "steps": [
+                    ("snapshot",),
+                    ("union", 0, 1),
+                    ("snapshot",),
+                    ("union", 1, 2),
+                    ("rollback", 0),
+                    ("components",),
+                    ("size", 1),
+                    ("union", 2, 3),
+                    ("connected", 0, 1),
+                    ("connected", 2, 3),
+                    ("components",),
+                    ("size", 3),
+                ],
+            },
+            "check": lambda r: r == [True, True, 4, 1, True, False, True, 3, 2],
+            "fail_msg": lambda r: (
+                f"expected [True, True, 4, 1, True, False, True, 3, 2], got {r}"
+            ),
+        },
+        {
+            "name": "failed union leaves nothing to roll back",
+            "inputs": {
+                "n": 3,
+                "steps": [
+                    ("union", 0, 1),
+                    ("snapshot",),
+                    ("union", 1, 0),
+                    ("rollback", 0),
+                    ("connected", 0, 1),
+                    ("components",),
+                ],
+            },
+            "check": lambda r: r == [True, False, True, 2],
+            "fail_msg": lambda r: f"expected [True, False, True, 2], got {r}",
+        },
+        {
+            "name": "sizes are restored after a rollback",
+            "inputs": {
+                "n": 5,
+                "steps": [
+                    ("union", 0, 1),
+                    ("union", 0, 2),
+                    ("snapshot",),
+                    ("union", 3, 4),
+                    ("union", 0, 3),
+                    ("size", 4),
+                    ("rollback", 0),
+                    ("size", 0),
+                    ("size", 3),
+                    ("components",),
+                    ("union", 0, 3),
+                    ("size", 3),
+                ],
+            },
+            "check": lambda r: r == [True, True, True, True, 5, 3, 1, 3, True, 4],
+            "fail_msg": lambda r: (
+                f"expected [True, True, True, True, 5, 3, 1, 3, True, 4], got {r}"
+            ),
+        },
+    ] + [
+        {
+            "name": f"random operations (seed {seed}) match a flood-fill reference",
+            "inputs": {"n": n, "ops": ops},
+            "check": lambda r, n=n, ops=ops: r == brute_force(n, ops),
+            "fail_msg": lambda r, n=n, ops=ops: (
+                f"{sum(a != b for a, b in zip(r, brute_force(n, ops)))} of "
+                f"{len(r)} answers differ from the reference"
+            ),
+        }
+        for seed, (n, ops) in enumerate(random_cases)
+    ]
+
+    return run_all("dynamic_connectivity", tests, run)
@@ -1,8 +1,19 @@
+from generators import erdos_renyi, weighted
 from test_utils import run_all
 
 INF = float("inf")
 
 
+BENCH = {
+    "sparse random": lambda n: {
+        "nodes": list(range(n)),
+        "edges": list(weighted(erdos_renyi(n, 4 / n, seed=n, directed=True), seed=n)),
+    },
+}
+BENCH_SIZES = [8, 16, 32, 64, 128]
+BENCH_UNIT = "V"
+
+
 def run_tests(solve):
     tests = [
         {
@@ -155,4 +166,4 @@ def run_tests(solve):
         },
     ]
 
-    run_all("floyd_warshall", tests, solve)
+    return run_all("floyd_warshall", tests, solve)
@@ -0,0 +1,474 @@
+"""
+Benchmarks for graph representations and engines.
+
+Usage:
+    python -m graphs.benchmarks                  # List benchmarks
+    python -m graphs.benchmarks nodes            # Run one
+    python -m graphs.benchmarks nodes --n 200000 # Override the graph size
+"""
+
+import importlib
+import sys
+
+from bench import format_time, time_call
+from generators import erdos_renyi, power_law, random_dag
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    """Register func(n) under its name; the docstring's first line is its help."""
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def solution(name):
+    """solve() of a graphs solution, e.g. solution("01_breadth_first_search")."""
+    return importlib.import_module(f"graphs.{name}.solution").solve
+
+
+def _table(header, rows):
+    widths = [max(len(str(r[i])) for r in [header] + rows) for i in range(len(header))]
+    for r in [header] + rows:
+        print("  " + "  ".join(str(c).rjust(w) for c, w in zip(r, widths)))
+
+
+@benchmark
+def nodes(n=100_000):
+    """GraphNode vs SlotGraphNode vs IdentityGraphNode: build, BFS and DFS time."""
+    from graphs.graph import GraphNode, IdentityGraphNode, SlotGraphNode
+    from graphs.test_utils import build_graph, make_graph
+
+    bfs = solution("01_breadth_first_search")
+    dfs = solution("02_depth_first_search")
+    edges = list(erdos_renyi(n, 8 / n, seed=n))
+    print(f"Random graph: {n} vertices, {len(edges)} edges (undirected)\n")
+
+    variants = [
+        ("make_graph", make_graph, GraphNode),
+        ("make_graph", make_graph, SlotGraphNode),
+        ("build_graph", build_graph, SlotGraphNode),
+        ("build_graph", build_graph, IdentityGraphNode),
+    ]
+    rows, baseline = [], None
+    for builder_name, builder, node_class in variants:
+        build = min(time_call(builder, {"edges": edges, "node_class": node_class}, 3))
+        graph = builder(edges, node_class=node_class)
+        start = {"start": next(iter(graph.values()))}
+        times = [min(time_call(f, start, 3)) for f in (bfs, dfs)]
+        baseline = baseline or times
+        rows.append(
+            [
+                builder_name,
+                node_class.__name__,
+                format_time(build),
+                format_time(times[0]),
+                format_time(times[1]),
+                f"{baseline[0] / times[0]:.2f}x",
+            ]
+        )
+    _table(["builder", "node", "build", "bfs", "dfs", "bfs speedup"], rows)
+
+
+@benchmark
+def binary(n=200_000):
+    """Open a graph: make_graph from edge tuples vs mmap of a binary CSR file."""
+    import os
+    import tempfile
+    from array import array
+
+    from graphs.csr import CSRGraph
+    from graphs.test_utils import make_graph
+
+    bfs = solution("01_breadth_first_search")
+    edges = list(erdos_renyi(n, 10 / n, seed=n))
+    src = array("q", (a for a, _ in edges))
+    dst = array("q", (b for _, b in edges))
+    graph = CSRGraph.from_ids(n, src, dst)
+    print(f"Random graph: {n} vertices, {len(edges)} edges (undirected)\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.csr")
+        graph.save(path)
+        size = os.path.getsize(path)
+        rows = []
+        for label, open_graph in [
+            ("make_graph", lambda: make_graph(edges)),
+            ("CSRGraph.from_edges", lambda: CSRGraph.from_edges(edges)),
+            ("CSRGraph.load (mmap)", lambda: CSRGraph.load(path)),
+        ]:
+            opened = min(time_call(open_graph, {}, 3))
+            g = open_graph()
+            start = next(iter(g.values())) if isinstance(g, dict) else g.node(0)
+            traverse = min(time_call(bfs, {"start": start}, 3))
+            rows.append([label, format_time(opened), format_time(traverse)])
+            del g, start
+        _table(["open with", "open", "bfs"], rows)
+        print(f"\n  file size: {size / 2**20:.1f} MB")
+
+
+@benchmark
+def bfs(n=200_000):
+    """Deque BFS (GraphNode and CSR) vs the direction-optimizing graphs.bfs engine."""
+    from graphs import bfs as engine
+    from graphs.csr import CSRGraph
+    from graphs.test_utils import make_graph
+
+    solve = solution("01_breadth_first_search")
+    for shape, edges in [
+        ("random", list(erdos_renyi(n, 10 / n, seed=n))),
+        ("power law", list(power_law(n, 5, seed=n))),
+    ]:
+        graph = CSRGraph.from_edges(edges)
+        nodes = make_graph(edges)
+        source = graph.labels[0]
+        print(f"{shape}: {n} vertices, {len(edges)} edges (undirected)")
+        rows = []
+        run = {"graph": graph, "source": source}
+        for label, func, inputs in [
+            ("solution, GraphNode", solve, {"start": nodes[source]}),
+            ("solution, CSRNode", solve, {"start": graph.node(source)}),
+            ("engine, top-down", engine.bfs, dict(run, direction="top-down")),
+            ("engine, auto", engine.bfs, run),
+        ]:
+            rows.append([label, format_time(min(time_call(func, inputs, 3)))])
+        _table(["bfs", "time"], rows)
+        steps = engine.bfs(graph, source)["steps"]
+        print(f"  auto steps: {', '.join(steps)}\n")
+
+
+@benchmark
+def multi_bfs(n=50_000, sources=64):
+    """K-source BFS: solution per source vs engine, process pool and bit-parallel."""
+    import os
+
+    from graphs.csr import CSRGraph
+    from graphs.multi_bfs import multi_source_bfs
+
+    solve = solution("01_breadth_first_search")
+    graph = CSRGraph.from_edges(erdos_renyi(n, 10 / n, seed=n))
+    labels = graph.labels[:sources]
+    cpus = os.cpu_count() or 1
+    print(f"Random graph: {n} vertices, {graph.m // 2} edges, {sources} sources\n")
+
+    rows = []
+    for label, func in [
+        ("solution per source", lambda: [solve(graph.node(s)) for s in labels]),
+        ("engine per source", lambda: multi_source_bfs(graph, labels)),
+        ("bit-parallel", lambda: multi_source_bfs(graph, labels, bit_parallel=True)),
+        (f"pool ({cpus} workers)", lambda: multi_source_bfs(graph, labels, cpus)),
+        (
+            f"pool + bit-parallel ({cpus} workers)",
+            lambda: multi_source_bfs(graph, labels, cpus, bit_parallel=True),
+        ),
+    ]:
+        rows.append([label, format_time(min(time_call(func, {}, 1, warmup=0)))])
+    _table(["strategy", "time"], rows)
+
+
+@benchmark
+def incremental_topo(n=1_000):
+    """Keep a DAG sorted under edge insertions: Pearce-Kelly vs re-running Kahn."""
+    kahn = solution("03_topological_sort")
+    topo_class = solution("08_incremental_topological_sort")
+    nodes = list(range(n))
+    edges = list(dict.fromkeys(random_dag(n, 3 * n, seed=n)))
+    print(f"Random DAG: {n} vertices, {len(edges)} edges inserted one at a time\n")
+
+    def incremental():
+        topo = topo_class(nodes)
+        for u, v in edges:
+            topo.add_edge(u, v)
+        return topo.order()
+
+    def recompute():
+        for i in range(1, len(edges) + 1):
+            order = kahn(nodes, edges[:i])
+        return order
+
+    rows, baseline = [], None
+    for label, func in [
+        ("Kahn after each edge", recompute),
+        ("Pearce-Kelly", incremental),
+    ]:
+        elapsed = min(time_call(func, {}, 1, warmup=0))
+        baseline = baseline or elapsed
+        per_edge = format_time(elapsed / len(edges))
+        speedup = f"{baseline / elapsed:.1f}x"
+        rows.append([label, format_time(elapsed), per_edge, speedup])
+    _table(["strategy", "total", "per edge", "speedup"], rows)
+
+
+@benchmark
+def dag(n=300):
+    """Simulated build (1-5ms sleeping tasks): serial Kahn order vs run_dag threads."""
+    import time
+
+    from graphs.dag import layers, run_dag
+
+    kahn = solution("03_topological_sort")
+    nodes = list(range(n))
+    edges = list(random_dag(n, 2 * n, seed=n))
+    widths = [len(layer) for layer in layers(nodes, edges)]
+    print(f"Random DAG: {n} tasks, {len(edges)} edges, {len(widths)} layers")
+    print(f"  widest layer: {max(widths)} tasks\n")
+
+    def build(node):
+        time.sleep((1 + node % 5) / 1000)
+
+    start = time.perf_counter()
+    for node in kahn(nodes, edges):
+        build(node)
+    serial = time.perf_counter() - start
+
+    rows = [["serial", format_time(serial), "", "", "1.0x"]]
+    for workers in (2, 8, 32):
+        report = run_dag(nodes, edges, build, workers=workers)
+        rows.append(
+            [
+                f"run_dag, {workers} threads",
+                format_time(report["wall"]),
+                format_time(report["critical_path"]),
+                f"{report['utilization']:.0%}",
+                f"{serial / report['wall']:.1f}x",
+            ]
+        )
+    _table(["strategy", "wall", "critical path", "utilization", "speedup"], rows)
+
+
+@benchmark
+def array_topo(n=200_000):
+    """Topological sort of a 10-edges-per-vertex DAG: dict Kahn vs array/CSR Kahn."""
+    import os
+    import tempfile
+    from array import array
+
+    from bench import peak_memory
+    from graphs.csr import CSRGraph
+    from graphs.dag import array_topological_sort, csr_topological_sort
+
+    kahn = solution("03_topological_sort")
+    nodes = list(range(n))
+    edges = list(random_dag(n, 10 * n, seed=n))
+    src = array("q", (a for a, _ in edges))
+    dst = array("q", (b for _, b in edges))
+    graph = CSRGraph.from_ids(n, src, dst, directed=True)
+    labelled = {"nodes": nodes, "edges": edges}
+    print(f"Random DAG: {n} vertices, {len(edges)} edges\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dag.csr")
+        graph.save(path)
+        rows = []
+        for label, func, inputs in [
+            ("solution (dict Kahn)", kahn, labelled),
+            ("array_topological_sort", array_topological_sort, labelled),
+            ("csr_topological_sort", csr_topological_sort, {"graph": graph}),
+            (
+                "CSRGraph.load + csr_topological_sort",
+                lambda: csr_topological_sort(CSRGraph.load(path)),
+                {},
+            ),
+        ]:
+            elapsed = min(time_call(func, inputs, 1, warmup=0))
+            peak = peak_memory(func, inputs)
+            rows.append([label, format_time(elapsed), f"{peak / 2**20:.0f} MB"])
+        _table(["sort", "time", "peak memory"], rows)
+
+
+@benchmark
+def union_find(n=1_000_000):
+    """UnionFind: union() per pair vs union_many, and array vs list storage."""
+    import random
+
+    from bench import peak_memory
+
+    union_find_class = solution("04_union_find")
+    rng = random.Random(n)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(n)]
+    ids = list(range(n))
+    print(f"{n} elements, {len(pairs)} random unions\n")
+
+    def one_by_one():
+        uf = union_find_class(n)
+        for u, v in pairs:
+            uf.union(u, v)
+        return [uf.find(i) for i in ids]
+
+    def batched():
+        uf = union_find_class(n)
+        uf.union_many(pairs)
+        return uf.find_many(ids)
+
+    rows = []
+    for label, func in [
+        ("union / find", one_by_one),
+        ("union_many / find_many", batched),
+    ]:
+        rows.append([label, format_time(min(time_call(func, {}, 3, warmup=0)))])
+    _table(["calls", "time"], rows)
+
+    lists = peak_memory(lambda: (list(range(n)), [1] * n), {}) / 2**20
+    arrays = peak_memory(union_find_class, {"n": n}) / 2**20
+    print(f"\n  storage: {arrays:.1f} MB as arrays, {lists:.1f} MB as lists")
+
+
+@benchmark
+def dynamic_connectivity(n=2_000):
+    """Queries over a changing edge set: rebuild UnionFind per query vs offline."""
+    import random
+    from collections import Counter
+
+    union_find_class = solution("04_union_find")
+    offline = solution("10_dynamic_connectivity")
+    rng = random.Random(n)
+    live, ops = [], []
+    for _ in range(5 * n):
+        if rng.random() < 0.5:
+            live.append((rng.randrange(n), rng.randrange(n)))
+            ops.append(("add", *live[-1]))
+        elif rng.random() < 0.3 and live:
+            ops.append(("remove", *live.pop(rng.randrange(len(live)))))
+        else:
+            ops.append(("connected", rng.randrange(n), rng.randrange(n)))
+    queries = sum(op[0] == "connected" for op in ops)
+    print(f"{n} nodes, {len(ops)} operations ({queries} queries)\n")
+
+    def rebuild():
+        edges, answers = Counter(), []
+        for op in ops:
+            edge = (min(op[1], op[2]), max(op[1], op[2]))
+            if op[0] == "add":
+                edges[edge] += 1
+            elif op[0] == "remove":
+                edges[edge] -= 1
+            else:
+                uf = union_find_class(n)
+                uf.union_many(e for e, copies in edges.items() if copies)
+                answers.append(uf.find(op[1]) == uf.find(op[2]))
+        return answers
+
+    rows, baseline = [], None
+    for label, func in [
+        ("rebuild per query", rebuild),
+        ("offline (segment tree)", lambda: offline(n, ops)),
+    ]:
+        elapsed = min(time_call(func, {}, 1, warmup=0))
+        baseline = baseline or elapsed
+        rows.append([label, format_time(elapsed), f"{baseline / elapsed:.1f}x"])
+    _table(["strategy", "time", "speedup"], rows)
+
+
+@benchmark
+def concurrent_union_find(n=200_000):
+    """Unions fed from 1..N threads: one global lock vs striped vs CAS-style."""
+    import os
+    import random
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from graphs.concurrent_union_find import ConcurrentUnionFind, free_threaded
+
+    union_find_class = solution("04_union_find")
+    rng = random.Random(n)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(n)]
+    cpus = os.cpu_count() or 1
+    reference = union_find_class(n)
+    expected = n - reference.union_many(pairs)
+    build = "free-threaded" if free_threaded() else "GIL (threads cannot scale)"
+    print(f"{n} elements, {len(pairs)} random unions, {cpus} CPUs, {build}\n")
+
+    def global_lock():
+        uf, lock = union_find_class(n), threading.Lock()
+
+        def feed(batch):
+            for u, v in batch:
+                with lock:
+                    uf.union(u, v)
+
+        return uf, feed
+
+    def striped():
+        uf = ConcurrentUnionFind(n, optimistic=False)
+        return uf, uf.union_many
+
+    def optimistic():
+        uf = ConcurrentUnionFind(n, optimistic=True)
+        return uf, uf.union_many
+
+    threads = sorted({1, 2, 4, cpus})
+    rows = []
+    for label, make in [
+        ("global lock", global_lock),
+        ("striped locks", striped),
+        ("CAS-style", optimistic),
+    ]:
+        times = []
+        for count in threads:
+
+            def run():
+                uf, feed = make()
+                with ThreadPoolExecutor(count) as pool:
+                    list(pool.map(feed, [pairs[i::count] for i in range(count)]))
+                return uf
+
+            times.append(min(time_call(run, {}, 3, warmup=0)))
+            assert run().total_components == expected
+        speedup = f"{times[0] / times[-1]:.2f}x"
+        rows.append([label] + [format_time(t) for t in times] + [speedup])
+    _table(["locking"] + [f"{t} threads" for t in threads] + ["scaling"], rows)
+
+
+@benchmark
+def heap(n=2_000):
+    """Dijkstra and Prim on CSR: lazy heapq vs IndexedHeap of arity 2, 4 and 8."""
+    from functools import partial
+
+    from bench import peak_memory
+    from generators import weighted
+    from graphs.csr import CSRGraph
+    from graphs.heap import IndexedHeap
+
+    dijkstra = solution("05_dijkstra")
+    prim = solution("06_prims_mst")
+    queues = [("heapq (lazy)", None)] + [
+        (f"IndexedHeap, arity {d}", partial(IndexedHeap, arity=d)) for d in (2, 4, 8)
+    ]
+    for shape, p in [("dense", 0.25), ("sparse", 8 / n)]:
+        edges = list(weighted(erdos_renyi(n, p, seed=n, directed=True), seed=n))
+        directed = CSRGraph.from_edges(edges, directed=True)
+        undirected = CSRGraph.from_edges(edges)
+        nodes = list(undirected.labels)
+        print(f"{shape}: {n} vertices, {len(edges)} edges")
+        rows = []
+        for label, queue in queues:
+            row = [label]
+            for func, inputs in [
+                (dijkstra, {"edges": directed, "source": 0, "queue": queue}),
+                (prim, {"nodes": nodes, "edges": undirected, "queue": queue}),
+            ]:
+                row.append(format_time(min(time_call(func, inputs, 3))))
+                row.append(f"{peak_memory(func, inputs) / 2**10:.0f} KB")
+            rows.append(row)
+        _table(["queue", "dijkstra", "peak", "prim", "peak"], rows)
+        print()
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in BENCHMARKS:
+        print("Benchmarks:")
+        width = max(map(len, BENCHMARKS))
+        for name, func in BENCHMARKS.items():
+            print(f"  {name:<{width}} {func.__doc__.splitlines()[0]}")
+        print("\nUsage: python -m graphs.benchmarks <name> [--n N]")
+        sys.exit(0 if not args else 1)
+
+    kwargs = {}
+    if "--n" in args:
+        kwargs["n"] = int(args[args.index("--n") + 1])
+    BENCHMARKS[args[0]](**kwargs)
+
+
+if __name__ == "__main__":
+    main()
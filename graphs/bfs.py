@@ -0,0 +1,117 @@
+"""
+Level-synchronous, direction-optimizing BFS over a CSRGraph.
+
+Each level is expanded in one of two ways (Beamer et al., 2012):
+
+    top-down   scan the frontier's out-arcs for unvisited vertices
+    bottom-up  scan each unvisited vertex's in-arcs for one in the
+               frontier, stopping at the first hit
+
+Top-down is cheap while the frontier is small. Bottom-up wins on the few
+huge middle levels of a low-diameter graph, where most unvisited vertices
+find a frontier parent at their first or second arc. The switch follows
+Beamer's heuristic: go bottom-up once a growing frontier's arcs exceed
+1/alpha of the arcs still unexplored, and back top-down once a shrinking
+frontier drops below n/beta vertices.
+
+The per-arc work runs inside C iterators (map, compress, any over
+memoryview slices, dict.fromkeys), with visited and frontier kept as
+bytearrays, so the interpreter loop only runs once per vertex, not per arc.
+
+Example:
+    graph = CSRGraph.from_edges(edges)
+    result = bfs(graph, "A")
+    result["levels"][graph.index["B"]]   # hops from A to B, -1 if unreachable
+"""
+
+from array import array
+from itertools import chain, compress
+from operator import not_
+
+ALPHA = 14
+BETA = 24
+
+
+def bfs(graph, source, direction="auto", alpha=ALPHA, beta=BETA):
+    """
+    Breadth-first search from the vertex labelled source.
+
+    Args:
+        graph: CSRGraph (directed graphs use graph.transpose() bottom-up)
+        source: Label of the start vertex
+        direction: "auto" (direction-optimizing), "top-down" or "bottom-up"
+        alpha, beta: Switch thresholds for "auto", see module docstring
+
+    Returns a dict:
+        levels: array("i") of hop counts by vertex id, -1 if unreachable
+        order: array("q") of vertex ids, level by level. Top-down levels
+            keep queue order (the same order as a deque BFS); bottom-up
+            levels list their vertices by id.
+        steps: The direction used for each level
+    """
+    n = graph.n
+    offsets, targets = graph.offsets, memoryview(graph.targets)
+    s = graph.index[source]
+
+    levels = array("i", [-1]) * n
+    levels[s] = 0
+    visited = bytearray(n)
+    visited[s] = 1
+    order = array("q", [s])
+    steps = []
+
+    frontier, previous = [s], 0
+    unexplored = len(targets)
+    unvisited = None  # built on the first bottom-up step
+    depth = 0
+    top_down = direction != "bottom-up"
+
+    while frontier:
+        depth += 1
+        frontier_arcs = sum(offsets[v + 1] - offsets[v] for v in frontier)
+        unexplored -= frontier_arcs
+        if direction == "auto":
+            growing = len(frontier) > previous
+            if top_down and growing and frontier_arcs > unexplored / alpha:
+                top_down = False
+            elif not top_down and not growing and len(frontier) < n / beta:
+                top_down = True
+        previous = len(frontier)
+
+        if top_down:
+            steps.append("top-down")
+            arcs = list(
+                chain.from_iterable(
+                    targets[offsets[v] : offsets[v + 1]] for v in frontier
+                )
+            )
+            fresh = compress(arcs, map(not_, map(visited.__getitem__, arcs)))
+            # dict.fromkeys drops repeats but keeps first-discovery order
+            frontier = list(dict.fromkeys(fresh))
+        else:
+            steps.append("bottom-up")
+            if unvisited is None:
+                reverse = graph.transpose()
+                in_offsets = reverse.offsets
+                in_targets = memoryview(reverse.targets)
+                unvisited = list(compress(range(n), map(not_, visited)))
+            in_frontier = bytearray(n)
+            for v in frontier:
+                in_frontier[v] = 1
+            found, remaining = [], []
+            for v in unvisited:
+                parents = in_targets[in_offsets[v] : in_offsets[v + 1]]
+                if any(map(in_frontier.__getitem__, parents)):
+                    found.append(v)
+                else:
+                    remaining.append(v)
+            frontier, unvisited = found, remaining
+
+        for v in frontier:
+            visited[v] = 1
+            levels[v] = depth
+        if unvisited is not None and top_down:
+            unvisited = None  # stale; rebuilt if bottom-up resumes
+        order.extend(frontier)
+
+    return {"levels": levels, "order": order, "steps": steps}
@@ -0,0 +1,1324 @@
+"""
+Test suites for the graph library modules (csr, heap, ...), for the
+extra helpers the solutions export (iter_bfs, iter_dfs), and for the
+shared workload generators.
+
+The exercise suites only test a solve function; these test the shared
+engines and helpers directly, in the same run_all format, so a bug in an
+exercise never hides a library failure or the other way round.
+
+Usage:
+    python -m graphs.checks              # Run every suite
+    python -m graphs.checks csr heap     # Run some
+    python -m graphs.checks --list       # List suites
+"""
+
+import os
+import sys
+import tempfile
+from array import array
+
+from test_utils import run_all
+
+SUITES = {}
+
+
+def suite(func):
+    """Register func() under its name; the docstring's first line is its help."""
+    SUITES[func.__name__] = func
+    return func
+
+
+def _error(func, *args, **kwargs):
+    """Call func; return "ExcName: message" if it raises, else its result."""
+    try:
+        return func(*args, **kwargs)
+    except (ValueError, KeyError, TypeError) as e:
+        return f"{type(e).__name__}: {e}"
+
+
+@suite
+def csr():
+    """CSRGraph save/load round trips, and rejection of damaged files."""
+    from graphs.csr import CSRGraph
+
+    def describe(graph):
+        labels = graph.labels
+        arcs = []
+        for v in range(graph.n):
+            for i in range(graph.offsets[v], graph.offsets[v + 1]):
+                w = None if graph.weights is None else graph.weights[i]
+                arcs.append((labels[v], labels[graph.targets[i]], w))
+        return {"directed": graph.directed, "labels": list(labels), "arcs": arcs}
+
+    cells = [(r, c) for r in range(3) for c in range(3)]
+    graphs = {
+        "ids": CSRGraph.from_ids(4, array("q", [0, 1, 2]), array("q", [1, 2, 3])),
+        "empty": CSRGraph.from_ids(0, array("q"), array("q")),
+        "strings": CSRGraph.from_edges(
+            [("A", "B", 5), ("B", "C", 1), ("A", "C", 9)], directed=True
+        ),
+        "floats": CSRGraph.from_edges([("A", "B", 0.5), ("B", "C", 2.25)]),
+        "tuples": CSRGraph.from_edges(
+            (a, b)
+            for a in cells
+            for b in cells
+            if a < b and abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+        ),
+        "objects": CSRGraph.from_edges([(object(), "B")]),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.csr")
+
+        def load_saved(graph, damage=None):
+            """Save graphs[graph], apply damage(bytes) to the file, load it."""
+
+            def run():
+                graphs[graph].save(path)
+                if damage is not None:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    with open(path, "wb") as f:
+                        f.write(damage(data))
+                return describe(CSRGraph.load(path))
+
+            return _error(run)
+
+        tests = [
+            {
+                "name": f"{name} graph survives save/load",
+                "inputs": {"graph": name},
+                "check": lambda r, name=name: r == describe(graphs[name]),
+                "fail_msg": lambda r, name=name: (
+                    f"expected {describe(graphs[name])}, got {r}"
+                ),
+            }
+            for name in ("ids", "empty", "strings", "floats", "tuples")
+        ] + [
+            {
+                "name": name,
+                "inputs": {"graph": graph, "damage": damage},
+                "check": lambda r, expected=expected: (
+                    isinstance(r, str) and r.startswith("ValueError") and expected in r
+                ),
+                "fail_msg": lambda r, expected=expected: (
+                    f"expected a ValueError mentioning {expected!r}, got {r}"
+                ),
+            }
+            for name, graph, damage, expected in [
+                ("labels that cannot round-trip", "objects", None, "labels"),
+                ("file cut inside the labels", "tuples", lambda d: d[:-5], "truncated"),
+                ("file cut inside the arrays", "ids", lambda d: d[:60], "truncated"),
+                ("file shorter than a header", "ids", lambda d: d[:10], "too short"),
+                ("bad magic", "ids", lambda d: b"XXXX" + d[4:], "bad magic"),
+                (
+                    "newer version",
+                    "ids",
+                    lambda d: d[:4] + b"\x09\x00" + d[6:],
+                    "version 9, expected 1",
+                ),
+            ]
+        ]
+
+        return run_all("csr", tests, load_saved)
+
+
+@suite
+def intern_edges():
+    """intern_edges ids, weight arrays, and mixed weighted/unweighted input."""
+    from graphs.csr import intern_edges as intern
+
+    def run(edges):
+        def describe():
+            index, labels, src, dst, weights = intern(edges)
+            arrays = [list(src), list(dst)]
+            if weights is not None:
+                arrays.append((weights.typecode, list(weights)))
+            return [index, labels, *arrays]
+
+        return _error(describe)
+
+    def case(name, edges, expected):
+        return {
+            "name": name,
+            "inputs": {"edges": edges},
+            "check": lambda r: r == expected,
+            "fail_msg": lambda r: f"expected {expected}, got {r}",
+        }
+
+    tests = [
+        case("no edges", [], [{}, [], [], []]),
+        case(
+            "ids follow first appearance",
+            [("b", "a"), ("a", "c"), ("c", "b")],
+            [{"b": 0, "a": 1, "c": 2}, ["b", "a", "c"], [0, 1, 2], [1, 2, 0]],
+        ),
+        case(
+            "int weights stay ints",
+            [("a", "b", 3), ("b", "c", -1)],
+            [{"a": 0, "b": 1, "c": 2}, ["a", "b", "c"], [0, 1], [1, 2], ("q", [3, -1])],
+        ),
+        case(
+            "a float weight turns every weight into a float",
+            [("a", "b", 3), ("b", "c", 0.5), ("c", "a", 2)],
+            [
+                {"a": 0, "b": 1, "c": 2},
+                ["a", "b", "c"],
+                [0, 1, 2],
+                [1, 2, 0],
+                ("d", [3.0, 0.5, 2.0]),
+            ],
+        ),
+        case(
+            "a weighted edge after unweighted ones",
+            [("a", "b"), ("b", "c", 5)],
+            "ValueError: edge 1 ('b', 'c', 5) has a weight, unlike edge 0",
+        ),
+        case(
+            "an unweighted edge after weighted ones",
+            [("a", "b", 1), ("b", "c", 2), ("c", "d")],
+            "ValueError: edge 2 ('c', 'd') has no weight, unlike edge 0",
+        ),
+    ]
+    return run_all("intern_edges", tests, run)
+
+
+@suite
+def heap():
+    """IndexedHeap order, decrease-key, and rejected misuse."""
+    from graphs.heap import IndexedHeap
+
+    def run_scenario(arity, ops):
+        """Construct IndexedHeap(8, arity), execute ops, return list of results."""
+        heap = IndexedHeap(8, arity)
+        results = []
+        for op in ops:
+            if op[0] == "push":
+                results.append(_error(heap.push, op[1], op[2]))
+            elif op[0] == "pop":
+                results.append(heap.pop())
+            elif op[0] == "decrease_key":
+                results.append(_error(heap.decrease_key, op[1], op[2]))
+            elif op[0] == "push_or_decrease":
+                results.append(heap.push_or_decrease(op[1], op[2]))
+            elif op[0] == "contains":
+                results.append(op[1] in heap)
+            elif op[0] == "len":
+                results.append(len(heap))
+            elif op[0] == "pos":
+                results.append(list(heap.pos))
+        return results
+
+    priorities = [5, 3, 8, 1, 9, 2]
+    pushes = [("push", key, priority) for key, priority in enumerate(priorities)]
+    pushed = [None] * len(pushes)
+    pops = [(3, 1), (5, 2), (1, 3), (0, 5), (2, 8), (4, 9)]
+
+    tests = [
+        {
+            "name": f"pops in priority order (arity {arity})",
+            "inputs": {"arity": arity, "ops": pushes + [("pop",)] * 6 + [("len",)]},
+            "check": lambda r: r == pushed + pops + [0],
+            "fail_msg": lambda r: f"expected pops {pops}, then len 0, got {r[6:]}",
+        }
+        for arity in (2, 3, 4, 8)
+    ] + [
+        {
+            "name": "decrease_key moves a key to the front",
+            "inputs": {
+                "arity": 2,
+                "ops": pushes
+                + [("decrease_key", 4, 0), ("pop",), ("pop",), ("contains", 4)],
+            },
+            "check": lambda r: r[6:] == [None, (4, 0), (3, 1), False],
+            "fail_msg": lambda r: (
+                f"expected [None, (4, 0), (3, 1), False], got {r[6:]}"
+            ),
+        },
+        {
+            "name": "push_or_decrease only lowers priorities",
+            "inputs": {
+                "arity": 4,
+                "ops": pushes
+                + [
+                    ("push_or_decrease", 0, 7),
+                    ("push_or_decrease", 0, 5),
+                    ("push_or_decrease", 2, 0),
+                    ("push_or_decrease", 7, 4),
+                    ("len",),
+                ]
+                + [("pop",)] * 5,
+            },
+            "check": lambda r: r[6:]
+            == [False, False, True, True, 7, (2, 0), (3, 1), (5, 2), (1, 3), (7, 4)],
+            "fail_msg": lambda r: (
+                "expected [False, False, True, True, 7, (2, 0), (3, 1), (5, 2), "
+                f"(1, 3), (7, 4)], got {r[6:]}"
+            ),
+        },
+        {
+            "name": "decrease_key of a key not in the heap raises KeyError",
+            "inputs": {
+                "arity": 4,
+                "ops": [("push", 1, 5), ("decrease_key", 0, 1), ("pos",), ("len",)],
+            },
+            "check": lambda r: r[1] == "KeyError: 0"
+            and r[2] == [-1, 0] + [-1] * 6
+            and r[3] == 1,
+            "fail_msg": lambda r: f"expected KeyError and an unchanged heap, got {r}",
+        },
+        {
+            "name": "decrease_key of a popped key raises KeyError",
+            "inputs": {
+                "arity": 2,
+                "ops": [("push", 0, 5), ("pop",), ("decrease_key", 0, 1)],
+            },
+            "check": lambda r: r[2] == "KeyError: 0",
+            "fail_msg": lambda r: f"expected KeyError: 0, got {r[2]}",
+        },
+        {
+            "name": "decrease_key to an equal or higher priority raises ValueError",
+            "inputs": {
+                "arity": 2,
+                "ops": pushes
+                + [("decrease_key", 1, 3), ("decrease_key", 1, 4), ("pop",)],
+            },
+            "check": lambda r: r[6].startswith("ValueError")
+            and r[7].startswith("ValueError")
+            and r[8] == (3, 1),
+            "fail_msg": lambda r: f"expected two ValueErrors, then (3, 1), got {r[6:]}",
+        },
+        {
+            "name": "push of a key already in the heap raises ValueError",
+            "inputs": {
+                "arity": 2,
+                "ops": [("push", 0, 5), ("push", 0, 1), ("len",), ("pop",)],
+            },
+            "check": lambda r: r[1].startswith("ValueError") and r[2:] == [1, (0, 5)],
+            "fail_msg": lambda r: (
+                f"expected ValueError, then len 1 and (0, 5), got {r}"
+            ),
+        },
+    ]
+
+    return run_all("heap", tests, run_scenario)
+
+
+@suite
+def graph_nodes():
+    """build_graph matches make_graph for every node class; node semantics."""
+    from generators import erdos_renyi, grid, weighted
+    from graphs.graph import GraphNode, IdentityGraphNode, SlotGraphNode
+    from graphs.test_utils import build_graph, make_graph
+
+    classes = {
+        cls.__name__: cls for cls in (GraphNode, SlotGraphNode, IdentityGraphNode)
+    }
+    edge_lists = {
+        "letters": [("A", "B"), ("B", "C"), ("A", "C"), ("C", "A"), ("D", "D")],
+        "weighted letters": [("A", "B", 2), ("B", "C", 0.5), ("A", "C", 7)],
+        "random": list(erdos_renyi(60, 0.1, seed=3)),
+        "weighted grid": list(weighted(grid(5, 6), seed=4)),
+    }
+
+    def describe(nodes):
+        """(key, class, id, val, neighbour vals and weights) per node, in order."""
+        rows = []
+        for key, node in nodes.items():
+            neighbors = [
+                (item[0].val, item[1]) if isinstance(item, tuple) else item.val
+                for item in node.neighbors
+            ]
+            node_id = getattr(node, "id", None)
+            rows.append((key, type(node).__name__, node_id, node.val, neighbors))
+        return rows
+
+    def build(builder, edges, directed, node_class):
+        builder = build_graph if builder == "build_graph" else make_graph
+        return describe(builder(edge_lists[edges], directed, classes[node_class]))
+
+    def semantics(node_class):
+        """How nodes of node_class compare, hash and store attributes."""
+        nodes = make_graph([("A", "B")], node_class=classes[node_class])
+        a, b = nodes["A"], nodes["B"]
+        return {
+            "ids": [getattr(n, "id", None) for n in nodes.values()],
+            "equals val": a == "A",
+            "equals GraphNode": a == GraphNode("A"),
+            "val in set": "A" in {a, b},
+            "has __dict__": hasattr(a, "__dict__"),
+        }
+
+    tests = [
+        {
+            "name": f"build_graph == make_graph: {edges}, "
+            f"{'directed' if directed else 'undirected'}, {node_class}",
+            "inputs": {"edges": edges, "directed": directed, "node_class": node_class},
+            "check": lambda r, args=(edges, directed, node_class): (
+                r == build("make_graph", *args)
+            ),
+            "fail_msg": lambda r, args=(edges, directed, node_class): (
+                f"expected {build('make_graph', *args)[:3]}..., got {r[:3]}..."
+            ),
+        }
+        for edges in edge_lists
+        for directed in (False, True)
+        for node_class in classes
+    ]
+    tests = [
+        {**test, "inputs": {"builder": "build_graph", **test["inputs"]}}
+        for test in tests
+    ]
+    by_val = {"equals val": True, "equals GraphNode": True, "val in set": True}
+    by_identity = {"equals val": False, "equals GraphNode": False, "val in set": False}
+    expected_semantics = {
+        "GraphNode": {"ids": [None, None], **by_val, "has __dict__": True},
+        "SlotGraphNode": {"ids": [0, 1], **by_val, "has __dict__": False},
+        "IdentityGraphNode": {"ids": [0, 1], **by_identity, "has __dict__": False},
+    }
+    tests += [
+        {
+            "name": f"{node_class} ids, equality, hashing and slots",
+            "inputs": {"node_class": node_class},
+            "check": lambda r, e=expected: r == e,
+            "fail_msg": lambda r, e=expected: f"expected {e}, got {r}",
+        }
+        for node_class, expected in expected_semantics.items()
+    ]
+
+    def run(builder=None, **inputs):
+        return semantics(**inputs) if builder is None else build(builder, **inputs)
+
+    return run_all("graph_nodes", tests, run)
+
+
+def _bfs_levels(graph, s):
+    """Hop counts from vertex id s and visit order, by a plain deque BFS."""
+    from collections import deque
+
+    levels = [-1] * graph.n
+    levels[s] = 0
+    order, queue = [s], deque([s])
+    while queue:
+        v = queue.popleft()
+        for u in graph.neighbors(v):
+            if levels[u] < 0:
+                levels[u] = levels[v] + 1
+                order.append(u)
+                queue.append(u)
+    return levels, order
+
+
+@suite
+def bfs():
+    """Direction-optimizing bfs: every direction matches a deque BFS."""
+    from generators import erdos_renyi, grid, path, power_law, random_dag
+    from graphs.bfs import bfs as run_bfs
+    from graphs.csr import CSRGraph
+
+    graphs = {
+        "power law": CSRGraph.from_edges(list(power_law(3000, seed=1))),
+        "sparse random": CSRGraph.from_edges(list(erdos_renyi(400, 0.004, seed=2))),
+        "directed random": CSRGraph.from_edges(
+            list(erdos_renyi(2000, 0.004, seed=3, directed=True)), directed=True
+        ),
+        "directed dag": CSRGraph.from_edges(
+            list(random_dag(500, 2000, seed=4)), directed=True
+        ),
+        "grid": CSRGraph.from_edges(list(grid(30, 40))),
+        "path": CSRGraph.from_edges(list(path(200))),
+        "two pieces": CSRGraph.from_edges([("A", "B"), ("B", "C"), ("D", "E")]),
+        "single arc": CSRGraph.from_edges([("A", "B")], directed=True),
+    }
+
+    def run(graph, direction="auto", alpha=14, beta=24, source=0):
+        g = graphs[graph]
+        result = run_bfs(g, g.labels[source], direction, alpha, beta)
+        return {
+            "levels": list(result["levels"]),
+            "order": list(result["order"]),
+            "steps": result["steps"],
+        }
+
+    def expected(graph, source=0):
+        return _bfs_levels(graphs[graph], source)
+
+    tests = []
+    for graph in graphs:
+        levels, order = expected(graph)
+        for direction in ("top-down", "bottom-up", "auto"):
+            tests.append(
+                {
+                    "name": f"{graph}, {direction}: levels match a deque BFS",
+                    "inputs": {"graph": graph, "direction": direction},
+                    "check": lambda r, e=levels: r["levels"] == e,
+                    "fail_msg": lambda r, e=levels: "levels differ at ids "
+                    f"{[v for v, d in enumerate(e) if r['levels'][v] != d][:10]}",
+                }
+            )
+        tests.append(
+            {
+                "name": f"{graph}, top-down: order is deque BFS order",
+                "inputs": {"graph": graph, "direction": "top-down"},
+                "check": lambda r, e=order: r["order"] == e,
+                "fail_msg": lambda r, e=order: f"expected {e[:10]}..., "
+                f"got {r['order'][:10]}...",
+            }
+        )
+    tests += [
+        {
+            "name": "single arc, bottom-up from the sink: only the source is reached",
+            "inputs": {"graph": "single arc", "direction": "bottom-up", "source": 1},
+            "check": lambda r: r["levels"] == [-1, 0] and r["order"] == [1],
+            "fail_msg": lambda r: f"got {r}",
+        },
+        {
+            "name": "power law, default thresholds: switches both ways",
+            "inputs": {"graph": "power law"},
+            "check": lambda r: r["steps"][0] == "top-down"
+            and "bottom-up" in r["steps"]
+            and r["steps"][-1] == "top-down",
+            "fail_msg": lambda r: f"got steps {r['steps']}",
+        },
+        {
+            "name": "grid, huge alpha and beta: bottom-up from the first level on",
+            "inputs": {"graph": "grid", "alpha": 1e9, "beta": 1e9},
+            "check": lambda r: set(r["steps"]) == {"bottom-up"}
+            and r["levels"] == expected("grid")[0],
+            "fail_msg": lambda r: f"got steps {r['steps']}",
+        },
+        {
+            "name": "grid, huge alpha, beta 1: back top-down once the frontier shrinks",
+            "inputs": {"graph": "grid", "alpha": 1e9, "beta": 1},
+            "check": lambda r: r["steps"][0] == "bottom-up"
+            and r["steps"][-1] == "top-down"
+            and r["levels"] == expected("grid")[0],
+            "fail_msg": lambda r: f"got steps {r['steps']}",
+        },
+        {
+            "name": "power law, tiny alpha: never leaves top-down",
+            "inputs": {"graph": "power law", "alpha": 1e-9},
+            "check": lambda r: set(r["steps"]) == {"top-down"},
+            "fail_msg": lambda r: f"got steps {r['steps']}",
+        },
+    ]
+    return run_all("bfs", tests, run)
+
+
+@suite
+def multi_bfs():
+    """multi_source_bfs and bitset_levels match one deque BFS per source."""
+    from generators import erdos_renyi, power_law
+    from graphs.csr import CSRGraph
+    from graphs.multi_bfs import bitset_levels, multi_source_bfs
+
+    # Three pieces per graph: a random part, a path 100-101-102, a lone arc
+    extra = [(100, 101), (101, 102), (200, 201)]
+    graphs = {
+        "undirected": CSRGraph.from_edges(list(power_law(80, seed=5)) + extra),
+        "directed": CSRGraph.from_edges(
+            list(erdos_renyi(80, 0.03, seed=6, directed=True)) + extra, directed=True
+        ),
+    }
+    sources = [0, 7, 100, 102, 201, 55, 13, 200, 64, 1]
+
+    def run(graph, sources, workers=1, bit_parallel=False, width=64, bitset=False):
+        g = graphs[graph]
+        if bitset:
+            ids = [g.index[s] for s in sources]
+            return [list(levels) for levels in bitset_levels(g, ids)]
+        levels = multi_source_bfs(g, sources, workers, bit_parallel, width)
+        return [list(levels[s]) for s in sources]
+
+    def expected(graph, sources):
+        g = graphs[graph]
+        return [_bfs_levels(g, g.index[s])[0] for s in sources]
+
+    def case(name, graph, sources, **options):
+        want = expected(graph, sources)
+        return {
+            "name": f"{graph}: {name}",
+            "inputs": {"graph": graph, "sources": sources, **options},
+            "check": lambda r: r == want,
+            "fail_msg": lambda r: "wrong levels for sources "
+            f"{[s for s, a, b in zip(sources, r, want) if a != b]}",
+        }
+
+    tests = []
+    for graph in graphs:
+        tests += [
+            case("one worker", graph, sources),
+            case("two workers, shared memory", graph, sources, workers=2),
+            case("three workers, uneven chunks", graph, sources, workers=3),
+            case("bit-parallel", graph, sources, bit_parallel=True),
+            case("bit-parallel, width 3", graph, sources, bit_parallel=True, width=3),
+            case(
+                "two workers, bit-parallel, width 2",
+                graph,
+                sources,
+                workers=2,
+                bit_parallel=True,
+                width=2,
+            ),
+            case("bitset_levels", graph, sources, bitset=True),
+            case("bitset_levels, repeated source", graph, [7, 100, 7], bitset=True),
+            case("more workers than sources", graph, [102, 0], workers=4),
+            case("no sources", graph, [], workers=2),
+        ]
+    return run_all("multi_bfs", tests, run)
+
+
+class _TreeNode:
+    """Node of an infinite binary tree, whose children exist once asked for."""
+
+    def __init__(self, val):
+        self.val = val
+
+    @property
+    def neighbors(self):
+        return [_TreeNode(self.val + "0"), _TreeNode(self.val + "1")]
+
+    def __eq__(self, other):
+        return self.val == other.val
+
+    def __hash__(self):
+        return hash(self.val)
+
+
+@suite
+def traversals():
+    """iter_bfs and iter_dfs from the solutions: order, depths, events, laziness."""
+    import importlib
+    from itertools import islice
+
+    from generators import erdos_renyi, grid
+    from graphs.test_utils import make_graph
+
+    bfs = importlib.import_module("graphs.01_breadth_first_search.solution")
+    dfs = importlib.import_module("graphs.02_depth_first_search.solution")
+
+    graphs = {
+        "tree": make_graph(
+            [("A", "B"), ("A", "C"), ("B", "D"), ("B", "E"), ("C", "F")]
+        ),
+        "cycle": make_graph([("A", "B"), ("B", "C"), ("C", "D"), ("D", "A")]),
+        "directed": make_graph(
+            [("A", "B"), ("B", "C"), ("C", "A"), ("A", "D"), ("D", "C")], True
+        ),
+        "random": make_graph(erdos_renyi(60, 0.08, seed=7)),
+        "grid": make_graph(grid(6, 7)),
+    }
+    starts = {name: next(iter(nodes.values())) for name, nodes in graphs.items()}
+    starts["infinite"] = _TreeNode("")
+
+    def run(func, graph, limit=None, **options):
+        """(val, ...) tuples of func's first `limit` items from the graph's start."""
+        start = None if graph is None else starts[graph]
+        module = bfs if func == "iter_bfs" else dfs
+        items = islice(getattr(module, func)(start, **options), limit)
+        return [
+            tuple(x.val if hasattr(x, "val") else x for x in item) for item in items
+        ]
+
+    def bfs_depths(start, max_depth=None):
+        """[(val, depth)] in solve's order, cut at max_depth."""
+        depth, frontier, seen, out = 0, [start], {start}, []
+        while frontier:
+            out += [(node.val, depth) for node in frontier]
+            if depth == max_depth:
+                break
+            nxt = []
+            for node in frontier:
+                for neighbor in node.neighbors:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        nxt.append(neighbor)
+            frontier, depth = nxt, depth + 1
+        return out
+
+    def dfs_events(node, depth=0, max_depth=None, seen=None):
+        """[("pre"|"post", val, depth)] of a recursive preorder DFS."""
+        seen = {node} if seen is None else seen
+        out = [("pre", node.val, depth)]
+        if max_depth is None or depth < max_depth:
+            for neighbor in node.neighbors:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    out += dfs_events(neighbor, depth + 1, max_depth, seen)
+        return out + [("post", node.val, depth)]
+
+    def case(name, expected, **inputs):
+        return {
+            "name": name,
+            "inputs": inputs,
+            "check": lambda r: r == expected,
+            "fail_msg": lambda r: f"expected {expected[:12]}, got {r[:12]}",
+        }
+
+    tests = [
+        case("iter_bfs of None yields nothing", [], func="iter_bfs", graph=None),
+        case("iter_dfs of None yields nothing", [], func="iter_dfs", graph=None),
+    ]
+    for graph in graphs:
+        start = starts[graph]
+        depth_of = dict(bfs_depths(start))
+        solve_order = [(node.val, depth_of[node.val]) for node in bfs.solve(start)]
+        events = dfs_events(start)
+        tests += [
+            case(
+                f"{graph}: iter_bfs follows solve's order with BFS depths",
+                solve_order,
+                func="iter_bfs",
+                graph=graph,
+            ),
+            case(
+                f"{graph}: iter_bfs max_depth=1",
+                bfs_depths(start, 1),
+                func="iter_bfs",
+                graph=graph,
+                max_depth=1,
+            ),
+            case(
+                f"{graph}: iter_dfs is a recursive preorder",
+                [(val, depth) for kind, val, depth in events if kind == "pre"],
+                func="iter_dfs",
+                graph=graph,
+            ),
+            case(
+                f"{graph}: iter_dfs events nest pre and post",
+                events,
+                func="iter_dfs",
+                graph=graph,
+                events=True,
+            ),
+            case(
+                f"{graph}: iter_dfs max_depth=2 with events",
+                dfs_events(start, max_depth=2),
+                func="iter_dfs",
+                graph=graph,
+                events=True,
+                max_depth=2,
+            ),
+        ]
+    tests += [
+        case(
+            "iter_bfs max_depth=0 yields only the start",
+            [("A", 0)],
+            func="iter_bfs",
+            graph="tree",
+            max_depth=0,
+        ),
+        case(
+            "iter_dfs max_depth=0 yields only the start",
+            [("pre", "A", 0), ("post", "A", 0)],
+            func="iter_dfs",
+            graph="tree",
+            max_depth=0,
+            events=True,
+        ),
+        case(
+            "iter_bfs stops early on an infinite tree",
+            [("", 0), ("0", 1), ("1", 1), ("00", 2), ("01", 2), ("10", 2)],
+            func="iter_bfs",
+            graph="infinite",
+            limit=6,
+        ),
+        case(
+            "iter_dfs stops early on an infinite tree",
+            [("", 0), ("0", 1), ("00", 2), ("000", 3), ("0000", 4)],
+            func="iter_dfs",
+            graph="infinite",
+            limit=5,
+        ),
+        case(
+            "iter_dfs max_depth bounds an infinite tree",
+            [(val, len(val)) for val in ["", "0", "00", "01", "1", "10", "11"]],
+            func="iter_dfs",
+            graph="infinite",
+            max_depth=2,
+        ),
+    ]
+    return run_all("traversals", tests, run)
+
+
+@suite
+def dag():
+    """layers, run_dag, and the array topological sorts against Kahn's order."""
+    import importlib
+    import threading
+    import time
+
+    from generators import random_dag
+    from graphs.csr import CSRGraph
+    from graphs.dag import (
+        array_topological_sort,
+        csr_topological_sort,
+        layers,
+        run_dag,
+    )
+
+    kahn = importlib.import_module("graphs.03_topological_sort.solution").solve
+
+    nodes = ["a", "b", "c", "d", "e", "f"]
+    edges = [("a", "c"), ("b", "c"), ("c", "d"), ("a", "e"), ("e", "d"), ("d", "f")]
+    cycle = edges + [("f", "c")]
+    # b -> c -> d -> f is the slowest chain
+    seconds = {"a": 0.005, "b": 0.05, "c": 0.01, "d": 0.01, "e": 0.005, "f": 0.01}
+
+    def run(op, edges, nodes=nodes, pool="thread"):
+        if op == "layers":
+            return layers(nodes, edges)
+        if op == "array_topological_sort":
+            return array_topological_sort(nodes, edges)
+        if op == "csr_topological_sort":
+            src, dst = array("q"), array("q")
+            for u, v in edges:
+                src.append(u)
+                dst.append(v)
+            graph = CSRGraph.from_ids(len(nodes), src, dst, directed=True)
+            return list(csr_topological_sort(graph))
+        spans, lock = {}, threading.Lock()
+
+        def task(node):
+            start = time.perf_counter()
+            time.sleep(seconds[node])
+            with lock:
+                spans[node] = (start, time.perf_counter())
+            return node.upper()
+
+        task = task if pool == "thread" else str.upper
+        try:
+            report = run_dag(nodes, edges, task, workers=4, pool=pool)
+        except ValueError as e:
+            return {"error": f"ValueError: {e}", "ran": sorted(spans)}
+        return {**report, "spans": spans}
+
+    def dependency_order(r):
+        """Edges (u, v) where v did not start after u finished."""
+        spans = r["spans"]
+        if spans:
+            return [(u, v) for u, v in edges if not spans[u][1] <= spans[v][0]]
+        # str.upper records no spans: fall back on the completion order
+        position = {node: i for i, node in enumerate(r["order"])}
+        return [(u, v) for u, v in edges if not position[u] < position[v]]
+
+    tests = [
+        {
+            "name": "layers of a known DAG",
+            "inputs": {"op": "layers", "edges": edges},
+            "check": lambda r: r == [["a", "b"], ["e", "c"], ["d"], ["f"]],
+            "fail_msg": lambda r: (
+                f"expected [['a', 'b'], ['e', 'c'], ['d'], ['f']], got {r}"
+            ),
+        },
+        {
+            "name": "layers leave out nodes on or behind a cycle",
+            "inputs": {"op": "layers", "edges": cycle},
+            "check": lambda r: r == [["a", "b"], ["e"]],
+            "fail_msg": lambda r: f"expected [['a', 'b'], ['e']], got {r}",
+        },
+        {
+            "name": "layers of no nodes",
+            "inputs": {"op": "layers", "edges": [], "nodes": []},
+            "check": lambda r: r == [],
+            "fail_msg": lambda r: f"expected [], got {r}",
+        },
+        {
+            "name": "run_dag raises ValueError on a cycle before running a task",
+            "inputs": {"op": "run", "edges": cycle},
+            "check": lambda r: r
+            == {"error": "ValueError: run_dag: the edges contain a cycle", "ran": []},
+            "fail_msg": lambda r: f"expected a ValueError and no task run, got {r}",
+        },
+        {
+            "name": "run_dag starts every task after its predecessors finish",
+            "inputs": {"op": "run", "edges": edges},
+            "check": lambda r: not dependency_order(r)
+            and r["results"] == {node: node.upper() for node in nodes}
+            and sorted(r["order"]) == nodes,
+            "fail_msg": lambda r: f"out of order edges {dependency_order(r)}, "
+            f"completion order {r['order']}, results {r['results']}",
+        },
+        {
+            "name": "run_dag finds the critical path",
+            "inputs": {"op": "run", "edges": edges},
+            "check": lambda r: r["critical_nodes"] == ["b", "c", "d", "f"]
+            and 0.08 <= r["critical_path"] <= r["wall"]
+            and r["critical_path"] <= r["busy"],
+            "fail_msg": lambda r: f"expected chain b, c, d, f of at least 0.08s, "
+            f"got {r['critical_nodes']} of {r['critical_path']:.3f}s",
+        },
+        {
+            "name": "run_dag on a process pool keeps dependency order",
+            "inputs": {"op": "run", "edges": edges, "pool": "process"},
+            "check": lambda r: not dependency_order(r)
+            and r["results"] == {node: node.upper() for node in nodes},
+            "fail_msg": lambda r: f"out of order edges {dependency_order(r)}, "
+            f"completion order {r['order']}, results {r['results']}",
+        },
+    ]
+
+    # Ids 0..n-1; array_topological_sort also gets them in a shuffled order
+    random_dags = {
+        f"random_dag({n}, {m}, seed={seed})": (n, list(random_dag(n, m, seed)))
+        for n, m, seed in [(50, 100, 1), (300, 1200, 2), (1000, 1500, 3), (40, 0, 4)]
+    }
+    for name, (n, dag_edges) in random_dags.items():
+        ids = list(range(n))
+        shuffled = ids[1::2][::-1] + ids[::2]
+        cases = [
+            ("csr_topological_sort", ids, dag_edges, ""),
+            ("array_topological_sort", ids, dag_edges, ""),
+            ("array_topological_sort", shuffled, dag_edges, ", shuffled nodes"),
+        ]
+        if dag_edges:
+            # Reversing a copy of the last edge closes a 2-cycle
+            u, v = dag_edges[-1]
+            cases += [
+                (op, labels, dag_edges + [(v, u)], ", plus a 2-cycle")
+                for op, labels, _, _ in cases[::2]
+            ]
+        for op, labels, arcs, note in cases:
+            expected = kahn(labels, arcs)
+            tests.append(
+                {
+                    "name": f"{op} matches Kahn's order on {name}{note}",
+                    "inputs": {"op": op, "edges": arcs, "nodes": labels},
+                    "check": lambda r, e=expected: r == e,
+                    "fail_msg": lambda r, e=expected: f"expected {len(e)} nodes "
+                    f"starting {e[:8]}, got {len(r)} starting {r[:8]}",
+                }
+            )
+    return run_all("dag", tests, run)
+
+
+@suite
+def read_edges():
+    """read_edges parsing: delimiters, header, vertex mapping, bad lines."""
+    from itertools import islice
+
+    from graphs.test_utils import read_edges as read
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        def run(text, file=None, limit=None, **options):
+            """read_edges over text, as lines or saved under file in tmp."""
+            source = text.splitlines(keepends=True)
+            if file is not None:
+                source = os.path.join(tmp, file)
+                with open(source, "w") as f:
+                    f.write(text)
+            return _error(lambda: list(islice(read(source, **options), limit)))
+
+        def case(name, text, expected, **options):
+            return {
+                "name": name,
+                "inputs": {"text": text, **options},
+                "check": lambda r: r == expected,
+                "fail_msg": lambda r: f"expected {expected}, got {r}",
+            }
+
+        path = os.path.join(tmp, "bad.txt")
+        tests = [
+            case(
+                "whitespace columns, int and float weights",
+                "A B\nB  C\t5\nC D 2.5\n",
+                [("A", "B"), ("B", "C", 5), ("C", "D", 2.5)],
+            ),
+            case(
+                "blank lines and comments are skipped",
+                "# edges\n\nA B\n   \n# more\nB C\n",
+                [("A", "B"), ("B", "C")],
+            ),
+            case(
+                "explicit delimiter with a quoted field",
+                'A;"B C";3\n"D;E";F\n',
+                [("A", "B C", 3), ("D;E", "F")],
+                delimiter=";",
+            ),
+            case(
+                ".csv path defaults to commas; empty weight means unweighted",
+                "1, 2, 7\n2,3,\n",
+                [("1", "2", 7), ("2", "3")],
+                file="edges.csv",
+            ),
+            case(
+                "header=True skips the first line",
+                "src dst weight\nA B 1\n",
+                [("A", "B", 1)],
+                header=True,
+            ),
+            case(
+                "vertex maps both endpoints",
+                "1 2\n2 10 4\n",
+                [(1, 2), (2, 10, 4)],
+                vertex=int,
+            ),
+            case(
+                "a single column names its line",
+                "# edges\n\nA B\nX\n",
+                "ValueError: <edges>:4: expected 2 or 3 columns, got ['X']",
+            ),
+            case(
+                "a weight that is not a number names its line",
+                "A B 1\nB C heavy\n",
+                "ValueError: <edges>:2: weight 'heavy' is not a number",
+            ),
+            case(
+                "a bad line in a file names the file",
+                "A B 1\nB C 1,5\n",
+                f"ValueError: {path}:2: weight '1,5' is not a number",
+                file="bad.txt",
+            ),
+            case(
+                "line numbers count the skipped header",
+                "a,b,w\nA,B,x\n",
+                "ValueError: <edges>:2: weight 'x' is not a number",
+                header=True,
+                delimiter=",",
+            ),
+            case(
+                "an endpoint vertex rejects names its line",
+                "1 2\n3 four\n",
+                "ValueError: <edges>:2: invalid literal for int() with base 10: 'four'",
+                vertex=int,
+            ),
+            case(
+                "lines are parsed lazily, up to the one asked for",
+                "A B\nB C\nbroken\n",
+                [("A", "B"), ("B", "C")],
+                limit=2,
+            ),
+        ]
+        return run_all("read_edges", tests, run)
+
+
+@suite
+def generators():
+    """Workload generators: documented shapes, edge counts, and seeding."""
+    import generators as gen
+    from graphs.csr import CSRGraph
+    from graphs.dag import csr_topological_sort
+
+    def run(name, args=(), kwargs=None):
+        return list(getattr(gen, name)(*args, **(kwargs or {})))
+
+    def simple(edges, n, directed=False):
+        """Problems that keep edges from being a simple graph over 0..n-1."""
+        pairs = [(u, v) if directed or u > v else (v, u) for u, v in edges]
+        problems = [f"self-loop {e}" for e in edges if e[0] == e[1]]
+        outside = [e for e in edges if not (0 <= e[0] < n and 0 <= e[1] < n)]
+        problems += [f"vertex out of range in {e}" for e in outside]
+        if len(set(pairs)) != len(pairs):
+            problems.append(f"{len(pairs) - len(set(pairs))} duplicate edges")
+        return problems
+
+    def acyclic(edges, n):
+        src = array("q", [u for u, _ in edges])
+        dst = array("q", [v for _, v in edges])
+        graph = CSRGraph.from_ids(n, src, dst, directed=True)
+        return len(csr_topological_sort(graph)) == n
+
+    def case(name, args, check, fail_msg, **kwargs):
+        inputs = {"name": name, "args": args, "kwargs": kwargs}
+        options = (f"{k}={v!r}" for k, v in kwargs.items())
+        call = ", ".join([*map(repr, args), *options])
+        return {
+            "name": f"{name}({call})",
+            "inputs": inputs,
+            "check": check,
+            "fail_msg": fail_msg,
+        }
+
+    def count(expected):
+        return {
+            "check": lambda r: len(r) == expected,
+            "fail_msg": lambda r: f"expected {expected} items, got {len(r)}",
+        }
+
+    tests = []
+    for n, p, seed, directed in [
+        (300, 0.05, 1, False),
+        (300, 0.05, 2, True),
+        (2000, 0.002, 3, False),
+        (50, 0.9, 4, True),
+    ]:
+        pairs = n * (n - 1) // (1 if directed else 2)
+        # The edge count is Binomial(pairs, p): allow five standard deviations
+        slack = 5 * (pairs * p * (1 - p)) ** 0.5
+        bounds = (pairs * p - slack, pairs * p + slack)
+        tests.append(
+            case(
+                "erdos_renyi",
+                (n, p, seed),
+                lambda r, n=n, d=directed, bounds=bounds: not simple(r, n, d)
+                and bounds[0] <= len(r) <= bounds[1],
+                lambda r, n=n, d=directed: f"{len(r)} edges, "
+                f"problems {simple(r, n, d)[:5]}",
+                directed=directed,
+            )
+        )
+    tests += [
+        case("erdos_renyi", (40, 1), **count(40 * 39 // 2)),
+        case("erdos_renyi", (40, 1), **count(40 * 39), directed=True),
+        case("erdos_renyi", (40, 0), **count(0)),
+        case("erdos_renyi", (1, 0.5), **count(0)),
+        case(
+            "power_law",
+            (500, 3, 5),
+            lambda r: not simple(r, 500) and len(r) == (500 - 3) * 3,
+            lambda r: f"{len(r)} edges, expected {497 * 3}, "
+            f"problems {simple(r, 500)[:5]}",
+        ),
+    ]
+    for n, m, seed in [(100, 400, 1), (1000, 5000, 2), (50, 2000, 3)]:
+        tests.append(
+            case(
+                "random_dag",
+                (n, m, seed),
+                lambda r, n=n, m=m: acyclic(r, n)
+                and len(r) <= m
+                and not [e for e in r if e[0] == e[1]],
+                lambda r, n=n: f"acyclic: {acyclic(r, n)}, {len(r)} edges",
+            )
+        )
+    tests += [
+        case("grid", (4, 6), **count(4 * 5 + 3 * 6)),
+        case("grid", (1, 7), **count(6)),
+        case("grid", (1, 1), **count(0)),
+        case(
+            "grid",
+            (3, 3),
+            lambda r: not simple(r, 9)
+            and all(abs(u - v) in (1, 3) for u, v in r)
+            and (2, 3) not in r,
+            lambda r: f"expected the 12 lattice edges of a 3x3 grid, got {r}",
+        ),
+        case("path", (10,), **count(9)),
+        case("path", (1,), **count(0)),
+        case("path", (0,), **count(0)),
+        case(
+            "path",
+            (4,),
+            lambda r: r == [(0, 1), (1, 2), (2, 3)],
+            lambda r: f"expected [(0, 1), (1, 2), (2, 3)], got {r}",
+        ),
+        case(
+            "weighted",
+            ([(0, 1), (1, 2), (2, 0)],),
+            lambda r: [e[:2] for e in r] == [(0, 1), (1, 2), (2, 0)]
+            and all(5 <= e[2] <= 7 for e in r),
+            lambda r: f"expected the same edges with weights in [5, 7], got {r}",
+            lo=5,
+            hi=7,
+        ),
+    ]
+
+    def nearly_sorted_shape(r, n):
+        """Problems that keep r from being 0..n-1 with adjacent swaps only."""
+        if sorted(r) != list(range(n)):
+            return ["not a permutation of 0..n-1"]
+        return [f"{v} at index {i}" for i, v in enumerate(r) if abs(v - i) > 1]
+
+    tests += [
+        case(
+            "nearly_sorted",
+            (1000,),
+            lambda r: not nearly_sorted_shape(r, 1000) and r != sorted(r),
+            lambda r: f"problems {nearly_sorted_shape(r, 1000)[:5]}",
+            seed=1,
+        ),
+        case(
+            "nearly_sorted",
+            (7,),
+            lambda r: r == [1, 0, 3, 2, 5, 4, 6],
+            lambda r: f"expected [1, 0, 3, 2, 5, 4, 6], got {r}",
+            swap_prob=1,
+        ),
+        case(
+            "nearly_sorted",
+            (50,),
+            lambda r: r == list(range(50)),
+            lambda r: f"expected 0..49 in order, got {r}",
+            swap_prob=0,
+        ),
+        case(
+            "few_unique",
+            (1000,),
+            lambda r: len(r) == 1000 and set(r) == {0, 1, 2, 3},
+            lambda r: f"expected 1000 values covering 0..3, got {sorted(set(r))}",
+        ),
+        case(
+            "few_unique",
+            (500, 2),
+            lambda r: len(r) == 500 and set(r) == {0, 1},
+            lambda r: f"expected 500 values covering 0..1, got {sorted(set(r))}",
+            seed=9,
+        ),
+        case(
+            "organ_pipe",
+            (7,),
+            lambda r: r == [0, 1, 2, 3, 2, 1, 0],
+            lambda r: f"expected [0, 1, 2, 3, 2, 1, 0], got {r}",
+        ),
+        case(
+            "organ_pipe",
+            (6,),
+            lambda r: r == [0, 1, 2, 2, 1, 0],
+            lambda r: f"expected [0, 1, 2, 2, 1, 0], got {r}",
+        ),
+    ]
+
+    seeded = [
+        ("random_ints", (200,)),
+        ("uniform_floats", (200,)),
+        ("few_unique", (200, 5)),
+        ("nearly_sorted", (200, 0.3)),
+        ("erdos_renyi", (100, 0.05)),
+        ("power_law", (100, 2)),
+        ("random_dag", (100, 300)),
+        ("weighted", (list(gen.grid(5, 5)),)),
+    ]
+    for name, args in seeded:
+        first = run(name, args, {"seed": 11})
+        other = run(name, args, {"seed": 12})
+        tests.append(
+            case(
+                name,
+                args,
+                lambda r, first=first, other=other: r == first and r != other,
+                lambda r, first=first: "seed 11 gave a different workload on "
+                f"the second call ({r[:4]}... vs {first[:4]}...), or seed 12 the same",
+                seed=11,
+            )
+        )
+    return run_all("generators", tests, run)
+
+
+def _components(n, pairs):
+    """Oracle: component label of each of 0..n-1 by flood fill over pairs."""
+    adj = [[] for _ in range(n)]
+    for u, v in pairs:
+        adj[u].append(v)
+        adj[v].append(u)
+    label = [-1] * n
+    for s in range(n):
+        if label[s] < 0:
+            label[s], stack = s, [s]
+            while stack:
+                for w in adj[stack.pop()]:
+                    if label[w] < 0:
+                        label[w] = s
+                        stack.append(w)
+    return label
+
+
+@suite
+def concurrent_union_find():
+    """ConcurrentUnionFind fed from 8 threads vs a sequential flood fill."""
+    import random
+    import threading
+
+    from graphs.concurrent_union_find import ConcurrentUnionFind
+
+    n, count, threads = 1000, 800, 8
+
+    def run_once(optimistic, stripes, seed):
+        rng = random.Random(seed)
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(count)]
+        queries = [(rng.randrange(n), rng.randrange(n)) for _ in range(count)]
+        label = _components(n, pairs)
+
+        uf = ConcurrentUnionFind(n, stripes=stripes, optimistic=optimistic)
+        start = threading.Barrier(threads)
+        merges = []
+
+        def feed(batch):
+            start.wait()  # all threads race from the first union
+            merges.append(uf.union_many(batch))
+
+        workers = [
+            threading.Thread(target=feed, args=(pairs[i::threads],))
+            for i in range(threads)
+        ]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch threads as often as possible
+        try:
+            for t in workers:
+                t.start()
+            for t in workers:
+                t.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        # One root per oracle component, and a different one for each
+        roots = {}
+        for v in range(n):
+            roots.setdefault(label[v], set()).add(uf.find(v))
+        expected = len(roots)
+        problems = []
+        if uf.total_components != expected:
+            problems.append(f"total_components {uf.total_components} != {expected}")
+        if sum(merges) != n - expected:
+            problems.append(f"{sum(merges)} merges reported, {n - expected} made")
+        wrong = sum(
+            uf.connected(u, v) != (label[u] == label[v]) for u, v in pairs + queries
+        )
+        if wrong:
+            problems.append(f"{wrong} connected() answers differ")
+        split = sum(len(r) != 1 for r in roots.values())
+        if split:
+            problems.append(f"{split} components have several roots")
+        if len(set().union(*roots.values())) != expected:
+            problems.append("a root is shared by several components")
+        return problems
+
+    def run_threaded(optimistic, stripes, rounds=10):
+        """
+        Race random unions from 8 threads, rounds times with fresh seeds.
+        Returns "ok", or what the first failing round got wrong.
+        """
+        for seed in range(rounds):
+            problems = run_once(optimistic, stripes, seed)
+            if problems:
+                return f"seed {seed}: {'; '.join(problems)}"
+        return "ok"
+
+    tests = [
+        {
+            "name": f"{mode} mode, {stripes} stripes, matches a sequential oracle",
+            "inputs": {"optimistic": mode == "CAS-style", "stripes": stripes},
+            "check": lambda r: r == "ok",
+            "fail_msg": lambda r: r,
+        }
+        for mode in ("locking", "CAS-style")
+        for stripes in (1, 4, 64)
+    ]
+
+    return run_all("concurrent_union_find", tests, run_threaded)
+
+
+def main():
+    args = sys.argv[1:]
+    if args == ["--list"] or any(a not in SUITES for a in args):
+        print("Suites:")
+        width = max(map(len, SUITES))
+        for name, func in SUITES.items():
+            print(f"  {name:<{width}} {func.__doc__.splitlines()[0]}")
+        print("\nUsage: python -m graphs.checks [name ...]")
+        sys.exit(0 if args == ["--list"] else 1)
+
+    names = args or list(SUITES)
+    failed = []
+    for name in names:
+        summary = SUITES[name]()
+        if summary["passed"] != summary["total"]:
+            failed.append(name)
+        print()
+    print(f"{len(names) - len(failed)}/{len(names)} suites passed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Union-find that several threads can update at once.
+
+Wrapping UnionFind in one lock serializes every call. Here find() takes
+no lock at all, and union() only locks the stripes of the two roots it
+links (root % stripes), so unions in unrelated parts of the forest never
+wait for each other.
+
+find() uses path halving. A halving write only ever points a node at one
+of its ancestors, and ancestors never change once linked, so racing
+halvings can lose some compression but never a link. union() finds both
+roots, locks their stripes in a fixed order (no deadlock), and checks
+that both are still roots. If another thread linked one of them in the
+meantime, it unlocks and retries from the new roots.
+
+With optimistic=True, union() instead links with a compare-and-swap on
+the child root's parent slot, retrying on failure (Anderson & Woll).
+Roots are linked by id, lower under higher, which keeps the forest
+acyclic without sizes. Python has no CAS instruction, so the swap holds
+one stripe lock for a single compare and store. That is one short lock
+per link rather than two held across the size update, which pays off
+once threads truly run in parallel. It is the default on free-threaded
+builds (python3.13t and later); with the GIL the locking mode is used.
+
+The component count is kept as a merge count per stripe, bumped under
+the lock that made the link, and total_components sums them. It never
+double counts a merge, and once the writers are joined it is exact.
+
+Example:
+    uf = ConcurrentUnionFind(n)
+    with ThreadPoolExecutor(8) as pool:
+        pool.map(uf.union_many, batches_of_pairs)
+    uf.total_components
+"""
+
+import sys
+import threading
+
+STRIPES = 64
+
+
+def free_threaded():
+    """True if this interpreter runs Python threads in parallel (no GIL)."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+class ConcurrentUnionFind:
+    """
+    Thread-safe union-find over elements 0..n-1.
+
+    Args:
+        n: Number of elements
+        stripes: Number of locks that roots are hashed onto
+        optimistic: Link with a CAS retry loop instead of locking both
+            roots (None: only on free-threaded builds)
+    """
+
+    def __init__(self, n, stripes=STRIPES, optimistic=None):
+        # Lists rather than arrays: single-item reads and writes of a list
+        # stay atomic on free-threaded builds
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.n = n
+        self.stripes = stripes
+        self.locks = [threading.Lock() for _ in range(stripes)]
+        self.merges = [0] * stripes
+        self.optimistic = free_threaded() if optimistic is None else optimistic
+
+    @property
+    def total_components(self):
+        return self.n - sum(self.merges)
+
+    def find(self, idx):
+        parent = self.parent
+        while parent[idx] != idx:
+            parent[idx] = idx = parent[parent[idx]]
+        return idx
+
+    def connected(self, u, v):
+        while True:
+            root_u, root_v = self.find(u), self.find(v)
+            if root_u == root_v:
+                return True
+            # Still a root: u and v were apart at the moment it was read
+            if self.parent[root_u] == root_u:
+                return False
+
+    def union(self, u, v):
+        """Merge the sets of u and v. Returns True if this call merged them."""
+        if self.optimistic:
+            return self._union_cas(u, v)
+        return self._union_locked(u, v)
+
+    def union_many(self, pairs):
+        """Union every (u, v) in pairs. Returns the number of merges."""
+        union = self._union_cas if self.optimistic else self._union_locked
+        return sum(union(u, v) for u, v in pairs)
+
+    def _union_locked(self, u, v):
+        parent, size = self.parent, self.size
+        while True:
+            root_u, root_v = self.find(u), self.find(v)
+            if root_u == root_v:
+                return False
+            first, second = root_u % self.stripes, root_v % self.stripes
+            if first > second:
+                first, second = second, first
+            with self.locks[first]:
+                if second != first:
+                    self.locks[second].acquire()
+                try:
+                    if parent[root_u] != root_u or parent[root_v] != root_v:
+                        continue  # linked by another thread; retry
+                    if size[root_u] < size[root_v]:
+                        root_u, root_v = root_v, root_u
+                    parent[root_v] = root_u
+                    size[root_u] += size[root_v]
+                    self.merges[first] += 1
+                    return True
+                finally:
+                    if second != first:
+                        self.locks[second].release()
+
+    def _union_cas(self, u, v):
+        while True:
+            root_u, root_v = self.find(u), self.find(v)
+            if root_u == root_v:
+                return False
+            if root_u > root_v:
+                root_u, root_v = root_v, root_u
+            if self._cas(root_u, root_u, root_v):
+                return True
+
+    def _cas(self, idx, expected, new):
+        """parent[idx] = new if it is still expected. Returns whether it was."""
+        stripe = idx % self.stripes
+        with self.locks[stripe]:
+            if self.parent[idx] != expected:
+                return False
+            self.parent[idx] = new
+            self.merges[stripe] += 1
+            return True
@@ -0,0 +1,489 @@
+"""
+Compressed sparse row (CSR) graphs.
+
+A CSRGraph stores vertices as dense ints 0..n-1 and all adjacency in three
+flat arrays: the out-arcs of v are targets[offsets[v]:offsets[v + 1]], with
+matching weights. That is 4-8 bytes per arc and 8 per vertex, against a
+GraphNode object, its __dict__ and a list of neighbour references per
+vertex, so the same memory holds a far larger graph. Original vertex
+values are kept in `labels` (id -> value) and `index` (value -> id) and
+only touched at the boundaries.
+
+Graphs can be saved in a compact binary format and mapped back in without
+parsing: CSRGraph.load mmaps the file and exposes the arrays as memoryviews
+over the mapping, so opening costs O(1) regardless of size. Layout (all
+little-endian, sections 8-byte aligned):
+
+    header   48 bytes: HEADER fields, see save()
+    offsets  (n + 1) int64
+    targets  m int32 or int64
+    weights  m int64 or float64 (if weighted)
+    labels   JSON list of vertex values, tuples written as {"tuple": [...]}
+             (omitted when labels are 0..n-1)
+
+Example:
+    graph = CSRGraph.from_edges([("A", "B", 5), ("B", "C", 1)])
+    start = graph.node("A")        # CSRNode handle, usable like a GraphNode
+    nodes = graph.to_nodes()       # {value: GraphNode}, as make_graph returns
+    graph.save("g.csr")
+    graph = CSRGraph.load("g.csr")
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+if __package__:
+    from .graph import GraphNode
+else:
+    from graph import GraphNode
+
+
+def intern_edges(edges):
+    """
+    Remap an iterable of (a, b) or (a, b, weight) edges to dense int ids.
+
+    Returns (index, labels, src, dst, weights): {value: id}, the values by
+    id, parallel array("q") endpoints and an array of weights (None if
+    unweighted). Ids follow first appearance, as make_graph's dict order.
+
+    Raises ValueError if some edges have a weight and others do not.
+    """
+    index, labels = {}, []
+    src, dst = array("q"), array("q")
+    weights = None
+
+    for item in edges:
+        if (len(item) == 3) != (weights is not None) and src:
+            has = "has no weight" if weights is not None else "has a weight"
+            raise ValueError(f"edge {len(src)} {item!r} {has}, unlike edge 0")
+        a, b = item[0], item[1]
+        ia = index.get(a)
+        if ia is None:
+            ia = index[a] = len(labels)
+            labels.append(a)
+        ib = index.get(b)
+        if ib is None:
+            ib = index[b] = len(labels)
+            labels.append(b)
+        src.append(ia)
+        dst.append(ib)
+        if len(item) == 3:
+            if weights is None:
+                weights = array("q")
+            w = item[2]
+            if weights.typecode == "q" and not isinstance(w, int):
+                weights = array("d", weights)
+            weights.append(w)
+
+    return index, labels, src, dst, weights
+
+
+# magic, version, flags, n, m, labels offset, labels length, target and
+# weight typecodes (weight b"\0" if unweighted)
+HEADER = struct.Struct("<4sHHQQQQ2s6x")
+MAGIC = b"CSRG"
+VERSION = 1
+DIRECTED = 0x1
+
+
+class CSRGraph:
+    """
+    Immutable graph over vertex ids 0..n-1 in CSR form.
+
+    The arrays may also be memoryviews of the same typecodes (see load).
+
+    Attributes:
+        offsets: array("q") of n + 1 arc offsets
+        targets: array("i") of m arc heads (array("q") past 2**31 vertices)
+        weights: array("q") or array("d") of m arc weights, or None
+        labels: List of original vertex values, by id (range(n) if unlabelled)
+        index: Dict of {value: id} (the same range if unlabelled)
+        directed: False if every edge is stored as two arcs
+    """
+
+    def __init__(
+        self, offsets, targets, weights=None, labels=None, directed=True, index=None
+    ):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.labels = range(len(offsets) - 1) if labels is None else labels
+        if index is None and isinstance(self.labels, range):
+            # Ids are their own labels: `v in range` and range[v] stay O(1)
+            index = self.labels
+        elif index is None:
+            index = {label: v for v, label in enumerate(self.labels)}
+        self.index = index
+        self.directed = directed
+
+    @classmethod
+    def from_edges(cls, edges, directed=False):
+        """
+        Build from an iterable of (a, b) or (a, b, weight) tuples.
+
+        Accepts the same input as make_graph, except that the edges must be
+        all weighted or all unweighted (ValueError otherwise). It keeps the
+        same neighbour order, so traversals visit vertices in the same order. Edges are
+        consumed once into flat arrays, never held as a list of tuples.
+        """
+        index, labels, src, dst, weights = intern_edges(edges)
+        return cls._from_arrays(src, dst, weights, labels, directed, index)
+
+    @classmethod
+    def from_ids(cls, n, src, dst, weights=None, directed=False):
+        """
+        Build from parallel arrays of int endpoints in 0..n-1.
+
+        The ids are their own labels (labels and index are range(n)), so
+        no remapping dict is built and save() writes no labels section.
+        """
+        return cls._from_arrays(src, dst, weights, range(n), directed)
+
+    @classmethod
+    def _from_arrays(cls, src, dst, weights, labels, directed, index=None):
+        """Counting-sort parallel (src, dst[, weight]) arrays into CSR."""
+        n = len(labels)
+        degree = array("q", bytes(8 * (n + 1)))
+        for a in src:
+            degree[a + 1] += 1
+        if not directed:
+            for b in dst:
+                degree[b + 1] += 1
+        for v in range(n):
+            degree[v + 1] += degree[v]
+        offsets = degree
+
+        m = offsets[n]
+        targets = array("i" if n < 2**31 else "q")
+        targets.frombytes(bytes(targets.itemsize * m))
+        out_weights = None
+        if weights is not None:
+            out_weights = array(weights.typecode, bytes(weights.itemsize * m))
+        cursor = array("q", offsets[:n])
+        # One pass in edge order, writing a->b then b->a, keeps each
+        # vertex's arcs in make_graph's order.
+        for i in range(len(src)):
+            a, b = src[i], dst[i]
+            pos = cursor[a]
+            targets[pos] = b
+            if out_weights is not None:
+                out_weights[pos] = weights[i]
+            cursor[a] = pos + 1
+            if not directed:
+                pos = cursor[b]
+                targets[pos] = a
+                if out_weights is not None:
+                    out_weights[pos] = weights[i]
+                cursor[b] = pos + 1
+
+        return cls(offsets, targets, out_weights, labels, directed, index)
+
+    @classmethod
+    def from_nodes(cls, nodes):
+        """
+        Build from a {value: GraphNode} dict, as returned by make_graph.
+
+        Neighbours may be GraphNodes or (GraphNode, weight) pairs. Vertices
+        only reachable as neighbours are included too. The result is
+        directed: every arc in the node lists is stored as-is.
+        """
+        index, labels, order = {}, [], list(nodes.values())
+        for node in order:
+            if node.val not in index:
+                index[node.val] = len(labels)
+                labels.append(node.val)
+
+        src, dst, weights = array("q"), array("q"), None
+        i = 0
+        while i < len(order):
+            node = order[i]
+            i += 1
+            for item in node.neighbors:
+                if isinstance(item, tuple):
+                    neighbor, w = item
+                    if weights is None:
+                        weights = array("q")
+                    if weights.typecode == "q" and not isinstance(w, int):
+                        weights = array("d", weights)
+                    weights.append(w)
+                else:
+                    neighbor = item
+                if neighbor.val not in index:
+                    index[neighbor.val] = len(labels)
+                    labels.append(neighbor.val)
+                    order.append(neighbor)
+                src.append(index[node.val])
+                dst.append(index[neighbor.val])
+
+        return cls._from_arrays(src, dst, weights, labels, True, index)
+
+    def to_nodes(self):
+        """Expand into a {value: GraphNode} dict, as make_graph returns."""
+        nodes = {label: GraphNode(label) for label in self.labels}
+        by_id = list(nodes.values())
+        for v, node in enumerate(by_id):
+            start, end = self.offsets[v], self.offsets[v + 1]
+            if self.weights is None:
+                node.neighbors = [by_id[w] for w in self.targets[start:end]]
+            else:
+                node.neighbors = [
+                    (by_id[self.targets[i]], self.weights[i]) for i in range(start, end)
+                ]
+        return nodes
+
+    def save(self, path):
+        """
+        Write the graph in the binary format (see module docstring).
+
+        Labels must be JSON values or tuples of them (ints, floats, strings,
+        None, bools); anything else raises ValueError before the file is
+        opened, since it would not load back as the same vertex.
+        """
+        labels = b""
+        if any(type(x) is not int or x != v for v, x in enumerate(self.labels)):
+            labels = _encode_labels(self.labels)
+        sections = [self.offsets, self.targets]
+        if self.weights is not None:
+            sections.append(self.weights)
+        data_end = HEADER.size + sum(_padded(_nbytes(a)) for a in sections)
+
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            DIRECTED if self.directed else 0,
+            self.n,
+            self.m,
+            data_end if labels else 0,
+            len(labels),
+            (_typecode(self.targets) + (_typecode(self.weights) or "\0")).encode(),
+        )
+        with open(path, "wb") as f:
+            f.write(header)
+            for a in sections:
+                f.write(_little_endian(a))
+                f.write(bytes(_padded(_nbytes(a)) - _nbytes(a)))
+            f.write(labels)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Map a file written by save().
+
+        The arrays are memoryviews straight over the mapping, so nothing
+        is read until the algorithm touches it and pages are shared with
+        the OS cache. Only labels (if the file has them) are decoded up
+        front. On big-endian hosts the arrays are copied and byteswapped.
+
+        Raises ValueError if the file is not a CSR graph of this version,
+        or is shorter than its header says.
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path}: not a CSR graph file (too short)")
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(buf)
+        magic, version, flags, n, m, labels_at, labels_len, codes = (
+            HEADER.unpack_from(view)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a CSR graph file (bad magic)")
+        if version != VERSION:
+            raise ValueError(
+                f"{path}: CSR graph file version {version}, expected {VERSION}"
+            )
+        target_code, weight_code = chr(codes[0]), chr(codes[1])
+        if target_code not in "iq" or weight_code not in "qd\0":
+            raise ValueError(f"{path}: bad typecodes {target_code!r}, {weight_code!r}")
+
+        # Check the header against the file before slicing anything
+        sections = [("q", n + 1), (target_code, m), (weight_code, m)]
+        data_end = HEADER.size + sum(
+            _padded(struct.calcsize(code) * count)
+            for code, count in sections
+            if code != "\0"
+        )
+        end = labels_at + labels_len if labels_len else data_end
+        if labels_len and labels_at < data_end:
+            raise ValueError(f"{path}: labels overlap the arrays")
+        if len(view) < end:
+            raise ValueError(
+                f"{path}: truncated CSR graph file ({len(view)} bytes, "
+                f"header needs {end})"
+            )
+
+        pos = HEADER.size
+        arrays = []
+        for code, count in sections:
+            if code == "\0":
+                arrays.append(None)
+                continue
+            size = struct.calcsize(code) * count
+            arrays.append(_from_little_endian(view[pos : pos + size], code))
+            pos += _padded(size)
+        offsets, targets, weights = arrays
+        if offsets[0] != 0 or offsets[n] != m:
+            raise ValueError(f"{path}: offsets do not span the {m} arcs")
+
+        labels = None
+        if labels_len:
+            labels = _decode_labels(bytes(view[labels_at : labels_at + labels_len]))
+            if len(labels) != n:
+                raise ValueError(f"{path}: {len(labels)} labels for {n} vertices")
+        graph = cls(offsets, targets, weights, labels, bool(flags & DIRECTED))
+        graph._mmap = buf  # keep the mapping alive as long as the graph
+        return graph
+
+    def transpose(self):
+        """
+        The graph with every arc reversed: in-neighbours become out-neighbours.
+
+        An undirected graph is its own transpose. Cached after the first call.
+        """
+        if not self.directed:
+            return self
+        if getattr(self, "_transpose", None) is None:
+            tails = array("q")
+            for v in range(self.n):
+                tails.extend(array("q", [v]) * self.degree(v))
+            weights = None
+            if self.weights is not None:
+                weights = array(self.weight_typecode, self.weights)
+            self._transpose = CSRGraph._from_arrays(
+                array("q", self.targets), tails, weights, self.labels, True, self.index
+            )
+        return self._transpose
+
+    @property
+    def weight_typecode(self):
+        """Typecode of the weights ("q" or "d"), or None if unweighted."""
+        return _typecode(self.weights)
+
+    @property
+    def n(self):
+        """Number of vertices."""
+        return len(self.offsets) - 1
+
+    @property
+    def m(self):
+        """Number of arcs (twice the edge count when undirected)."""
+        return len(self.targets)
+
+    def __len__(self):
+        return self.n
+
+    def degree(self, v):
+        return self.offsets[v + 1] - self.offsets[v]
+
+    def neighbors(self, v):
+        """Arc heads of vertex id v."""
+        return self.targets[self.offsets[v] : self.offsets[v + 1]]
+
+    def node(self, label):
+        """CSRNode handle for the vertex with value label."""
+        return CSRNode(self, self.index[label])
+
+    def nbytes(self):
+        """Bytes held by the adjacency arrays (labels and index excluded)."""
+        arrays = [self.offsets, self.targets]
+        if self.weights is not None:
+            arrays.append(self.weights)
+        return sum(len(a) * a.itemsize for a in arrays)
+
+    def __repr__(self):
+        kind = "directed" if self.directed else "undirected"
+        return f"CSRGraph(n={self.n}, m={self.m}, {kind})"
+
+
+def _encode_labels(labels):
+    def tag(x):
+        if type(x) is tuple:
+            return {"tuple": [tag(item) for item in x]}
+        return x
+
+    labels = list(labels)
+    try:
+        data = json.dumps([tag(x) for x in labels]).encode()
+    except TypeError as e:
+        raise ValueError(f"cannot save vertex labels: {e}") from None
+    if _decode_labels(data) != labels:
+        raise ValueError("cannot save vertex labels: they do not round-trip as JSON")
+    return data
+
+
+def _decode_labels(data):
+    return json.loads(data, object_hook=lambda d: tuple(d["tuple"]))
+
+
+def _typecode(a):
+    if a is None:
+        return None
+    return a.typecode if isinstance(a, array) else a.format
+
+
+def _nbytes(a):
+    return len(a) * a.itemsize
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+def _little_endian(a):
+    if sys.byteorder == "little":
+        return a
+    swapped = array(_typecode(a), a)
+    swapped.byteswap()
+    return swapped
+
+
+def _from_little_endian(view, code):
+    if sys.byteorder == "little":
+        return view.cast(code)
+    a = array(code, bytes(view))
+    a.byteswap()
+    return a
+
+
+class CSRNode:
+    """
+    Lightweight (graph, id) handle that quacks like a GraphNode.
+
+    val and neighbors are computed on access, so handles cost nothing
+    until used. Equality and hashing go through val, as for GraphNode.
+    """
+
+    __slots__ = ("graph", "id")
+
+    def __init__(self, graph, id):
+        self.graph = graph
+        self.id = id
+
+    @property
+    def val(self):
+        return self.graph.labels[self.id]
+
+    @property
+    def neighbors(self):
+        graph = self.graph
+        start, end = graph.offsets[self.id], graph.offsets[self.id + 1]
+        if graph.weights is None:
+            return [CSRNode(graph, w) for w in graph.targets[start:end]]
+        return [
+            (CSRNode(graph, graph.targets[i]), graph.weights[i])
+            for i in range(start, end)
+        ]
+
+    def __repr__(self):
+        return repr(self.val)
+
+    def __eq__(self, other):
+        if isinstance(other, (CSRNode, GraphNode)):
+            return self.val == other.val
+        return self.val == other
+
+    def __hash__(self):
+        return hash(self.val)
@@ -0,0 +1,222 @@
+"""
+Layered topological sort and a parallel DAG executor.
+
+layers() is Kahn's algorithm run one antichain at a time: layer 0 holds
+the sources, layer k the nodes whose last predecessor sits in layer k-1.
+Nodes in the same layer never depend on each other, so the layer widths
+show how much parallelism the DAG offers.
+
+run_dag() runs a task per node on a thread or process pool. A node is
+submitted as soon as its last predecessor finishes, not when its whole
+layer is done. With enough workers the run takes about as long as the
+critical path (the slowest chain of dependent tasks), not the sum of all
+task times.
+
+csr_topological_sort() is Kahn's algorithm for large DAGs held as a
+directed CSRGraph. In-degrees live in one array("q"), the queue is the
+output array itself, and arcs are read straight from the CSR arrays, so
+no label is hashed and no per-node list or dict entry is allocated.
+array_topological_sort() wraps it for labelled nodes, mapping labels to
+ids on the way in and back on the way out.
+
+Example:
+    layers(["a", "b", "c"], [("a", "c"), ("b", "c")])   # [["a", "b"], ["c"]]
+    report = run_dag(targets, deps, build, workers=8)
+    report["wall"], report["critical_path"], report["utilization"]
+    order = csr_topological_sort(CSRGraph.load("huge.csr"))   # array("q") of ids
+"""
+
+import os
+import time
+from array import array
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import compress
+from operator import not_
+
+if __package__:
+    from .csr import CSRGraph
+else:
+    from csr import CSRGraph
+
+POOLS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+def layers(nodes, edges):
+    """
+    Kahn's algorithm, returning the order as a list of antichains.
+
+    Args:
+        nodes: Node labels; layer 0 keeps their relative order, later
+            layers list nodes in the order they are freed
+        edges: (u, v) pairs meaning u must come before v
+
+    Returns a list of layers (lists of nodes). Nodes on or behind a cycle
+    are never freed and are left out, as in the flat topological sort.
+    """
+    succ, indegree = _adjacency(nodes, edges)
+    layer = [node for node in indegree if indegree[node] == 0]
+    result = []
+    while layer:
+        result.append(layer)
+        freed = []
+        for u in layer:
+            for v in succ[u]:
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    freed.append(v)
+        layer = freed
+    return result
+
+
+def run_dag(nodes, edges, task, workers=None, pool="thread"):
+    """
+    Call task(node) for every node, each once all its predecessors are done.
+
+    Args:
+        nodes: Node labels
+        edges: (u, v) pairs meaning task(u) must finish before task(v) starts
+        task: Callable taking a node. With pool="process" it and the node
+            labels must be picklable (a module-level function).
+        workers: Pool size (None: one per CPU)
+        pool: "thread" for I/O-bound or GIL-releasing tasks, "process"
+            for CPU-bound Python tasks
+
+    Returns a dict:
+        results: {node: task(node)}
+        order: Nodes in completion order
+        layers: The Kahn layers of the DAG
+        wall: Elapsed seconds for the whole run
+        busy: Sum of the task durations (the serial run time)
+        critical_path: Seconds along the slowest dependency chain
+        critical_nodes: The nodes on that chain, first to last
+        utilization: busy / (wall * workers), 1.0 means no idle worker
+        parallelism: busy / critical_path, the best possible speedup
+
+    Raises ValueError if the edges contain a cycle (before running anything).
+    A task that raises stops the run: no new tasks are submitted, and the
+    exception propagates once the running ones finish.
+    """
+    edges = list(edges)
+    dag = layers(nodes, edges)
+    succ, indegree = _adjacency(nodes, edges)
+    if sum(map(len, dag)) < len(indegree):
+        raise ValueError("run_dag: the edges contain a cycle")
+    workers = workers or os.cpu_count() or 1
+
+    results, durations, order = {}, {}, []
+    start = time.perf_counter()
+    with POOLS[pool](max_workers=workers) as executor:
+        ready = dag[0] if dag else []
+        running = {executor.submit(_timed, task, node): node for node in ready}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                results[node], durations[node] = future.result()
+                order.append(node)
+                for v in succ[node]:
+                    indegree[v] -= 1
+                    if indegree[v] == 0:
+                        running[executor.submit(_timed, task, v)] = v
+    wall = time.perf_counter() - start
+
+    length, chain = _critical_path(dag, edges, durations)
+    busy = sum(durations.values())
+    return {
+        "results": results,
+        "order": order,
+        "layers": dag,
+        "wall": wall,
+        "busy": busy,
+        "critical_path": length,
+        "critical_nodes": chain,
+        "utilization": busy / (wall * workers) if wall else 1.0,
+        "parallelism": busy / length if length else 1.0,
+    }
+
+
+def csr_topological_sort(graph):
+    """
+    Topological order of a directed CSRGraph as an array("q") of vertex ids.
+
+    The order is the same as a FIFO Kahn's algorithm over the same arcs.
+    It is shorter than graph.n if the graph has a cycle.
+    """
+    n = graph.n
+    offsets, targets = graph.offsets, memoryview(graph.targets)
+    indegree = array("q", bytes(8 * n))
+    for v in targets:
+        indegree[v] += 1
+    # The order array doubles as the queue: order[head:] is still to expand
+    order = array("q", compress(range(n), map(not_, indegree)))
+    head = 0
+    while head < len(order):
+        u = order[head]
+        head += 1
+        for v in targets[offsets[u] : offsets[u + 1]]:
+            left = indegree[v] - 1
+            indegree[v] = left
+            if not left:
+                order.append(v)
+    return order
+
+
+def array_topological_sort(nodes, edges):
+    """
+    Topological order of labelled nodes, computed over CSR arrays.
+
+    Takes the same input as the flat topological sort and returns a list
+    of labels, shorter than nodes if the edges contain a cycle.
+    """
+    labels = list(nodes)
+    index = {node: i for i, node in enumerate(labels)}
+    src, dst = array("q"), array("q")
+    for u, v in edges:
+        src.append(index[u])
+        dst.append(index[v])
+    graph = CSRGraph.from_ids(len(labels), src, dst, directed=True)
+    return [labels[v] for v in csr_topological_sort(graph)]
+
+
+def _adjacency(nodes, edges):
+    """Successor lists and in-degrees, keyed in node order."""
+    succ = {node: [] for node in nodes}
+    indegree = dict.fromkeys(succ, 0)
+    for u, v in edges:
+        succ[u].append(v)
+        indegree[v] += 1
+    return succ, indegree
+
+
+def _timed(task, node):
+    """Run task(node) in a worker. Returns (result, seconds)."""
+    start = time.perf_counter()
+    result = task(node)
+    return result, time.perf_counter() - start
+
+
+def _critical_path(dag, edges, durations):
+    """Longest chain by task time. Returns (seconds, nodes first to last)."""
+    pred = {node: [] for layer in dag for node in layer}
+    for u, v in edges:
+        pred[v].append(u)
+    finish, via = {}, {}
+    for layer in dag:
+        for node in layer:
+            before = max(pred[node], key=finish.__getitem__, default=None)
+            via[node] = before
+            start = finish[before] if before is not None else 0.0
+            finish[node] = start + durations[node]
+    if not finish:
+        return 0.0, []
+    node = max(finish, key=finish.__getitem__)
+    length, chain = finish[node], []
+    while node is not None:
+        chain.append(node)
+        node = via[node]
+    return length, chain[::-1]
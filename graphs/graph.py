@@ -13,3 +13,45 @@ class GraphNode:
 
     def __hash__(self):
         return hash(self.val)
+
+
+class SlotGraphNode:
+    """
+    GraphNode without a per-instance __dict__, carrying a dense integer id.
+
+    Compares and hashes by val, exactly like GraphNode. id is the node's
+    position in make_graph's result (-1 if built by hand).
+    """
+
+    __slots__ = ("val", "neighbors", "id")
+
+    def __init__(self, val, id=-1):
+        self.val = val
+        self.neighbors = []
+        self.id = id
+
+    def __repr__(self):
+        return repr(self.val)
+
+    def __eq__(self, other):
+        if isinstance(other, (GraphNode, SlotGraphNode)):
+            return self.val == other.val
+        return self.val == other
+
+    def __hash__(self):
+        return hash(self.val)
+
+
+class IdentityGraphNode(SlotGraphNode):
+    """
+    SlotGraphNode hashed and compared by identity.
+
+    Set and dict lookups (e.g. `neighbor not in visited`) then use the
+    built-in object hash instead of two Python-level calls. The catch: a
+    node no longer equals its val, so compare results via node.val.
+    """
+
+    __slots__ = ()
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
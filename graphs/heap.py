@@ -0,0 +1,149 @@
+"""
+Indexed d-ary min-heap with decrease-key.
+
+Dijkstra and Prim with heapq push a fresh (priority, vertex) entry every
+time a vertex's priority improves and skip the stale ones when they pop,
+so the heap can hold O(E) entries and most pops do no useful work.
+IndexedHeap keeps at most one entry per key: pos[key] records where the
+key sits in the heap, so an improved priority moves the existing entry
+up instead of adding another. Memory is O(V) and every pop is live.
+
+Keys are ints 0..n-1 (vertex ids, e.g. of a CSRGraph). Each node has
+`arity` children: a wider heap is shallower, so pushes and decrease_key
+(which sift up) get cheaper while pops (which scan the children) get
+dearer. 4 is a good default when decrease_key dominates, as it does in
+Dijkstra on dense graphs.
+
+Example:
+    heap = IndexedHeap(graph.n)
+    heap.push(source, 0)
+    while heap:
+        v, d = heap.pop()
+        ...
+        heap.push_or_decrease(w, d + weight)
+"""
+
+from array import array
+
+ARITY = 4
+
+
+class IndexedHeap:
+    """
+    Min-priority queue over keys 0..n-1.
+
+    Args:
+        n: Number of possible keys
+        arity: Children per heap node (2 is a binary heap)
+    """
+
+    def __init__(self, n, arity=ARITY):
+        self.arity = arity
+        self.heap = []  # keys, in heap order
+        self.pos = array("q", [-1]) * n  # heap index by key, -1 if absent
+        self.priority = [None] * n
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, key):
+        return self.pos[key] >= 0
+
+    def peek(self):
+        """The (key, priority) pair with the lowest priority."""
+        key = self.heap[0]
+        return key, self.priority[key]
+
+    def push(self, key, priority):
+        """Insert a key that is not in the heap (ValueError if it is)."""
+        if self.pos[key] >= 0:
+            raise ValueError(f"key {key} is already in the heap")
+        self._insert(key, priority)
+
+    def pop(self):
+        """Remove and return the (key, priority) pair with the lowest priority."""
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.pos[top] = -1
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return top, self.priority[top]
+
+    def decrease_key(self, key, priority):
+        """
+        Lower the priority of a key already in the heap.
+
+        Raises KeyError if key is not in the heap, and ValueError if
+        priority is not lower than its current one.
+        """
+        i = self.pos[key]
+        if i < 0:
+            raise KeyError(key)
+        if not priority < self.priority[key]:
+            raise ValueError(
+                f"priority {priority} of key {key} is not below {self.priority[key]}"
+            )
+        self.priority[key] = priority
+        self._sift_up(i)
+
+    def push_or_decrease(self, key, priority):
+        """
+        Insert key, or lower its priority if it is queued with a higher one.
+
+        Returns True if the heap changed. This is the relax step of
+        Dijkstra and Prim.
+        """
+        i = self.pos[key]
+        if i < 0:
+            self._insert(key, priority)
+            return True
+        if priority < self.priority[key]:
+            self.priority[key] = priority
+            self._sift_up(i)
+            return True
+        return False
+
+    def _insert(self, key, priority):
+        self.priority[key] = priority
+        self.heap.append(key)
+        self._sift_up(len(self.heap) - 1)
+
+    def _sift_up(self, i):
+        heap, pos, priority, arity = self.heap, self.pos, self.priority, self.arity
+        key = heap[i]
+        p = priority[key]
+        while i:
+            parent = (i - 1) // arity
+            above = heap[parent]
+            if priority[above] <= p:
+                break
+            heap[i] = above
+            pos[above] = i
+            i = parent
+        heap[i] = key
+        pos[key] = i
+
+    def _sift_down(self, i):
+        heap, pos, priority, arity = self.heap, self.pos, self.priority, self.arity
+        n = len(heap)
+        key = heap[i]
+        p = priority[key]
+        while True:
+            first = arity * i + 1
+            if first >= n:
+                break
+            best, best_p = first, priority[heap[first]]
+            for child in range(first + 1, min(first + arity, n)):
+                child_p = priority[heap[child]]
+                if child_p < best_p:
+                    best, best_p = child, child_p
+            if best_p >= p:
+                break
+            below = heap[best]
+            heap[i] = below
+            pos[below] = i
+            i = best
+        heap[i] = key
+        pos[key] = i
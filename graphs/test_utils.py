@@ -1,21 +1,44 @@
+import csv
+import inspect
+import os
+from functools import partial
+
 if __package__:
-    from .graph import GraphNode
+    from .csr import CSRGraph, CSRNode, intern_edges
+    from .graph import GraphNode, SlotGraphNode
+    from .heap import IndexedHeap
 else:
-    from graph import GraphNode
+    from csr import CSRGraph, CSRNode, intern_edges
+    from graph import GraphNode, SlotGraphNode
+    from heap import IndexedHeap
 
 
-def make_graph(edges, directed=False):
+def make_graph(edges, directed=False, node_class=GraphNode):
     """
     Build graph from edge list. Returns dict of {value: node}.
 
     Args:
         edges: List of tuples. Either (a, b) for unweighted or (a, b, weight) for weighted.
+            Any iterable works and is consumed one edge at a time; a path to an
+            edge-list file is streamed through read_edges.
         directed: If False (default), adds edges in both directions.
+        node_class: GraphNode, or SlotGraphNode / IdentityGraphNode, whose
+            nodes also get a dense id in insertion order.
 
     Example:
         nodes = make_graph([("A", "B"), ("B", "C")])
         start = nodes["A"]
+        nodes = make_graph(read_edges("roads.csv", vertex=int))
     """
+    if isinstance(edges, (str, os.PathLike)):
+        edges = read_edges(edges)
+    if node_class is GraphNode:
+        new_node = GraphNode
+    else:
+
+        def new_node(val):
+            return node_class(val, len(nodes))
+
     nodes = {}
     for item in edges:
         if len(item) == 2:
@@ -25,9 +48,9 @@ def make_graph(edges, directed=False):
             a, b, weight = item
 
         if a not in nodes:
-            nodes[a] = GraphNode(a)
+            nodes[a] = new_node(a)
         if b not in nodes:
-            nodes[b] = GraphNode(b)
+            nodes[b] = new_node(b)
 
         if weight is not None:
             nodes[a].neighbors.append((nodes[b], weight))
@@ -40,6 +63,190 @@ def make_graph(edges, directed=False):
     return nodes
 
 
+def read_edges(source, delimiter=None, vertex=None, header=False):
+    """
+    Stream (a, b) or (a, b, weight) tuples from an edge-list file.
+
+    Args:
+        source: Path to a file, or an open text file / any iterable of lines
+        delimiter: Column separator. None splits on whitespace, except for
+            .csv paths, which default to ","; delimited input goes through
+            the csv module, so quoted fields work.
+        vertex: Callable applied to both endpoints (e.g. int); default keeps str
+        header: Skip the first line
+
+    Blank lines and lines starting with "#" are skipped. A third column is
+    the weight, an int if it parses as one and a float otherwise. A line
+    with a single column, a weight that is not a number, or an endpoint
+    that vertex rejects with ValueError raises ValueError naming its line
+    number. Lines are parsed one at a time as they are read, so memory
+    stays bounded no matter how large the file is.
+
+    Example:
+        for a, b in read_edges("edges.txt", vertex=int):
+            ...
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if delimiter is None and str(source).endswith(".csv"):
+            delimiter = ","
+        with open(source, newline="") as f:
+            yield from read_edges(f, delimiter, vertex, header)
+        return
+
+    name = getattr(source, "name", "<edges>")
+    lines = iter(source)
+    if header:
+        next(lines, None)
+    if delimiter is None:
+        rows = map(str.split, lines)
+    else:
+        rows = csv.reader(lines, delimiter=delimiter)
+    for lineno, row in enumerate(rows, 2 if header else 1):
+        if not row or row[0].startswith("#"):
+            continue
+        if len(row) < 2:
+            raise ValueError(f"{name}:{lineno}: expected 2 or 3 columns, got {row}")
+        a, b = row[0].strip(), row[1].strip()
+        if vertex is not None:
+            try:
+                a, b = vertex(a), vertex(b)
+            except ValueError as e:
+                raise ValueError(f"{name}:{lineno}: {e}") from None
+        if len(row) < 3 or not row[2].strip():
+            yield (a, b)
+            continue
+        try:
+            weight = _number(row[2])
+        except ValueError:
+            raise ValueError(
+                f"{name}:{lineno}: weight {row[2].strip()!r} is not a number"
+            ) from None
+        yield (a, b, weight)
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def build_graph(edges, directed=False, node_class=SlotGraphNode):
+    """
+    Bulk version of make_graph for large edge lists.
+
+    Interns the edges into int arrays first and counts degrees, then gives
+    every node a neighbour list allocated once at its final length and
+    filled in place, rather than grown by append. Same result (and
+    neighbour order) as make_graph(edges, directed, node_class) for every
+    node class, GraphNode included, without list over-allocation. Unlike
+    make_graph, it raises ValueError on a mix of weighted and unweighted
+    edges.
+    """
+    if isinstance(edges, (str, os.PathLike)):
+        edges = read_edges(edges)
+    _, labels, src, dst, weights = intern_edges(edges)
+    if node_class is GraphNode:
+        nodes = list(map(GraphNode, labels))
+    else:
+        nodes = list(map(node_class, labels, range(len(labels))))
+    degree = [0] * len(nodes)
+    for a in src:
+        degree[a] += 1
+    if not directed:
+        for b in dst:
+            degree[b] += 1
+    lists = [[None] * d for d in degree]
+    for node, neighbors in zip(nodes, lists):
+        node.neighbors = neighbors
+
+    heads = nodes if weights is None else None
+    fill = [0] * len(nodes)
+    for i, (a, b) in enumerate(zip(src, dst)):
+        if heads is None:
+            to_b, to_a = (nodes[b], weights[i]), (nodes[a], weights[i])
+        else:
+            to_b, to_a = nodes[b], nodes[a]
+        lists[a][fill[a]] = to_b
+        fill[a] += 1
+        if not directed:
+            lists[b][fill[b]] = to_a
+            fill[b] += 1
+    return dict(zip(labels, nodes))
+
+
 def single_node(val):
     """Create an isolated node with no neighbors."""
     return GraphNode(val)
+
+
+def queue_variants(tests, solve, arities=(2, 3, 8)):
+    """
+    Copies of tests that pass queue=IndexedHeap at each arity.
+
+    Empty if solve takes no queue argument, so exercises that only use
+    heapq are not tested on it.
+    """
+    if "queue" not in inspect.signature(solve).parameters:
+        return []
+    return [
+        {
+            **test,
+            "name": f"{test['name']} [IndexedHeap, arity {arity}]",
+            "inputs": {**test["inputs"], "queue": partial(IndexedHeap, arity=arity)},
+        }
+        for arity in arities
+        for test in tests
+    ]
+
+
+def csr_variants(tests, solve, directed=False):
+    """
+    Copies of tests with their graph given as CSR.
+
+    A GraphNode start becomes the CSRNode of the same vertex, and an edge
+    list becomes CSRGraph.from_edges(edges, directed). Tests with neither
+    are not copied. Besides its own check, each copy must return the same
+    result as solve on the original input, so CSR paths are held to the
+    exact order of the node path even where the test accepts several.
+
+    Empty if solve's module imports neither CSRGraph nor CSRNode, so
+    exercises written for plain nodes and edge lists are not tested on it.
+    """
+    module = vars(inspect.getmodule(solve))
+    if module.get("CSRGraph") is not CSRGraph and module.get("CSRNode") is not CSRNode:
+        return []
+    return [_csr_variant(test, solve, directed) for test in tests if _has_graph(test)]
+
+
+def _has_graph(test):
+    inputs = test["inputs"]
+    return isinstance(inputs.get("start"), GraphNode) or isinstance(
+        inputs.get("edges"), list
+    )
+
+
+def _csr_variant(test, solve, directed):
+    inputs = dict(test["inputs"])
+    if isinstance(inputs.get("start"), GraphNode):
+        start = inputs["start"]
+        inputs["start"] = CSRGraph.from_nodes({start.val: start}).node(start.val)
+    else:
+        inputs["edges"] = CSRGraph.from_edges(inputs["edges"], directed)
+    check, fail_msg = test["check"], test["fail_msg"]
+
+    def same_check(r):
+        return check(r) and r == solve(**test["inputs"])
+
+    def same_fail_msg(r):
+        if check(r):
+            return f"expected {solve(**test['inputs'])} as without CSR, got {r}"
+        return fail_msg(r) if callable(fail_msg) else fail_msg
+
+    return {
+        **test,
+        "name": f"{test['name']} [CSR]",
+        "inputs": inputs,
+        "check": same_check,
+        "fail_msg": same_fail_msg,
+    }
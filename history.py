@@ -0,0 +1,210 @@
+"""
+Per-test result history for spotting regressions.
+
+Every suite run appends one JSON line per test to .drills/history.jsonl:
+
+    {"run": "2026-01-31T12:00:00.000", "rev": "abc1234", "exercise":
+     "graphs/05_dijkstra", "file": "solution", "mode": "", "test":
+     "diamond", "verdict": "pass", "wall": 1.2e-05, "peak": null}
+
+wall is the test call's time in seconds; peak is its tracemalloc peak in
+bytes when run with --memory (null otherwise). mode names the options
+that change timings ("isolate", "memory"), and runs are only compared
+within a mode. show() groups lines back into runs and compares each
+exercise's latest run against the median of the runs before it.
+"""
+
+import datetime
+import json
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+HISTORY_PATH = ROOT / ".drills" / "history.jsonl"
+
+# Latest run this many times slower than its baseline is flagged...
+SLOWDOWN = 1.5
+# ...if it is also this many seconds slower (sub-100µs jitter is noise)
+MIN_SLOWDOWN = 1e-4
+
+# Earlier runs whose median forms the baseline
+BASELINE_RUNS = 5
+
+_revision = None
+
+
+def git_revision():
+    """Short HEAD hash, "+dirty" with uncommitted changes ("" outside git)."""
+    global _revision
+    if _revision is None:
+        try:
+            _revision = subprocess.run(
+                ["git", "describe", "--always", "--dirty=+dirty"],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                timeout=5,
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            _revision = ""
+    return _revision
+
+
+def records_for(topic, exercise_name, solution, summary, options):
+    """One history record per test in a run_all summary run under options."""
+    run = datetime.datetime.now().isoformat(timespec="milliseconds")
+    base = {
+        "run": run,
+        "rev": git_revision(),
+        "exercise": f"{topic}/{exercise_name}",
+        "file": "solution" if solution else "exercise",
+        "mode": "+".join(m for m in ("isolate", "memory") if options.get(m)),
+    }
+    return [dict(base, **test) for test in summary.get("tests", [])]
+
+
+def append(records, path=HISTORY_PATH):
+    """Append records as JSON lines (best effort)."""
+    if not records:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in records))
+    except OSError:
+        pass
+
+
+def load(path=HISTORY_PATH):
+    """All records, oldest first. Malformed lines are skipped."""
+    records = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    pass
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def runs(records):
+    """
+    Group records into suite runs.
+
+    Returns {(exercise, file, mode): [run, ...]} with runs oldest first, each
+    {"run", "rev", "passed", "total", "wall", "tests": {test: wall}}.
+    wall sums the tests that ran.
+    """
+    grouped = {}
+    for r in records:
+        key = (r["exercise"], r["file"], r.get("mode", ""))
+        series = grouped.setdefault(key, [])
+        if not series or series[-1]["run"] != r["run"]:
+            series.append(
+                {
+                    "run": r["run"],
+                    "rev": r["rev"],
+                    "passed": 0,
+                    "total": 0,
+                    "wall": 0.0,
+                    "tests": {},
+                }
+            )
+        run = series[-1]
+        run["total"] += 1
+        run["passed"] += r["verdict"] == "pass"
+        if r.get("wall") is not None:
+            run["wall"] += r["wall"]
+            run["tests"][r["test"]] = r["wall"]
+    return grouped
+
+
+def trend(series):
+    """
+    Latest run vs the median wall time of up to BASELINE_RUNS earlier runs.
+
+    Only fully passing runs count. Returns {"latest", "baseline", "ratio"}
+    (baseline and ratio None without earlier runs), or None if no run passed.
+    """
+    passing = [r for r in series if r["passed"] == r["total"]]
+    if not passing:
+        return None
+    latest = passing[-1]
+    earlier = [r["wall"] for r in passing[-1 - BASELINE_RUNS : -1]]
+    if not earlier:
+        return {"latest": latest, "baseline": None, "ratio": None}
+    baseline = statistics.median(earlier)
+    ratio = latest["wall"] / baseline if baseline > 0 else None
+    return {"latest": latest, "baseline": baseline, "ratio": ratio}
+
+
+def show(prefix="", path=HISTORY_PATH, last=10):
+    """
+    Print timing trends for exercises whose "topic/exercise" starts with prefix.
+
+    When prefix matches a single exercise, also lists its last `last` runs
+    and the per-test times of the latest run against their baseline.
+    """
+    from bench import format_time
+
+    grouped = {
+        key: series
+        for key, series in runs(load(path)).items()
+        if key[0].startswith(prefix)
+    }
+    if not grouped:
+        print(f"No history for '{prefix or 'any exercise'}' in {path}")
+        return
+
+    labels = {
+        key: f"{key[0]} ({', '.join(filter(None, key[1:]))})" for key in grouped
+    }
+    width = max(map(len, labels.values()))
+    for key, series in sorted(grouped.items()):
+        label = labels[key].ljust(width)
+        t = trend(series)
+        if t is None:
+            print(f"  ✗ {label}  no passing run in {len(series)}")
+            continue
+        line = f"  {label}  {format_time(t['latest']['wall']):>10}"
+        if t["ratio"] is not None:
+            line += f"  vs {format_time(t['baseline']):>10}  {t['ratio']:5.2f}x"
+            slower = t["latest"]["wall"] - t["baseline"]
+            if t["ratio"] >= SLOWDOWN and slower >= MIN_SLOWDOWN:
+                line += "  ⚠ slower"
+        print(f"{line}  ({len(series)} runs)")
+
+    if len({ex for ex, _, _ in grouped}) == 1:
+        for key, series in sorted(grouped.items()):
+            print(f"\n{labels[key]}:")
+            _print_runs(series[-last:], format_time)
+            _print_tests(series, format_time)
+
+
+def _print_runs(series, format_time):
+    print(f"  {'run':<23}  {'rev':<14}  {'tests':>7}  {'wall':>10}")
+    for r in series:
+        counts = f"{r['passed']}/{r['total']}"
+        print(
+            f"  {r['run']:<23}  {r['rev']:<14}  {counts:>7}  "
+            f"{format_time(r['wall']):>10}"
+        )
+
+
+def _print_tests(series, format_time):
+    passing = [r for r in series if r["passed"] == r["total"]]
+    if len(passing) < 2:
+        return
+    latest, earlier = passing[-1], passing[-1 - BASELINE_RUNS : -1]
+    print(f"\n  {'test':<40}  {'latest':>10}  {'baseline':>10}")
+    for test, wall in latest["tests"].items():
+        times = [r["tests"][test] for r in earlier if test in r["tests"]]
+        baseline = statistics.median(times) if times else None
+        line = f"  {test[:40]:<40}  {format_time(wall):>10}"
+        if baseline:
+            line += f"  {format_time(baseline):>10}  {wall / baseline:5.2f}x"
+        print(line)
@@ -7,24 +7,105 @@ Usage:
     python run.py attention           # List exercises in topic
     python run.py attention 01        # Run exercise
     python run.py attention 01 -s     # Run solution
+    python run.py --all [-s] [-j N]   # Run every exercise on a process pool
+    python run.py attention --all     # Run every exercise in topic
+    python run.py attention 01 --bench [-s] [--out FILE]  # Benchmark scaling
+    python run.py attention 01 --compare [--out FILE]  # Exercise vs solution
+    python run.py attention [01] --watch [-s]  # Rerun suites as files change
+    python run.py [attention [01]] --history   # Timing trends from past runs
+
+Options:
+    --isolate        Run each test in a forked worker with resource limits
+    --timeout SEC    CPU seconds per test (implies --isolate, default 5)
+    --mem MB         Memory per test (implies --isolate, default 1024)
+    --memory         Report peak/retained memory and top allocation sites per test
+    --no-cache       Rerun every exercise in --all instead of reusing cached results
 """
 
+import hashlib
 import importlib
+import json
+import os
 import sys
+import time
 from pathlib import Path
 
+# bench, history, test_utils, watch and concurrent.futures are imported where
+# used, so listing topics and exercises stays cheap.
+
 ROOT = Path(__file__).parent
+STATE_DIR = ROOT / ".drills"
+BENCH_DIR = STATE_DIR / "bench"
+INDEX_PATH = STATE_DIR / "index.json"
+CACHE_DIR = STATE_DIR / "cache"
+
+_index = None
+
+
+def load_index():
+    """
+    Discovery index: {"topics": {topic: [exercise, ...]}, "mtimes": {dir: ns}}.
+
+    Persisted in .drills/index.json and reused while every recorded directory
+    keeps its mtime: adding or removing a topic or exercise directory bumps
+    its parent's mtime. Subdirectories without an exercise.py yet are
+    recorded too, so a newly filled-in exercise is picked up.
+    """
+    global _index
+    if _index is None:
+        try:
+            index = json.loads(INDEX_PATH.read_text())
+            if not _index_fresh(index):
+                index = _build_index()
+        except (OSError, ValueError, KeyError):
+            index = _build_index()
+        _index = index
+    return _index
+
+
+def _index_fresh(index):
+    for rel, mtime in index["mtimes"].items():
+        try:
+            if (ROOT / rel).stat().st_mtime_ns != mtime:
+                return False
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def _build_index():
+    """Walk the tree, then persist the index (best effort)."""
+    STATE_DIR.mkdir(exist_ok=True)
+    mtimes = {".": ROOT.stat().st_mtime_ns}
+    topics = {}
+    for d in ROOT.iterdir():
+        if not d.is_dir() or d.name.startswith((".", "_")):
+            continue
+        mtimes[d.name] = d.stat().st_mtime_ns
+        exercises = []
+        for sub in d.iterdir():
+            if not sub.is_dir() or sub.name.startswith((".", "_")):
+                continue
+            if (sub / "exercise.py").exists():
+                exercises.append(sub.name)
+            else:
+                mtimes[f"{d.name}/{sub.name}"] = sub.stat().st_mtime_ns
+        if exercises:
+            topics[d.name] = sorted(exercises)
+
+    index = {"topics": topics, "mtimes": mtimes}
+    try:
+        tmp = INDEX_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index))
+        os.replace(tmp, INDEX_PATH)
+    except OSError:
+        pass
+    return index
 
 
 def find_topics():
     """Find all topic directories."""
-    return sorted(
-        d.name
-        for d in ROOT.iterdir()
-        if d.is_dir()
-        and not d.name.startswith((".", "_"))
-        and any(d.glob("*/exercise.py"))
-    )
+    return sorted(load_index()["topics"])
 
 
 def find_exercises(topic_query):
@@ -45,19 +126,16 @@ def find_exercises(topic_query):
             sys.exit(1)
 
     topic = matches[0]
-    topic_dir = ROOT / topic
+    return topic, list_exercises(topic)
 
-    exercises = sorted(
-        d.name
-        for d in topic_dir.iterdir()
-        if d.is_dir() and (d / "exercise.py").exists()
-    )
 
-    return topic, exercises
+def list_exercises(topic):
+    """List exercise directories of a topic."""
+    return load_index()["topics"][topic]
 
 
-def run_exercise(topic, exercise_name, solution=False):
-    """Run an exercise or solution."""
+def load_exercise(topic, exercise_name, solution=False):
+    """Import an exercise (or solution) module and its tests module."""
     file_type = "solution" if solution else "exercise"
 
     try:
@@ -67,23 +145,314 @@ def run_exercise(topic, exercise_name, solution=False):
         print(f"Error: {e}")
         sys.exit(1)
 
-    tests.run_tests(module.solve)
+    return module, tests
+
+
+def run_exercise(topic, exercise_name, solution=False):
+    """Run an exercise or solution."""
+    module, tests = load_exercise(topic, exercise_name, solution)
+    return tests.run_tests(module.solve)
+
+
+def run_and_record(topic, exercise_name, solution=False):
+    """Run an exercise or solution and append its per-test results to history."""
+    summary = run_exercise(topic, exercise_name, solution)
+    record_history(topic, exercise_name, solution, summary)
+    return summary
+
+
+def record_history(topic, exercise_name, solution, summary):
+    import history
+    import test_utils
+
+    if summary:
+        history.append(
+            history.records_for(
+                topic, exercise_name, solution, summary, test_utils.OPTIONS
+            )
+        )
+
+
+def bench_exercise(topic, exercise_name, solution=False, out=None):
+    """Benchmark an exercise or solution on the workloads in its tests.BENCH."""
+    import bench
+
+    module, tests = load_exercise(topic, exercise_name, solution)
+    if not hasattr(tests, "BENCH"):
+        print(f"{topic}/{exercise_name} defines no BENCH workloads")
+        sys.exit(1)
+
+    results = bench.run_benchmark(
+        exercise_name,
+        module.solve,
+        tests.BENCH,
+        sizes=getattr(tests, "BENCH_SIZES", None),
+        unit=getattr(tests, "BENCH_UNIT", "n"),
+    )
+    file_type = "solution" if solution else "exercise"
+    out = Path(out) if out else BENCH_DIR / topic / f"{exercise_name}.{file_type}.json"
+    bench.save(results, out)
+    print(f"Results written to {out}")
+    return results
+
+
+def compare_exercise(topic, exercise_name, out=None):
+    """Run tests.BENCH workloads through both exercise and solution."""
+    import bench
+
+    exercise, tests = load_exercise(topic, exercise_name)
+    solution, _ = load_exercise(topic, exercise_name, solution=True)
+    if not hasattr(tests, "BENCH"):
+        print(f"{topic}/{exercise_name} defines no BENCH workloads")
+        sys.exit(1)
+
+    results = bench.compare(
+        exercise_name,
+        {"exercise": exercise.solve, "solution": solution.solve},
+        tests.BENCH,
+        sizes=getattr(tests, "BENCH_SIZES", None),
+        unit=getattr(tests, "BENCH_UNIT", "n"),
+    )
+    out = Path(out) if out else BENCH_DIR / topic / f"{exercise_name}.compare.json"
+    bench.save(results, out)
+    print(f"Results written to {out}")
+    return results
+
+
+def _run_captured(topic, exercise_name, solution, options):
+    """Run one exercise with stdout captured. Executed in a pool worker."""
+    import contextlib
+    import io
+
+    import test_utils
+
+    test_utils.OPTIONS.update(options)
+    buf = io.StringIO()
+    start = time.perf_counter()
+    summary, error = None, None
+    try:
+        with contextlib.redirect_stdout(buf):
+            summary = run_exercise(topic, exercise_name, solution)
+    except SystemExit:
+        error = buf.getvalue().strip() or "exited"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    if summary is None and error is None:
+        error = "run_tests returned no summary"
+    return {
+        "topic": topic,
+        "exercise": exercise_name,
+        "summary": summary,
+        "error": error,
+        "output": buf.getvalue(),
+        "time": time.perf_counter() - start,
+    }
+
+
+def _helpers_digest():
+    """Hash of every shared helper module: root and topic-level .py files."""
+    h = hashlib.sha256()
+    for path in sorted(ROOT.glob("*.py")) + sorted(ROOT.glob("*/*.py")):
+        h.update(str(path.relative_to(ROOT)).encode() + b"\0")
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def cache_key(topic, exercise_name, solution, options, helpers):
+    """
+    Content hash identifying one exercise run.
+
+    Covers the exercise (or solution) source, its tests.py, the shared
+    helpers digest, the run options and the interpreter version, so any
+    edit that could change the verdict produces a new key.
+    """
+    file_type = "solution" if solution else "exercise"
+    ex_dir = ROOT / topic / exercise_name
+    h = hashlib.sha256(helpers.encode())
+    h.update(json.dumps([sys.version, options], sort_keys=True).encode())
+    for path in (ex_dir / f"{file_type}.py", ex_dir / "tests.py"):
+        h.update(path.name.encode() + b"\0")
+        try:
+            h.update(path.read_bytes())
+        except FileNotFoundError:
+            h.update(b"\0missing")
+    return h.hexdigest()
+
+
+def load_cached(key):
+    """Cached _run_captured result for key, or None."""
+    try:
+        return json.loads((CACHE_DIR / f"{key}.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(key, result):
+    """Persist a _run_captured result under key (best effort)."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_DIR / f"{key}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(result))
+        os.replace(tmp, CACHE_DIR / f"{key}.json")
+    except OSError:
+        pass
+
+
+def run_many(pairs, solution=False, workers=None, use_cache=True):
+    """
+    Run (topic, exercise) pairs on a process pool and print an ordered summary.
+
+    With use_cache, a pair whose cache_key has a stored result is not rerun:
+    its cached verdict and timing are reported instead.
+
+    Returns True if every exercise passed all of its tests.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    import test_utils
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    results, keys = {}, {}
+    if use_cache:
+        helpers = _helpers_digest()
+        for t, e in pairs:
+            keys[t, e] = cache_key(t, e, solution, test_utils.OPTIONS, helpers)
+            cached = load_cached(keys[t, e])
+            if cached is not None:
+                results[t, e] = dict(cached, cached=True)
+
+    pending = [pair for pair in pairs if pair not in results]
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            futures = {
+                (t, e): pool.submit(_run_captured, t, e, solution, test_utils.OPTIONS)
+                for t, e in pending
+            }
+            for (t, e), future in futures.items():
+                results[t, e] = result = future.result()
+                record_history(t, e, solution, result["summary"])
+                if use_cache:
+                    store_cached(keys[t, e], result)
+    results = [results[pair] for pair in pairs]
+    elapsed = time.perf_counter() - start
+
+    width = max(len(f"{r['topic']}/{r['exercise']}") for r in results)
+    n_passed = 0
+    for r in results:
+        label = f"{r['topic']}/{r['exercise']}".ljust(width)
+        summary = r["summary"]
+        if r["error"]:
+            print(f"  ✗ {label}  {'error':>7}  {r['time']:7.3f}s  {r['error']}")
+            continue
+        ok = summary["passed"] == summary["total"]
+        n_passed += ok
+        counts = f"{summary['passed']}/{summary['total']}"
+        cached = "  (cached)" if r.get("cached") else ""
+        print(
+            f"  {'✓' if ok else '✗'} {label}  {counts:>7}  {r['time']:7.3f}s{cached}"
+        )
+
+    notes = []
+    if pending:
+        notes.append(f"{min(workers, len(pending))} workers")
+    if len(pending) < len(pairs):
+        notes.append(f"{len(pairs) - len(pending)} cached")
+    print(
+        f"\n{n_passed}/{len(results)} exercises passed "
+        f"in {elapsed:.2f}s ({', '.join(notes)})"
+    )
+    return n_passed == len(results)
+
+
+def _pop_flag(args, *flags):
+    """Remove flags from args in place, return True if any was present."""
+    found = any(a in flags for a in args)
+    args[:] = [a for a in args if a not in flags]
+    return found
+
+
+def _pop_option(args, flag, default=None):
+    """Remove `flag VALUE` from args in place, return VALUE (or default)."""
+    if flag not in args:
+        return default
+    i = args.index(flag)
+    if i + 1 >= len(args):
+        print(f"Missing value for {flag}")
+        sys.exit(1)
+    value = args[i + 1]
+    del args[i : i + 2]
+    return value
 
 
 def main():
     args = sys.argv[1:]
 
+    solution = _pop_flag(args, "-s")
+    run_every = _pop_flag(args, "--all")
+    benchmark = _pop_flag(args, "--bench")
+    comparing = _pop_flag(args, "--compare")
+    watching = _pop_flag(args, "--watch")
+    show_history = _pop_flag(args, "--history")
+    out = _pop_option(args, "--out")
+    workers = _pop_option(args, "-j")
+    workers = int(workers) if workers else None
+    use_cache = not _pop_flag(args, "--no-cache")
+
+    profile_memory = _pop_flag(args, "--memory")
+    isolate = _pop_flag(args, "--isolate")
+    timeout = _pop_option(args, "--timeout")
+    mem = _pop_option(args, "--mem")
+    if profile_memory or isolate or timeout or mem:
+        import test_utils
+
+        test_utils.OPTIONS["memory"] = profile_memory
+    if isolate or timeout or mem:
+        test_utils.OPTIONS["isolate"] = True
+    if timeout:
+        test_utils.OPTIONS["cpu_limit"] = float(timeout)
+    if mem:
+        test_utils.OPTIONS["memory_limit"] = int(float(mem) * 2**20)
+
+    if show_history:
+        import history
+
+        prefix = ""
+        if args:
+            topic, exercises = find_exercises(args[0])
+            prefix = f"{topic}/"
+            if len(args) > 1:
+                matches = [e for e in exercises if args[1] in e]
+                prefix += matches[0] if len(matches) == 1 else args[1]
+        history.show(prefix)
+        return
+
+    if run_every or (watching and len(args) < 2):
+        if args:
+            topic, exercises = find_exercises(args[0])
+            pairs = [(topic, ex) for ex in exercises]
+        else:
+            pairs = [(t, ex) for t in find_topics() for ex in list_exercises(t)]
+        if watching:
+            import watch
+
+            watch.watch(pairs, run_and_record, solution)
+            return
+        sys.exit(0 if run_many(pairs, solution, workers, use_cache) else 1)
+
     if not args:
         topics = find_topics()
         print("Topics:")
         for t in topics:
             print(f"  {t}")
         print(f"\nUsage: python run.py <topic> [exercise] [-s]")
+        print(f"       python run.py [topic] --all [-s] [-j N] [--no-cache]")
+        print(f"       python run.py <topic> <exercise> --bench [-s] [--out FILE]")
+        print(f"       python run.py <topic> <exercise> --compare [--out FILE]")
+        print(f"       python run.py [topic] [exercise] --watch [-s]")
+        print(f"       python run.py [topic] [exercise] --history")
         return
 
-    solution = "-s" in args
-    args = [a for a in args if a != "-s"]
-
     topic_query = args[0]
     topic, exercises = find_exercises(topic_query)
 
@@ -104,7 +473,16 @@ def main():
         print(f"Multiple exercises match '{ex_query}': {', '.join(matches)}")
         sys.exit(1)
 
-    run_exercise(topic, matches[0], solution)
+    if watching:
+        import watch
+
+        watch.watch([(topic, matches[0])], run_and_record, solution)
+    elif comparing:
+        compare_exercise(topic, matches[0], out)
+    elif benchmark:
+        bench_exercise(topic, matches[0], solution, out)
+    else:
+        run_and_record(topic, matches[0], solution)
 
 
 if __name__ == "__main__":
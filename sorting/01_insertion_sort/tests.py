@@ -1,11 +1,21 @@
 import random
 
+from generators import few_unique, organ_pipe, random_ints, reversed_ints, sorted_ints
 from test_utils import run_all
 
 random.seed(42)
 LARGE = [random.randint(-100, 100) for _ in range(1000)]
 
 
+BENCH = {
+    "random": lambda n: {"nums": list(random_ints(n, seed=n))},
+    "sorted": lambda n: {"nums": list(sorted_ints(n))},
+    "reversed": lambda n: {"nums": list(reversed_ints(n))},
+    "few unique": lambda n: {"nums": list(few_unique(n, seed=n))},
+    "organ pipe": lambda n: {"nums": list(organ_pipe(n))},
+}
+
+
 def run_tests(solve):
     tests = [
         {
@@ -76,4 +86,4 @@ def run_tests(solve):
         },
     ]
 
-    run_all("insertion_sort", tests, solve)
+    return run_all("insertion_sort", tests, solve)
@@ -1,11 +1,20 @@
 import random
 
+from generators import few_unique, reversed_ints, sorted_ints, uniform_floats
 from test_utils import run_all
 
 random.seed(42)
 LARGE = [random.random() for _ in range(1000)]
 
 
+BENCH = {
+    "random": lambda n: {"nums": list(uniform_floats(n, seed=n))},
+    "sorted": lambda n: {"nums": [i / n for i in sorted_ints(n)]},
+    "reversed": lambda n: {"nums": [i / n for i in reversed_ints(n)]},
+    "few unique": lambda n: {"nums": [k / 4 for k in few_unique(n, seed=n)]},
+}
+
+
 def run_tests(solve):
     tests = [
         {
@@ -64,4 +73,4 @@ def run_tests(solve):
         },
     ]
 
-    run_all("bucket_sort", tests, solve)
+    return run_all("bucket_sort", tests, solve)
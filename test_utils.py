@@ -1,12 +1,39 @@
+import math
+import multiprocessing
+import os
+import signal
 import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
 from io import StringIO
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+
+# Run settings, set by run.py flags
+OPTIONS = {
+    "isolate": False,  # run each test in a forked worker with resource limits
+    "cpu_limit": 5,  # CPU seconds per test (isolated mode)
+    "memory_limit": 1024 * 2**20,  # bytes of address space per test (isolated mode)
+    "memory": False,  # trace allocations of each test with tracemalloc
+    "memory_sites": 3,  # top allocation sites to show per test
+}
 
 
 class TestFailed(Exception):
     pass
 
 
-def run_test(name, func, inputs, check, fail_msg):
+class ResourceLimit(TestFailed):
+    """An isolated test stopped by its CPU or memory limit; the run goes on."""
+
+    def __init__(self, verdict):
+        super().__init__(verdict)
+        self.verdict = verdict  # "timeout", "oom" or "died"
+
+
+def run_test(name, func, inputs, check, fail_msg, record=None):
     """
     Run a single test case.
 
@@ -16,40 +43,135 @@ def run_test(name, func, inputs, check, fail_msg):
         inputs: Dict of kwargs to pass to func
         check: Callable(result) -> bool
         fail_msg: Message to show on failure (str or callable(result) -> str)
+        record: Optional dict, filled with the call's "wall" time in seconds
+            and its "peak" bytes (None unless OPTIONS["memory"]), and a
+            "verdict" of "oom" if the call raised MemoryError
+
+    With OPTIONS["memory"], the call is traced with tracemalloc and the
+    peak, net retained bytes and top allocation sites are printed with
+    the result line.
 
     Returns True if passed, raises TestFailed if not.
     """
     old_stdout = sys.stdout
     sys.stdout = captured = StringIO()
+    memory = {}
 
+    start = time.perf_counter()
     try:
-        result = func(**inputs)
+        result = _call(func, inputs, memory)
+    except MemoryError:
+        sys.stdout = old_stdout
+        output = captured.getvalue()
+        _print_failure(name, output, "out of memory (MemoryError)", memory)
+        if record is not None:
+            record["verdict"] = "oom"
+        raise TestFailed()
     except Exception as e:
         sys.stdout = old_stdout
         output = captured.getvalue()
-        _print_failure(name, output, f"raised {type(e).__name__}: {e}")
+        _print_failure(name, output, f"raised {type(e).__name__}: {e}", memory)
         raise TestFailed()
-
+    finally:
+        if record is not None:
+            record["wall"] = time.perf_counter() - start
+            record["peak"] = memory.get("peak")
     sys.stdout = old_stdout
     output = captured.getvalue()
 
     if result is None:
         _print_failure(
-            name, output, "Function returned None - did you forget a return statement?"
+            name,
+            output,
+            "Function returned None - did you forget a return statement?",
+            memory,
         )
         raise TestFailed()
 
     if check(result):
-        print(f"{name} ✓")
+        print(f"{name} ✓{_format_memory(memory)}")
+        _print_sites(memory)
         return True
     else:
         msg = fail_msg(result) if callable(fail_msg) else fail_msg
-        _print_failure(name, output, msg)
+        _print_failure(name, output, msg, memory)
         raise TestFailed()
 
 
-def _print_failure(name, output, msg):
-    print(name)
+def _call(func, inputs, memory):
+    """
+    Call func(**inputs). With OPTIONS["memory"], fill `memory` with
+    {"peak", "retained", "blocks", "sites"} measured by tracemalloc, even
+    if func raises.
+    """
+    if not OPTIONS["memory"] or tracemalloc.is_tracing():
+        return func(**inputs)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    try:
+        return func(**inputs)
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        stats = after.filter_traces(ignore).compare_to(
+            before.filter_traces(ignore), "lineno"
+        )
+        growth = sorted(
+            (s for s in stats if s.size_diff > 0), key=lambda s: -s.size_diff
+        )
+        memory.update(
+            peak=peak - baseline,
+            retained=sum(s.size_diff for s in stats),
+            blocks=sum(s.count_diff for s in stats),
+            sites=[
+                (_site(s.traceback[0]), s.size_diff, s.count_diff)
+                for s in growth[: OPTIONS["memory_sites"]]
+            ],
+        )
+
+
+def _site(frame):
+    path = Path(frame.filename)
+    if path.is_relative_to(ROOT):
+        path = path.relative_to(ROOT)
+    return f"{path}:{frame.lineno}"
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def _format_memory(memory):
+    if not memory:
+        return ""
+    return (
+        f"  [peak {format_bytes(memory['peak'])}, "
+        f"retained {format_bytes(memory['retained'])}, "
+        f"{memory['blocks']:+d} blocks]"
+    )
+
+
+def _print_sites(memory):
+    for site, size, count in memory.get("sites", []):
+        print(f"    {site}  +{format_bytes(size)} ({count:+d} blocks)")
+
+
+def _print_failure(name, output, msg, memory=None):
+    print(f"{name}{_format_memory(memory)}")
+    _print_sites(memory or {})
     if output.strip():
         print("  --- your output ---")
         for line in output.rstrip().split("\n"):
@@ -58,19 +180,183 @@ def _print_failure(name, output, msg):
     print(f"  ✗ FAILED: {msg}")
 
 
-def run_all(name, tests, func):
-    """Run all tests, stop on first failure."""
-    print(f"Running {name}...\n")
-    for i, test in enumerate(tests, 1):
+class IsolatedWorker:
+    """
+    A forked child that runs tests by index under CPU and memory limits.
+
+    The child is forked once per run_all, after the tests are built, so it
+    inherits func and the test dicts without pickling them. Each test gets
+    a fresh RLIMIT_CPU budget; RLIMIT_AS caps growth over the child's
+    starting address space. A child killed by either limit (or hung past
+    the wall-clock deadline) fails that test with ResourceLimit, and a
+    fresh child is forked for the tests after it.
+    """
+
+    def __init__(self, func, tests, cpu_limit, memory_limit):
+        self.cpu_limit = cpu_limit
+        self.args = (func, tests, cpu_limit, memory_limit)
+        self._start()
+
+    def _start(self):
+        ctx = multiprocessing.get_context("fork")
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, *self.args), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def run(self, i, name, record=None):
+        """
+        Run test i (1-based) in the child. Returns True or raises TestFailed.
+
+        Raises ResourceLimit if the test ran out of CPU time or memory.
+        """
+        self.conn.send(i)
+        # Wall-clock backstop for tests that block without burning CPU
+        start = time.perf_counter()
+        if self.conn.poll(self.cpu_limit * 2 + 1):
+            try:
+                passed, output, child_record = self.conn.recv()
+            except EOFError:
+                passed, output, child_record = None, "", {}
+        else:
+            self.process.kill()
+            passed, output, child_record = None, "", {}
+        if record is not None:
+            record.update(wall=time.perf_counter() - start, peak=None)
+            record.update(child_record)
+
+        if passed is None:
+            self.process.join()
+            verdict, reason = self._death_reason()
+            _print_failure(name, output, reason)
+            if record is not None:
+                record["verdict"] = verdict
+            self.conn.close()
+            self._start()
+            raise ResourceLimit(verdict)
+        print(output, end="")
+        if child_record.get("verdict") == "oom":
+            raise ResourceLimit("oom")
+        if not passed:
+            raise TestFailed()
+        return True
+
+    def close(self):
+        if self.process.is_alive():
+            self.conn.send(None)
+        self.conn.close()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+
+    def _death_reason(self):
+        """(verdict, message) for a child that died without a result."""
+        code = self.process.exitcode
+        if code == -signal.SIGXCPU:
+            return "timeout", f"timed out (exceeded {self.cpu_limit}s CPU budget)"
+        if code == -signal.SIGKILL:
+            wait = self.cpu_limit * 2 + 1
+            return "timeout", f"timed out or killed (no result after {wait}s)"
+        return "died", f"worker died (exit code {code})"
+
+
+def _worker_main(conn, func, tests, cpu_limit, memory_limit):
+    import resource
+
+    if memory_limit:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (_address_space() + memory_limit, hard))
+
+    while True:
         try:
-            run_test(
-                f"Test {i}: {test['name']}",
-                func,
-                test["inputs"],
-                test["check"],
-                test["fail_msg"],
-            )
-        except TestFailed:
-            print(f"\n{i - 1}/{len(tests)} tests passed")
+            i = conn.recv()
+        except EOFError:
             return
-    print(f"\nAll {len(tests)} tests passed!")
+        if i is None:
+            return
+        test = tests[i - 1]
+
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        budget = math.ceil(usage.ru_utime + usage.ru_stime + cpu_limit)
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        resource.setrlimit(resource.RLIMIT_CPU, (budget, hard))
+
+        out = StringIO()
+        record = {}
+        with redirect_stdout(out):
+            try:
+                run_test(
+                    f"Test {i}: {test['name']}",
+                    func,
+                    test["inputs"],
+                    test["check"],
+                    test["fail_msg"],
+                    record,
+                )
+                passed = True
+            except TestFailed:
+                passed = False
+        conn.send((passed, out.getvalue(), record))
+
+
+def _address_space():
+    """Current virtual memory size in bytes (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def run_all(name, tests, func):
+    """
+    Run all tests, stop on first failure.
+
+    With OPTIONS["isolate"], each test runs in an IsolatedWorker so an
+    infinite loop or memory blowup fails that test instead of the run:
+    it is recorded (verdict "timeout", "oom" or "died") and the remaining
+    tests still run.
+
+    Returns a summary dict: {"name", "passed", "total", "tests"}, where
+    tests holds one {"test", "verdict", "wall", "peak"} record per test run.
+    """
+    print(f"Running {name}...\n")
+    records = []
+    passed = 0
+    worker = None
+    if OPTIONS["isolate"]:
+        worker = IsolatedWorker(
+            func, tests, OPTIONS["cpu_limit"], OPTIONS["memory_limit"]
+        )
+    try:
+        for i, test in enumerate(tests, 1):
+            record = {"test": test["name"], "verdict": "fail"}
+            records.append(record)
+            try:
+                if worker:
+                    worker.run(i, f"Test {i}: {test['name']}", record)
+                else:
+                    run_test(
+                        f"Test {i}: {test['name']}",
+                        func,
+                        test["inputs"],
+                        test["check"],
+                        test["fail_msg"],
+                        record,
+                    )
+            except ResourceLimit:
+                continue
+            except TestFailed:
+                break
+            record["verdict"] = "pass"
+            passed += 1
+    finally:
+        if worker:
+            worker.close()
+    if passed == len(tests):
+        print(f"\nAll {len(tests)} tests passed!")
+    else:
+        print(f"\n{passed}/{len(tests)} tests passed")
+    return {"name": name, "passed": passed, "total": len(tests), "tests": records}
@@ -1,8 +1,15 @@
+from generators import balanced_tree, random_bst
 from test_utils import run_all
 from trees.test_utils import make_tree
 from trees.tree import Tree
 
 
+BENCH = {
+    "balanced": lambda n: {"root": balanced_tree(n)},
+    "random BST": lambda n: {"root": random_bst(n, seed=n)},
+}
+
+
 def run_tests(solve):
     # Build test trees
     t6 = make_tree(1, make_tree(2, Tree(4), Tree(5)), make_tree(3, Tree(6), Tree(7)))
@@ -87,4 +94,4 @@ def run_tests(solve):
         },
     ]
 
-    run_all("breadth_first_search", tests, solve)
+    return run_all("breadth_first_search", tests, solve)
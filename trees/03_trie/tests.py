@@ -89,4 +89,4 @@ def run_tests(Trie):
         },
     ]
 
-    run_all("trie", tests, run_scenario)
+    return run_all("trie", tests, run_scenario)
@@ -76,4 +76,4 @@ def run_tests(BSTIterator):
         },
     ]
 
-    run_all("bst_iterator", tests, run_scenario)
+    return run_all("bst_iterator", tests, run_scenario)
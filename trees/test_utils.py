@@ -23,3 +23,74 @@ def make_tree(val, left=None, right=None):
     node.left = left
     node.right = right
     return node
+
+
+def make_bst(values):
+    """
+    Insert values in order into a BST (duplicates go right). Returns the root.
+
+    Iterative, so degenerate insertion orders don't hit the recursion limit.
+    """
+    root = None
+    for val in values:
+        node = Tree(val)
+        if root is None:
+            root = node
+            continue
+        cur = root
+        while True:
+            if val < cur.val:
+                if cur.left is None:
+                    cur.left = node
+                    break
+                cur = cur.left
+            else:
+                if cur.right is None:
+                    cur.right = node
+                    break
+                cur = cur.right
+    return root
+
+
+def make_chain(values, side="right"):
+    """Link values into a single path, each node the `side` child of the last."""
+    root = cur = None
+    for val in values:
+        node = Tree(val)
+        if root is None:
+            root = node
+        else:
+            setattr(cur, side, node)
+        cur = node
+    return root
+
+
+def make_balanced(values):
+    """
+    Build a height-balanced tree whose in-order traversal is `values`.
+
+    Example:
+        # Build:    2
+        #          / \
+        #         1   3
+        tree = make_balanced([1, 2, 3])
+    """
+    values = list(values)
+    if not values:
+        return None
+    root = None
+    # (lo, hi, parent, side) ranges still to build
+    stack = [(0, len(values) - 1, None, None)]
+    while stack:
+        lo, hi, parent, side = stack.pop()
+        mid = (lo + hi) // 2
+        node = Tree(values[mid])
+        if parent is None:
+            root = node
+        else:
+            setattr(parent, side, node)
+        if mid + 1 <= hi:
+            stack.append((mid + 1, hi, node, "right"))
+        if lo <= mid - 1:
+            stack.append((lo, mid - 1, node, "left"))
+    return root
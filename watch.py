@@ -0,0 +1,212 @@
+"""
+Rerun exercise suites when their files change, keeping the interpreter warm.
+
+Changes wake the loop through inotify where available (Linux, via ctypes)
+and by polling otherwise. Either way the changed files are found by
+comparing mtimes, so both backends behave the same. Changed modules are
+reloaded with importlib.reload, along with the modules that imported
+from them, and only the affected suites are rerun.
+"""
+
+import ctypes
+import ctypes.util
+import importlib
+import importlib.util
+import os
+import select
+import sys
+import time
+import traceback
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# Editors save in bursts (truncate, write, rename); wait for them to settle
+DEBOUNCE = 0.05
+
+
+class Inotify:
+    """Wake on any change in a set of directories (Linux only)."""
+
+    def __init__(self, dirs):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        for d in dirs:
+            wd = self.libc.inotify_add_watch(self.fd, str(d).encode(), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch {d} failed")
+
+    def wait(self, timeout=None):
+        """Block until something changed. Returns False on timeout."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        self._drain()
+        time.sleep(DEBOUNCE)
+        self._drain()
+        return True
+
+    def _drain(self):
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+class Poller:
+    """Fallback wakeup: return every `interval` seconds and let mtimes decide."""
+
+    def __init__(self, dirs, interval=0.2):
+        self.interval = interval
+
+    def wait(self, timeout=None):
+        time.sleep(self.interval)
+        return True
+
+    def close(self):
+        pass
+
+
+def make_watcher(dirs):
+    """Inotify where supported, Poller otherwise."""
+    try:
+        return Inotify(dirs)
+    except (OSError, AttributeError, TypeError):
+        return Poller(dirs)
+
+
+def snapshot(dirs):
+    """{path: mtime_ns} for every .py file directly inside dirs."""
+    mtimes = {}
+    for d in dirs:
+        for path in d.glob("*.py"):
+            try:
+                mtimes[path] = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                pass
+    return mtimes
+
+
+def changed_paths(before, after):
+    keys = before.keys() | after.keys()
+    return sorted(p for p in keys if before.get(p) != after.get(p))
+
+
+def module_name(path):
+    """Dotted module name for a .py file under ROOT."""
+    rel = path.relative_to(ROOT).with_suffix("")
+    return ".".join(rel.parts)
+
+
+def reload_for(paths, pairs, solution):
+    """
+    Reload modules affected by changed paths.
+
+    Returns the (topic, exercise) pairs whose suites need a rerun.
+    """
+    file_type = "solution" if solution else "exercise"
+    changed_root = [p for p in paths if p.parent == ROOT]
+    changed_topics = {p.parent.name for p in paths if p.parent.parent == ROOT}
+
+    affected = []
+    for topic, ex in pairs:
+        ex_dir = ROOT / topic / ex
+        if (
+            changed_root
+            or topic in changed_topics
+            or any(p.parent == ex_dir for p in paths)
+        ):
+            affected.append((topic, ex))
+
+    # Dependencies first: root helpers, topic helpers, then the suites
+    # that imported names from them.
+    order = [module_name(p) for p in changed_root]
+    for topic in sorted(changed_topics):
+        order += [module_name(p) for p in paths if p.parent == ROOT / topic]
+        order += sorted(
+            name
+            for name, module in list(sys.modules.items())
+            if name.startswith(f"{topic}.")
+            and Path(getattr(module, "__file__", None) or ".").parent
+            == ROOT / topic
+        )
+    for topic, ex in affected:
+        order += [f"{topic}.{ex}.{file_type}", f"{topic}.{ex}.tests"]
+
+    # Bytecode is validated by whole-second mtime and size, which a quick
+    # same-length edit can match; drop it so reload compiles the new source.
+    for p in paths:
+        Path(importlib.util.cache_from_source(p)).unlink(missing_ok=True)
+
+    for name in dict.fromkeys(order):
+        module = sys.modules.get(name)
+        if module is None:
+            continue
+        saved = dict(getattr(module, "OPTIONS", {}))
+        importlib.reload(module)
+        if saved:
+            module.OPTIONS.update(saved)
+
+    return affected
+
+
+def watch(pairs, run_suite, solution=False):
+    """
+    Run each (topic, exercise) suite, then rerun affected suites on change.
+
+    run_suite(topic, exercise, solution) runs one suite. Exits on Ctrl-C.
+    """
+    topics = {topic for topic, _ in pairs}
+    dirs = [ROOT] + [ROOT / t for t in sorted(topics)]
+    dirs += [ROOT / t / e for t, e in pairs]
+    watcher = make_watcher(dirs)
+    backend = "inotify" if isinstance(watcher, Inotify) else "polling"
+
+    def rerun(targets):
+        for topic, ex in targets:
+            start = time.perf_counter()
+            try:
+                run_suite(topic, ex, solution)
+            except (Exception, SystemExit):
+                traceback.print_exc()
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"\n[{topic}/{ex} in {elapsed:.0f}ms]\n")
+        print(f"Watching {len(pairs)} exercise(s) ({backend}), Ctrl-C to stop...")
+
+    rerun(pairs)
+    before = snapshot(dirs)
+    try:
+        while True:
+            if not watcher.wait():
+                continue
+            after = snapshot(dirs)
+            paths = changed_paths(before, after)
+            before = after
+            if not paths:
+                continue
+            print("\n" + "=" * 60)
+            names = ", ".join(str(p.relative_to(ROOT)) for p in paths)
+            print(f"Changed: {names}\n")
+            try:
+                targets = reload_for(paths, pairs, solution)
+            except Exception:
+                traceback.print_exc()
+                continue
+            rerun(targets)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        watcher.close()